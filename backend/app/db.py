@@ -1,13 +1,96 @@
+import logging
+import threading
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from core import config
 # Import wszystkich modeli, aby Base je uwzględnił
 
 
-# URL bazy danych MySQL
-SQLALCHEMY_DATABASE_URL = "mysql+mysqldb://root:fastapi@db:3306/training_db"
+# Statystyki oczekiwania na połączenie z puli (na proces/worker)
+class PoolWaitStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "avg_wait_ms": round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class _TimedPoolMixin:
+    # Mierzy czas pobrania połączenia z puli (w tym czekanie, gdy wszystkie są zajęte)
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_stats = PoolWaitStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.wait_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.wait_stats.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.wait_stats = self.wait_stats
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
 
-# Tworzenie silnika bazy danych
-engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True, pool_pre_ping=True)
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _pool_options() -> dict:
+    return {
+        "pool_size": config.DB_POOL_SIZE,
+        "max_overflow": config.DB_MAX_OVERFLOW,
+        "pool_recycle": config.DB_POOL_RECYCLE,
+        "pool_timeout": config.DB_POOL_TIMEOUT,
+        "pool_pre_ping": True,
+        "echo": config.DB_ECHO,
+    }
+
+
+# Tworzenie silnika bazy danych na podstawie ustawień z core/config.py
+def create_db_engine(url: str = config.DATABASE_URL, **overrides):
+    return create_engine(url, poolclass=TimedQueuePool, **{**_pool_options(), **overrides})
+
+
+def create_async_db_engine(url: str = config.ASYNC_DATABASE_URL, **overrides):
+    return create_async_engine(url, poolclass=TimedAsyncAdaptedQueuePool, **{**_pool_options(), **overrides})
+
+
+engine = create_db_engine()
 
 
 # Tworzenie sesji
@@ -23,4 +106,65 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+# Asynchroniczny silnik i sesje - tworzone tylko, gdy włączono DB_ASYNC (wymaga aiomysql)
+async_engine = create_async_db_engine() if config.DB_ASYNC else None
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+logger = logging.getLogger(__name__)
+
+
+# Otwiera DB_POOL_WARMUP połączeń przy starcie workera, żeby pierwsze żądania nie płaciły za handshake.
+# Błąd nie blokuje startu - pula i tak otworzy połączenia przy pierwszych żądaniach.
+def warm_up_pool(connections: int = config.DB_POOL_WARMUP):
+    opened = []
+    try:
+        for _ in range(min(connections, config.DB_POOL_SIZE)):
+            opened.append(engine.connect())
+    except SQLAlchemyError as e:
+        logger.warning("Database pool warm-up failed: %s", e)
+    finally:
+        for connection in opened:
+            connection.close()
+
+
+async def warm_up_async_pool(connections: int = config.DB_POOL_WARMUP):
+    if async_engine is None:
+        return
+    opened = []
+    try:
+        for _ in range(min(connections, config.DB_POOL_SIZE)):
+            opened.append(await async_engine.connect())
+    except SQLAlchemyError as e:
+        logger.warning("Async database pool warm-up failed: %s", e)
+    finally:
+        for connection in opened:
+            await connection.close()
+
+
+def _pool_status(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "wait": pool.wait_stats.snapshot(),
+    }
+
+
+# Stan puli połączeń bieżącego workera (dla /internal/db-pool)
+def pool_status() -> dict:
+    status = {"sync": _pool_status(engine.pool)}
+    if async_engine is not None:
+        status["async"] = _pool_status(async_engine.pool)
+    return status
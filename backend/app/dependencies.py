@@ -0,0 +1,109 @@
+# backend/app/dependencies.py
+import threading
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Iterator
+
+from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db import get_async_db, get_db
+from app.models.user import User as UserModel
+from core import config
+
+
+# Ograniczony cache LRU z TTL dla id użytkowników, o których wiemy, że istnieją (osobny w każdym workerze).
+# delete_user usuwa wpis w swoim workerze; w pozostałych wpis wygasa po USER_CACHE_TTL sekundach.
+# Do tego czasu zapis dla usuniętego użytkownika kończy się błędem klucza obcego - resolve_user
+# zamienia go na 404 (patrz niżej).
+class KnownUserCache:
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, user_id: int) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            expires_at = self._entries.get(user_id)
+            if expires_at is None:
+                return False
+            if expires_at < now:
+                del self._entries[user_id]
+                return False
+            self._entries.move_to_end(user_id)
+            return True
+
+    def add(self, user_id: int) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = time.monotonic() + self.ttl
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+known_users = KnownUserCache(maxsize=config.USER_CACHE_SIZE, ttl=config.USER_CACHE_TTL)
+
+
+# Wspólna zależność: zwraca user_id z URL albo 404, jeśli użytkownik nie istnieje.
+# Użytkownik z cache mógł zostać usunięty przez inny worker - wtedy zapis endpointu kończy się
+# IntegrityError (klucz obcy). Sprawdzamy, czy użytkownik nadal istnieje, i zwracamy 404 zamiast 500.
+def resolve_user(user_id: int, db: Session = Depends(get_db)) -> Iterator[int]:
+    if user_id not in known_users:
+        if db.query(UserModel.id).filter(UserModel.id == user_id).first() is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        known_users.add(user_id)
+    try:
+        yield user_id
+    except IntegrityError:
+        db.rollback()
+        if db.query(UserModel.id).filter(UserModel.id == user_id).first() is None:
+            known_users.discard(user_id)
+            raise HTTPException(status_code=404, detail="User not found")
+        raise
+
+
+async def resolve_user_async(user_id: int, db: AsyncSession = Depends(get_async_db)) -> AsyncIterator[int]:
+    if user_id not in known_users:
+        if await db.scalar(select(UserModel.id).where(UserModel.id == user_id)) is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        known_users.add(user_id)
+    try:
+        yield user_id
+    except IntegrityError:
+        await db.rollback()
+        if await db.scalar(select(UserModel.id).where(UserModel.id == user_id)) is None:
+            known_users.discard(user_id)
+            raise HTTPException(status_code=404, detail="User not found")
+        raise
+
+
+# Wersja danych użytkownika (users.data_version) do ETagów - przy okazji sprawdza, że użytkownik istnieje
+def user_data_version(user_id: int, db: Session = Depends(get_db)) -> int:
+    row = db.query(UserModel.data_version).filter(UserModel.id == user_id).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    known_users.add(user_id)
+    return row.data_version
+
+
+async def user_data_version_async(user_id: int, db: AsyncSession = Depends(get_async_db)) -> int:
+    row = (await db.execute(select(UserModel.data_version).where(UserModel.id == user_id))).first()
+    if row is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    known_users.add(user_id)
+    return row.data_version
@@ -0,0 +1,141 @@
+# backend/app/export.py
+"""
+Strumieniowy eksport wszystkich danych użytkownika (NDJSON albo CSV).
+
+Każda tabela jest czytana kursorem po stronie serwera (stream_results + yield_per), a wiersze
+od razu zamieniane na tekst i wysyłane porcjami, więc zużycie pamięci nie zależy od wielkości
+konta. Generator otwiera własną sesję - żyje dłużej niż obsługa żądania w FastAPI.
+
+NDJSON: jeden obiekt na linię z polem "type". CSV: sekcje dla kolejnych typów rekordów,
+każda z własnym nagłówkiem (pierwsza kolumna to typ), oddzielone pustą linią.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models.one_rep_max import Exercise as ExerciseModel, Set as SetModel, WeekPlan as WeekPlanModel
+from app.models.training_schedule import ExerciseSchedule as ExerciseScheduleModel
+from app.models.training_schedule import TrainingPlanSchedule as TrainingPlanScheduleModel
+from app.models.user import User as UserModel
+from app.models.weight_history import WeightHistory as WeightHistoryModel
+
+# Liczba wierszy pobieranych z kursora naraz i wielkość porcji wysyłanej do klienta
+YIELD_PER = 1000
+FLUSH_BYTES = 64 * 1024
+
+
+def _sections(user_id: int):
+    """(typ rekordu, zapytanie) w kolejności eksportu - same kolumny, bez obiektów ORM."""
+    user_exercises = select(ExerciseModel.id).where(ExerciseModel.user_id == user_id)
+    user_plans = select(WeekPlanModel.id).where(WeekPlanModel.exercise_id.in_(user_exercises))
+    user_schedules = select(TrainingPlanScheduleModel.id).where(TrainingPlanScheduleModel.user_id == user_id)
+    return (
+        ("user", select(
+            UserModel.id, UserModel.nickname, UserModel.age, UserModel.height, UserModel.weight,
+            UserModel.gender, UserModel.weight_goal, UserModel.plan_version
+        ).where(UserModel.id == user_id)),
+        ("exercise", select(
+            ExerciseModel.id, ExerciseModel.name, ExerciseModel.one_rep_max, ExerciseModel.progress_weight
+        ).where(ExerciseModel.user_id == user_id).order_by(ExerciseModel.id)),
+        ("week_plan", select(
+            WeekPlanModel.id, WeekPlanModel.exercise_id, WeekPlanModel.week_number
+        ).where(WeekPlanModel.exercise_id.in_(user_exercises)).order_by(WeekPlanModel.id)),
+        ("set", select(
+            SetModel.id, SetModel.week_plan_id, SetModel.reps, SetModel.percentage,
+            SetModel.is_amrap, SetModel.weight.label("weight")
+        ).where(SetModel.week_plan_id.in_(user_plans)).order_by(SetModel.id)),
+        ("weight_history", select(
+            WeightHistoryModel.id, WeightHistoryModel.weight, WeightHistoryModel.recorded_at
+        ).where(WeightHistoryModel.user_id == user_id).order_by(WeightHistoryModel.recorded_at)),
+        ("training_plan", select(
+            TrainingPlanScheduleModel.id, TrainingPlanScheduleModel.name, TrainingPlanScheduleModel.scheduled_date,
+            TrainingPlanScheduleModel.notes, TrainingPlanScheduleModel.created_at
+        ).where(TrainingPlanScheduleModel.user_id == user_id).order_by(TrainingPlanScheduleModel.scheduled_date)),
+        ("training_plan_exercise", select(
+            ExerciseScheduleModel.id, ExerciseScheduleModel.training_plan_id, ExerciseScheduleModel.exercise_id,
+            ExerciseScheduleModel.sets, ExerciseScheduleModel.reps, ExerciseScheduleModel.weight,
+            ExerciseScheduleModel.rest_time, ExerciseScheduleModel.notes
+        ).where(ExerciseScheduleModel.training_plan_id.in_(user_schedules)).order_by(ExerciseScheduleModel.id)),
+    )
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _ndjson_lines(record_type: str, columns, rows) -> Iterator[str]:
+    for row in rows:
+        record = {"type": record_type}
+        record.update(zip(columns, map(_plain, row)))
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _csv_lines(record_type: str, columns, rows, first: bool) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    if not first:
+        out.write("\n")
+    writer.writerow(["type", *columns])
+    for row in rows:
+        writer.writerow([record_type, *map(_plain, row)])
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+    if out.tell():
+        yield out.getvalue()
+
+
+def _text_chunks(user_id: int, export_format: str) -> Iterator[bytes]:
+    pending = []
+    size = 0
+    with SessionLocal() as db:
+        for index, (record_type, query) in enumerate(_sections(user_id)):
+            result = db.execute(query.execution_options(stream_results=True, yield_per=YIELD_PER))
+            columns = list(result.keys())
+            if export_format == "csv":
+                lines = _csv_lines(record_type, columns, result, first=index == 0)
+            else:
+                lines = _ndjson_lines(record_type, columns, result)
+            for line in lines:
+                pending.append(line)
+                size += len(line)
+                if size >= FLUSH_BYTES:
+                    yield "".join(pending).encode("utf-8")
+                    pending = []
+                    size = 0
+    if pending:
+        yield "".join(pending).encode("utf-8")
+
+
+def export_user_data(user_id: int, export_format: str, gzip: bool = False) -> Iterator[bytes]:
+    chunks = _text_chunks(user_id, export_format)
+    if not gzip:
+        yield from chunks
+        return
+    # wbits=31 - format gzip (nagłówek i suma kontrolna), kompresja porcja po porcji
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_filename(user_id: int, export_format: str) -> str:
+    return f"user-{user_id}-export.{export_format}"
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    for part in (accept_encoding or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
@@ -0,0 +1,56 @@
+# backend/app/idempotency.py
+"""
+Obsługa nagłówka Idempotency-Key dla endpointów zapisujących dane.
+
+Odpowiedź na pierwsze żądanie z danym kluczem zapisujemy w tej samej transakcji co zmiany.
+Ponowienie z tym samym kluczem i tą samą treścią dostaje zapisaną odpowiedź bez ponownego
+zapisu; ten sam klucz z inną treścią to błąd klienta (422).
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.models.idempotency_key import IdempotencyKey as IdempotencyKeyModel
+from core import config
+
+REPLAY_HEADER = "Idempotent-Replayed"
+
+
+def find_replay(db: Session, user_id: int, key: str, request_hash: str) -> Optional[Response]:
+    """Zapisana odpowiedź dla klucza albo None, jeśli żądanie trzeba wykonać."""
+    record = db.query(IdempotencyKeyModel).filter(
+        IdempotencyKeyModel.user_id == user_id,
+        IdempotencyKeyModel.key == key
+    ).first()
+    if record is None:
+        return None
+
+    if record.created_at.replace(tzinfo=None) < datetime.utcnow() - timedelta(hours=config.IDEMPOTENCY_KEY_TTL_HOURS):
+        # Klucz wygasł - traktujemy żądanie jak nowe
+        db.delete(record)
+        db.flush()
+        return None
+
+    if record.request_hash != request_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used with a different request body")
+
+    return Response(
+        content=record.response_body,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={REPLAY_HEADER: "true"}
+    )
+
+
+def remember_response(db: Session, user_id: int, key: str, request_hash: str, status_code: int, body: str) -> None:
+    """Dodaje odpowiedź do bieżącej transakcji. Nie zatwierdza - robi to wywołujący."""
+    db.add(IdempotencyKeyModel(
+        user_id=user_id,
+        key=key,
+        request_hash=request_hash,
+        status_code=status_code,
+        response_body=body,
+        created_at=datetime.utcnow()
+    ))
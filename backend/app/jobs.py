@@ -0,0 +1,268 @@
+# backend/app/jobs.py
+"""
+Kolejka zadań w tle wewnątrz procesu aplikacji.
+
+Zadania są zapisywane w tabeli jobs (enqueue_job), więc przetrwają restart. Każdy worker uvicorna
+uruchamia JobRunner, który odpytuje tabelę co JOBS_POLL_INTERVAL sekund (albo od razu po wake())
+i wykonuje najwyżej JOBS_CONCURRENCY zadań naraz w puli wątków. Zadanie przejmuje warunkowy
+UPDATE ... WHERE status = 'queued', więc przy wielu workerach każde wykona się raz. Nieudana próba
+wraca do kolejki z wykładniczo rosnącym opóźnieniem, aż do JOBS_MAX_ATTEMPTS prób. Zadanie, którego
+worker nie odezwał się przez JOBS_LOCK_TIMEOUT, wraca do kolejki (albo kończy się jako "failed" po
+ostatniej próbie); worker, który stracił zadanie, nie zapisuje już jego wyniku.
+
+Handler (rejestrowany przez @job_handler) dostaje sesję i payload, nie zatwierdza transakcji -
+robi to runner razem ze zmianą statusu zadania, więc efekt i status zapisują się atomowo.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Set
+
+from fastapi import Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import and_, select, update
+from sqlalchemy.orm import Session
+
+from app.db import SessionLocal
+from app.models.job import Job
+from core import config
+
+logger = logging.getLogger("app.jobs")
+
+JobHandler = Callable[[Session, dict], Optional[dict]]
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(kind: str):
+    def register(fn: JobHandler) -> JobHandler:
+        _handlers[kind] = fn
+        return fn
+    return register
+
+
+def enqueue_job(db: Session, kind: str, payload: dict, user_id: Optional[int] = None) -> Job:
+    """Dodaje zadanie do sesji; widoczne dla runnera po commit (potem warto wywołać job_runner.wake())."""
+    now = datetime.utcnow()
+    job = Job(
+        kind=kind,
+        user_id=user_id,
+        payload=json.dumps(payload),
+        status="queued",
+        attempts=0,
+        max_attempts=config.JOBS_MAX_ATTEMPTS,
+        run_after=now,
+        created_at=now
+    )
+    db.add(job)
+    db.flush()
+    return job
+
+
+def job_accepted(response: Response, job: Job, message: str) -> Dict[str, str]:
+    # 202 z adresem, pod którym klient sprawdza postęp
+    status_url = f"/jobs/{job.id}"
+    response.status_code = status.HTTP_202_ACCEPTED
+    response.headers["Location"] = status_url
+    return {"message": message, "job_id": str(job.id), "status_url": status_url}
+
+
+def retry_delay(attempts: int) -> float:
+    return min(config.JOBS_RETRY_BASE_DELAY * 2 ** (attempts - 1), config.JOBS_RETRY_MAX_DELAY)
+
+
+def _claim_next(worker_id: str) -> Optional[int]:
+    with SessionLocal() as db:
+        now = datetime.utcnow()
+        candidates = db.scalars(
+            select(Job.id)
+            .where(Job.status == "queued", Job.run_after <= now)
+            .order_by(Job.run_after, Job.id)
+            .limit(config.JOBS_CONCURRENCY + 1)
+        ).all()
+        for job_id in candidates:
+            # Inny worker mógł przejąć zadanie między SELECT a UPDATE - wtedy rowcount = 0
+            claimed = db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == "queued")
+                .values(status="running", locked_by=worker_id, locked_at=now, attempts=Job.attempts + 1)
+            ).rowcount
+            db.commit()
+            if claimed:
+                return job_id
+    return None
+
+
+def _requeue_stale() -> int:
+    # Zadania "running" zablokowane dłużej niż JOBS_LOCK_TIMEOUT - ich worker został zatrzymany w trakcie.
+    # Po ostatniej próbie zadanie kończy się jako "failed", zamiast wracać do kolejki bez końca.
+    with SessionLocal() as db:
+        now = datetime.utcnow()
+        stale = and_(Job.status == "running", Job.locked_at < now - timedelta(seconds=config.JOBS_LOCK_TIMEOUT))
+        failed = db.execute(
+            update(Job)
+            .where(stale, Job.attempts >= Job.max_attempts)
+            .values(
+                status="failed", finished_at=now, locked_by=None, locked_at=None,
+                last_error="Worker stopped responding (lock timeout)"
+            )
+        ).rowcount
+        requeued = db.execute(
+            update(Job)
+            .where(stale)
+            .values(status="queued", run_after=now, locked_by=None, locked_at=None)
+        ).rowcount
+        db.commit()
+    if failed:
+        logger.warning("stale jobs failed after last attempt", extra={"jobs": failed})
+    if requeued:
+        logger.warning("stale jobs requeued", extra={"jobs": requeued})
+    return requeued
+
+
+def _finish(db: Session, job_id: int, worker_id: str, **values) -> bool:
+    # Zmiana statusu tylko, jeśli zadanie nadal należy do tego workera - po JOBS_LOCK_TIMEOUT mogło
+    # wrócić do kolejki i zostać przejęte przez inny. Wtedy wycofujemy transakcję razem z efektem handlera.
+    owned = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if owned:
+        db.commit()
+    else:
+        db.rollback()
+        logger.warning("job lost by worker, result discarded", extra={"job_id": job_id, "worker_id": worker_id})
+    return bool(owned)
+
+
+def _execute(job_id: int, worker_id: str) -> None:
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        kind = job.kind
+        start = time.perf_counter()
+        try:
+            handler = _handlers.get(kind)
+            if handler is None:
+                raise LookupError(f"No handler for job kind {kind}")
+            result = handler(db, json.loads(job.payload))
+            finished = _finish(
+                db, job_id, worker_id,
+                status="succeeded",
+                result=json.dumps(result) if result is not None else None,
+                last_error=None,
+                finished_at=datetime.utcnow()
+            )
+            if finished:
+                logger.info(
+                    "job succeeded",
+                    extra={"job_id": job_id, "kind": kind, "duration_ms": round((time.perf_counter() - start) * 1000, 2)}
+                )
+        except Exception as exc:
+            db.rollback()
+            job = db.get(Job, job_id)
+            attempts = job.attempts
+            values = {"last_error": f"{type(exc).__name__}: {exc}"[:2000], "locked_by": None, "locked_at": None}
+            if attempts >= job.max_attempts:
+                values.update(status="failed", finished_at=datetime.utcnow())
+            else:
+                values.update(status="queued", run_after=datetime.utcnow() + timedelta(seconds=retry_delay(attempts)))
+            if _finish(db, job_id, worker_id, **values):
+                logger.exception(
+                    "job failed",
+                    extra={"job_id": job_id, "kind": kind, "attempts": attempts, "status": values["status"]}
+                )
+
+
+class JobRunner:
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self, timeout: float = 30.0) -> None:
+        """Przestaje pobierać zadania i czeka na trwające; niedokończone wrócą do kolejki po JOBS_LOCK_TIMEOUT."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._running:
+            await asyncio.wait(set(self._running), timeout=timeout)
+        self._loop = None
+
+    def wake(self) -> None:
+        """Budzi pętlę runnera bez czekania na kolejne odpytanie; można wołać z wątku żądania."""
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wakeup.set)
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": self.worker_id,
+            "running": len(self._running),
+            "concurrency": self.concurrency,
+            "started": self._task is not None,
+        }
+
+    async def _run_loop(self) -> None:
+        slots = asyncio.Semaphore(self.concurrency)
+        next_recovery = 0.0
+        while True:
+            await slots.acquire()
+            # Czyścimy przed odpytaniem - wake() w trakcie zapytania nie przepadnie
+            self._wakeup.clear()
+            try:
+                if time.monotonic() >= next_recovery:
+                    await run_in_threadpool(_requeue_stale)
+                    next_recovery = time.monotonic() + config.JOBS_LOCK_TIMEOUT / 2
+                job_id = await run_in_threadpool(_claim_next, self.worker_id)
+            except asyncio.CancelledError:
+                slots.release()
+                raise
+            except Exception:
+                # Np. chwilowy brak połączenia z bazą - spróbujemy przy kolejnym odpytaniu
+                logger.exception("job queue poll failed")
+                job_id = None
+
+            if job_id is None:
+                slots.release()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._run_job(job_id, slots))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_job(self, job_id: int, slots: asyncio.Semaphore) -> None:
+        try:
+            await run_in_threadpool(_execute, job_id, self.worker_id)
+        except Exception:
+            logger.exception("job execution crashed", extra={"job_id": job_id})
+        finally:
+            slots.release()
+
+
+job_runner = JobRunner(concurrency=config.JOBS_CONCURRENCY, poll_interval=config.JOBS_POLL_INTERVAL)
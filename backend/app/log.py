@@ -0,0 +1,64 @@
+# backend/app/log.py
+"""
+Strukturalne logowanie aplikacji.
+
+Rekordy loggera "app" trafiają do kolejki (QueueHandler), a formatowanie do JSON i zapis
+na stderr odbywa się w osobnym wątku (QueueListener), więc logowanie nie blokuje obsługi żądań.
+Dodatkowe pola przekazuje się przez `extra`, np. logger.info("login", extra={"user_id": 1}).
+"""
+import json
+import logging
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from core import config
+
+# Atrybuty, które ma każdy LogRecord - wszystko poza nimi pochodzi z `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging() -> None:
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter())
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(logging.DEBUG if config.DEBUG else logging.INFO)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,4 +1,10 @@
 from .weight_history import WeightHistory
 from .one_rep_max import Exercise, WeekPlan, Set
 from .user import User
-from .training_schedule import TrainingPlanSchedule, ExerciseSchedule
\ No newline at end of file
+from .training_schedule import TrainingPlanSchedule, ExerciseSchedule
+from .idempotency_key import IdempotencyKey
+from .sync_tombstone import SyncTombstone
+from .strength import AmrapEntry, ExerciseStrength
+from .volume import VolumeBucket, VolumeRollup
+from .ranking import StrengthScore, StrengthHistogram
+from .job import Job
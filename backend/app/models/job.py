@@ -0,0 +1,28 @@
+# backend/app/models/job.py
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+from app.db import Base
+
+# Zadanie w tle (app/jobs.py) - zapisane w bazie, więc przetrwa restart serwera.
+# user_id bez klucza obcego: zadanie usunięcia konta musi przeżyć usunięcie użytkownika.
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(64), nullable=False)
+    user_id = Column(Integer, nullable=True)
+    payload = Column(Text, nullable=False)
+    status = Column(String(16), nullable=False, default="queued")  # queued, running, succeeded, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    run_after = Column(DateTime, nullable=False)
+    locked_by = Column(String(128), nullable=True)
+    locked_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    result = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now(), nullable=False)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_status_run_after", "status", "run_after"),
+    )
@@ -1,6 +1,7 @@
-from sqlalchemy import VARCHAR, Column, Integer, Float, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import VARCHAR, Column, Integer, Float, Boolean, ForeignKey, Index, UniqueConstraint, select
+from sqlalchemy.orm import relationship, column_property
 from app.db import Base
+from core import config
 from sqlalchemy.sql import func
 from sqlalchemy import DateTime
 
@@ -11,29 +12,62 @@ class Exercise(Base):
     name = Column(VARCHAR(255), nullable=False, index=True)
     one_rep_max = Column(Float, nullable=False, default=100.0)
     progress_weight = Column(Float, nullable=False, default=0.0)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    # Czas ostatniej zmiany wiersza - podstawa synchronizacji przyrostowej (app/sync.py)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_exercises_user_id_name", "user_id", "name"),
+    )
 
     user = relationship("User", back_populates="exercises")
-    week_plans = relationship("WeekPlan", back_populates="exercise", cascade="all, delete-orphan")
+    # passive_deletes - dzieci usuwa baza (ON DELETE CASCADE), ORM nie ładuje ich przed usunięciem rodzica
+    week_plans = relationship("WeekPlan", back_populates="exercise", cascade="all, delete-orphan", passive_deletes=True)
 
 class WeekPlan(Base):
     __tablename__ = "week_plans"
 
     id = Column(Integer, primary_key=True, index=True)
     week_number = Column(Integer, nullable=False)
-    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    # Jeden plan na tydzień dla ćwiczenia; indeks obsługuje też wyszukiwanie po exercise_id
+    __table_args__ = (
+        UniqueConstraint("exercise_id", "week_number", name="uq_week_plans_exercise_id_week_number"),
+    )
 
     exercise = relationship("Exercise", back_populates="week_plans")
-    sets = relationship("Set", back_populates="week_plan", lazy="joined", cascade="all, delete-orphan")
+    sets = relationship("Set", back_populates="week_plan", lazy="joined", cascade="all, delete-orphan", passive_deletes=True)
 
 class Set(Base):
     __tablename__ = "sets"
 
     id = Column(Integer, primary_key=True, index=True)
-    week_plan_id = Column(Integer, ForeignKey("week_plans.id"), nullable=False)
+    week_plan_id = Column(Integer, ForeignKey("week_plans.id", ondelete="CASCADE"), nullable=False, index=True)
     reps = Column(Integer, nullable=False)
     percentage = Column(Float, nullable=False)
     is_amrap = Column(Boolean, nullable=False, default=False)
     weight = Column(Float, nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
     week_plan = relationship("WeekPlan", back_populates="sets")
+
+    if config.SET_WEIGHT_MODE == "computed":
+        # Kolumna zostaje w tabeli (wypełniana przy generowaniu planu), ale ORM jej nie mapuje -
+        # ciężar jest wyliczany przy odczycie, patrz niżej
+        __mapper_args__ = {"exclude_properties": ["weight"]}
+
+
+# Tryb "computed": ciężar serii liczony w zapytaniu z 1RM i progresu ćwiczenia,
+# więc zmiana 1RM lub AMRAP to aktualizacja jednego wiersza w exercises
+set_weight_expression = (
+    select((Exercise.one_rep_max * (Set.percentage / 100)) + Exercise.progress_weight)
+    .join(WeekPlan, WeekPlan.exercise_id == Exercise.id)
+    .where(WeekPlan.id == Set.week_plan_id)
+    .correlate_except(Exercise, WeekPlan)
+    .scalar_subquery()
+)
+
+if config.SET_WEIGHT_MODE == "computed":
+    Set.weight = column_property(set_weight_expression)
@@ -0,0 +1,24 @@
+# backend/app/models/ranking.py
+from sqlalchemy import Column, Float, ForeignKey, Integer, String
+from app.db import Base
+
+# Aktualny wynik DOTS użytkownika w boju - pamiętamy przedział, żeby przy zmianie odjąć go z histogramu
+class StrengthScore(Base):
+    __tablename__ = "strength_scores"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    lift = Column(String(32), primary_key=True)
+    gender = Column(String(1), nullable=False)
+    weight_class = Column(String(8), nullable=False)
+    score = Column(Float, nullable=False)
+    bucket = Column(Integer, nullable=False)
+
+# Liczba użytkowników w przedziale wyniku DOTS dla boju, płci i kategorii wagowej ("all" - cała płeć)
+class StrengthHistogram(Base):
+    __tablename__ = "strength_histogram"
+
+    lift = Column(String(32), primary_key=True)
+    gender = Column(String(1), primary_key=True)
+    weight_class = Column(String(8), primary_key=True)
+    bucket = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,43 @@
+# backend/app/models/strength.py
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer
+from sqlalchemy.sql import func
+from app.db import Base
+
+# Zapisany wynik serii AMRAP z szacowanym 1RM (app/strength.py)
+class AmrapEntry(Base):
+    __tablename__ = "amrap_results"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    week_number = Column(Integer, nullable=False)
+    weight = Column(Float, nullable=False)
+    target_reps = Column(Integer, nullable=False)
+    reps_performed = Column(Integer, nullable=False)
+    e1rm_epley = Column(Float, nullable=False)
+    e1rm_brzycki = Column(Float, nullable=True)  # wzór Brzyckiego nie działa od 37 powtórzeń
+    estimated_1rm = Column(Float, nullable=False)
+    is_pr = Column(Boolean, nullable=False, default=False)
+    recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_amrap_results_exercise_id_id", "exercise_id", "id"),
+    )
+
+# Podsumowanie wyników AMRAP ćwiczenia aktualizowane przy każdym zapisie -
+# statystyki siły czytają jeden wiersz na ćwiczenie zamiast całej historii
+class ExerciseStrength(Base):
+    __tablename__ = "exercise_strength_stats"
+
+    exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    entries = Column(Integer, nullable=False, default=0)
+    pr_count = Column(Integer, nullable=False, default=0)
+    best_e1rm = Column(Float, nullable=True)
+    best_e1rm_at = Column(DateTime(timezone=True), nullable=True)
+    best_result_id = Column(Integer, nullable=True)
+    best_weight = Column(Float, nullable=True)
+    best_reps = Column(Integer, nullable=True)
+    last_e1rm = Column(Float, nullable=True)
+    last_recorded_at = Column(DateTime(timezone=True), nullable=True)
+    trend_e1rm = Column(Float, nullable=True)  # średnia wykładnicza (STRENGTH_TREND_ALPHA)
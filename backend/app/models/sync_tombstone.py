@@ -0,0 +1,18 @@
+# backend/app/models/sync_tombstone.py
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.sql import func
+from app.db import Base
+
+# Ślad po usuniętym wierszu - synchronizacja przyrostowa przekazuje klientowi, co ma usunąć u siebie
+class SyncTombstone(Base):
+    __tablename__ = "sync_tombstones"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    table_name = Column(String(32), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_sync_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
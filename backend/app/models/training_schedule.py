@@ -1,5 +1,5 @@
 # backend/app/models/training_schedule.py
-from sqlalchemy import Column, ForeignKey, Integer, Float, Date, String, DateTime
+from sqlalchemy import Column, ForeignKey, Index, Integer, Float, Date, String, DateTime
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db import Base
@@ -8,26 +8,36 @@ class TrainingPlanSchedule(Base):
     __tablename__ = "training_plan_schedules"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(255), nullable=False)
     scheduled_date = Column(Date, nullable=False)
     notes = Column(String(500), nullable=True)
+    # Wspólny identyfikator wystąpień utworzonych z jednej reguły powtarzania (None - pojedynczy plan)
+    series_id = Column(String(32), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_training_plan_schedules_user_id_scheduled_date", "user_id", "scheduled_date"),
+        Index("ix_training_plan_schedules_series_id_scheduled_date", "series_id", "scheduled_date"),
+        Index("ix_training_plan_schedules_user_id_updated_at", "user_id", "updated_at"),
+    )
     
     user = relationship("User", back_populates="training_schedules")
-    exercises = relationship("ExerciseSchedule", back_populates="training_plan", cascade="all, delete-orphan")
+    exercises = relationship("ExerciseSchedule", back_populates="training_plan", cascade="all, delete-orphan", passive_deletes=True)
 
 class ExerciseSchedule(Base):
     __tablename__ = "exercise_schedules"
 
     id = Column(Integer, primary_key=True, index=True)
-    training_plan_id = Column(Integer, ForeignKey("training_plan_schedules.id"), nullable=False)
-    exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
+    training_plan_id = Column(Integer, ForeignKey("training_plan_schedules.id", ondelete="CASCADE"), nullable=False, index=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
     sets = Column(Integer, nullable=False)
     reps = Column(Integer, nullable=False)
     weight = Column(Float, nullable=False)
     rest_time = Column(Integer, nullable=True)  # czas odpoczynku w sekundach
     notes = Column(String(255), nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
     
     training_plan = relationship("TrainingPlanSchedule", back_populates="exercises")
     exercise = relationship("Exercise")
\ No newline at end of file
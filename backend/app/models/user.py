@@ -2,7 +2,7 @@
 from sqlalchemy import Column, Integer, String, Float
 from sqlalchemy.orm import relationship
 from app.db import Base
-from passlib.hash import bcrypt
+from app.security import password_context
 
 class User(Base):
     __tablename__ = "users"
@@ -16,15 +16,18 @@ class User(Base):
     gender = Column(String(1), nullable=False)
     weight_goal = Column(Float, nullable=True)
     plan_version = Column(String(1), nullable=False, default="A")
+    # Licznik zmian ćwiczeń i planów użytkownika - źródło ETagów (app/versioning.py)
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     
-    exercises = relationship("Exercise", back_populates="user", cascade="all, delete-orphan")
-    weight_history = relationship("WeightHistory", back_populates="user", cascade="all, delete-orphan")
-    training_schedules = relationship("TrainingPlanSchedule", back_populates="user", cascade="all, delete-orphan")
+    exercises = relationship("Exercise", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    weight_history = relationship("WeightHistory", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    training_schedules = relationship("TrainingPlanSchedule", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
     
+    # Wersje synchroniczne (w bieżącym wątku) - endpointy używają app.security.password_hasher
     def verify_password(self, password):
         """Weryfikacja hasła"""
-        return bcrypt.verify(password, self.password_hash)
+        return password_context().verify(password, self.password_hash)
     
     @staticmethod
     def hash_password(password):
-        return bcrypt.hash(password)
\ No newline at end of file
+        return password_context().hash(password)
\ No newline at end of file
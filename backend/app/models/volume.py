@@ -0,0 +1,28 @@
+# backend/app/models/volume.py
+from sqlalchemy import Column, Date, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+from app.db import Base
+
+# Zakończony przedział (tydzień/miesiąc) z policzoną objętością - obecność wiersza oznacza,
+# że volume_rollups zawiera komplet danych tego przedziału (także gdy nie było treningów)
+class VolumeBucket(Base):
+    __tablename__ = "volume_buckets"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(String(8), primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    sessions = Column(Integer, nullable=False)
+    computed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+# Objętość ćwiczenia w zakończonym przedziale
+class VolumeRollup(Base):
+    __tablename__ = "volume_rollups"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    bucket = Column(String(8), primary_key=True)
+    bucket_start = Column(Date, primary_key=True)
+    exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), primary_key=True)
+    tonnage = Column(Float, nullable=False)
+    total_sets = Column(Integer, nullable=False)
+    total_reps = Column(Integer, nullable=False)
+    sessions = Column(Integer, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, ForeignKey, Integer, Float, DateTime
+from sqlalchemy import Column, ForeignKey, Index, Integer, Float, DateTime, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from sqlalchemy.ext.declarative import declarative_base
@@ -8,8 +8,14 @@ class WeightHistory(Base):
     __tablename__ = "weight_history"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     weight = Column(Float, nullable=False)
     recorded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "recorded_at", name="uq_weight_history_user_id_recorded_at"),
+        Index("ix_weight_history_user_id_updated_at", "user_id", "updated_at"),
+    )
 
     user = relationship("User", back_populates="weight_history")
\ No newline at end of file
@@ -0,0 +1,143 @@
+# backend/app/plan_templates.py
+"""
+Rejestr szablonów planów treningowych.
+
+Szablony są przechowywane jako dane (app/plan_templates.json) i kompilowane raz na proces
+do niemutowalnej struktury indeksowanej przez (wersja, tydzień, ćwiczenie). Rejestr sprawdza
+co PLAN_TEMPLATES_CHECK_INTERVAL sekund, czy plik się zmienił, i w razie potrzeby przeładowuje
+się bez restartu serwera.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple
+
+from core import config
+
+
+class SetTemplate(NamedTuple):
+    reps: int
+    percentage: float
+    is_amrap: bool
+
+
+class PlanRegistry:
+    __slots__ = ("stamp", "revision", "versions", "weeks", "exercises", "key_differences", "_sets", "_info")
+
+    def __init__(self, stamp, revision, versions, weeks, exercises, key_differences, sets, info):
+        self.stamp: str = stamp
+        self.revision: int = revision
+        self.versions: Tuple[str, ...] = versions
+        self.weeks: Tuple[int, ...] = weeks
+        self.exercises: Tuple[str, ...] = exercises
+        self.key_differences: Tuple[str, ...] = key_differences
+        self._sets: Mapping[Tuple[str, int, str], Tuple[SetTemplate, ...]] = sets
+        self._info: Mapping[str, Mapping[str, object]] = info
+
+    def has_version(self, plan_version: str) -> bool:
+        return plan_version in self.versions
+
+    def has_week(self, week_number: int) -> bool:
+        return week_number in self.weeks
+
+    def sets_for(self, plan_version: str, week_number: int, exercise_name: str) -> Tuple[SetTemplate, ...]:
+        """Serie dla danego ćwiczenia w tygodniu; pusta krotka, jeśli szablon go nie obejmuje."""
+        return self._sets.get((plan_version, week_number, exercise_name), ())
+
+    def info(self, plan_version: str) -> Mapping[str, object]:
+        return self._info[plan_version]
+
+    def version_error(self) -> str:
+        return "Plan version must be " + " or ".join(f"'{v}'" for v in self.versions)
+
+    def week_error(self) -> str:
+        return f"Week number must be {self.weeks[0]}-{self.weeks[-1]}"
+
+
+def compile_registry(raw: bytes) -> PlanRegistry:
+    data = json.loads(raw)
+    exercises = tuple(data["exercises"])
+    sets: Dict[Tuple[str, int, str], Tuple[SetTemplate, ...]] = {}
+    info: Dict[str, Mapping[str, object]] = {}
+    interned: Dict[Tuple[SetTemplate, ...], Tuple[SetTemplate, ...]] = {}
+    weeks = None
+
+    for version, plan in data["plans"].items():
+        plan_weeks = tuple(sorted(int(w) for w in plan["weeks"]))
+        if weeks is None:
+            weeks = plan_weeks
+        elif plan_weeks != weeks:
+            raise ValueError(f"Plan {version} defines weeks {plan_weeks}, expected {weeks}")
+
+        for week, week_template in plan["weeks"].items():
+            for exercise_name, rows in week_template.items():
+                if exercise_name not in exercises:
+                    raise ValueError(f"Plan {version}, week {week}: unknown exercise {exercise_name}")
+                compiled = tuple(SetTemplate(int(r), p, bool(a)) for r, p, a in rows)
+                # Te same schematy powtarzają się w wielu tygodniach - trzymamy jedną kopię
+                sets[(version, int(week), exercise_name)] = interned.setdefault(compiled, compiled)
+
+        info[version] = MappingProxyType({
+            "description": plan.get("description", ""),
+            "characteristics": tuple(plan.get("characteristics", ())),
+        })
+
+    if not info:
+        raise ValueError("Plan templates file defines no plans")
+
+    revision = int(data.get("revision", 0))
+    return PlanRegistry(
+        stamp=f"{revision}-{hashlib.sha1(raw).hexdigest()[:12]}",
+        revision=revision,
+        versions=tuple(sorted(info)),
+        weeks=weeks,
+        exercises=exercises,
+        key_differences=tuple(data.get("key_differences", ())),
+        sets=MappingProxyType(sets),
+        info=MappingProxyType(info),
+    )
+
+
+_lock = threading.Lock()
+_registry: Optional[PlanRegistry] = None
+_loaded_mtime: Optional[int] = None
+_next_check = 0.0
+
+
+def _load(path: str) -> None:
+    global _registry, _loaded_mtime
+    mtime = os.stat(path).st_mtime_ns
+    with open(path, "rb") as f:
+        _registry = compile_registry(f.read())
+    _loaded_mtime = mtime
+
+
+def reload_plan_registry() -> PlanRegistry:
+    """Wymusza ponowne wczytanie szablonów z pliku."""
+    global _next_check
+    with _lock:
+        _load(config.PLAN_TEMPLATES_PATH)
+        _next_check = time.monotonic() + config.PLAN_TEMPLATES_CHECK_INTERVAL
+        return _registry
+
+
+def get_plan_registry() -> PlanRegistry:
+    global _next_check
+    registry = _registry
+    if registry is not None and time.monotonic() < _next_check:
+        return registry
+
+    with _lock:
+        if _registry is None or time.monotonic() >= _next_check:
+            try:
+                if _registry is None or os.stat(config.PLAN_TEMPLATES_PATH).st_mtime_ns != _loaded_mtime:
+                    _load(config.PLAN_TEMPLATES_PATH)
+            except (OSError, ValueError, KeyError, TypeError):
+                # Uszkodzony lub brakujący plik przy przeładowaniu - zostajemy przy poprzedniej wersji
+                if _registry is None:
+                    raise
+            _next_check = time.monotonic() + config.PLAN_TEMPLATES_CHECK_INTERVAL
+        return _registry
@@ -0,0 +1,178 @@
+# backend/app/rankings.py
+"""
+Ranking siły względnej (DOTS) dla przysiadu, martwego ciągu i wyciskania.
+
+Wynik boju to ciężar treningowy (one_rep_max + progress_weight) razy współczynnik DOTS dla
+masy ciała i płci. Rozkład wyników trzymamy jako histogram (strength_histogram) per bój, płeć
+i kategoria wagowa IPF oraz dla całej płci ("all"). Zmiana danych wejściowych przesuwa
+użytkownika między przedziałami w tej samej transakcji, a percentyl liczymy z kilkuset
+wierszy histogramu - niezależnie od liczby użytkowników.
+
+Bój trafia do histogramu, gdy jego 1RM lub progres AMRAP różni się od domyślnych wartości
+nowego konta - zmiana samej masy ciała przelicza tylko boje, które już są w rankingu, więc
+domyślne wartości nie zaburzają rozkładu. Istniejące konta uzupełnia migracja 4e9c7a1b3d82
+według tej samej reguły.
+"""
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.models.one_rep_max import Exercise as ExerciseModel
+from app.models.ranking import StrengthHistogram, StrengthScore
+from app.models.user import User as UserModel
+from app.upsert import upsert
+
+RANKED_LIFTS = ("squats", "bench_press", "dead_lift")
+ALL_CLASSES = "all"
+# Szerokość przedziału histogramu w punktach DOTS
+BUCKET_WIDTH = 1.0
+# Wartości ćwiczenia nowego konta (kolumny exercises) - taki bój nie wchodzi do rankingu
+DEFAULT_ONE_REP_MAX = 100.0
+DEFAULT_PROGRESS_WEIGHT = 0.0
+
+# Współczynniki wielomianu DOTS i zakres masy ciała, w jakim są zdefiniowane
+_DOTS = {
+    "M": ((-307.75076, 24.0900756, -0.1918759221, 0.0007391293, -0.000001093), 40.0, 210.0),
+    "F": ((-57.96288, 13.6175032, -0.1126655495, 0.0005158568, -0.0000010706), 40.0, 150.0),
+}
+# Górne granice kategorii wagowych IPF (kg); powyżej ostatniej - kategoria "+"
+_WEIGHT_CLASSES = {
+    "M": (59, 66, 74, 83, 93, 105, 120),
+    "F": (47, 52, 57, 63, 69, 76, 84),
+}
+
+
+def dots_coefficient(bodyweight: float, gender: str) -> float:
+    coefficients, low, high = _DOTS[gender]
+    bodyweight = min(max(bodyweight, low), high)
+    denominator = sum(c * bodyweight ** power for power, c in enumerate(coefficients))
+    return 500 / denominator
+
+
+def weight_class(bodyweight: float, gender: str) -> str:
+    limits = _WEIGHT_CLASSES[gender]
+    index = bisect.bisect_left(limits, bodyweight)
+    if index == len(limits):
+        return f"{limits[-1]}+"
+    return str(limits[index])
+
+
+def score_bucket(score: float) -> int:
+    return int(score // BUCKET_WIDTH)
+
+
+def score_entry(training_max: float, bodyweight: float, gender: str) -> Optional[Tuple[str, float, int]]:
+    """Kategoria wagowa, wynik DOTS i przedział histogramu; None dla płci spoza rankingu."""
+    if gender not in _DOTS:
+        return None
+    score = training_max * dots_coefficient(bodyweight, gender)
+    return weight_class(bodyweight, gender), score, score_bucket(score)
+
+
+def _lock_scores(db: Session, user_id: int, lifts: Iterable[str]) -> List[StrengthScore]:
+    # Najpierw wiersz użytkownika (jak w app/volume.py), potem jego wyniki - równoległe zmiany
+    # nie odejmą tego samego wyniku z histogramu dwa razy ani nie wstawią go dwa razy.
+    # Odczyt blokujący widzi najnowsze wiersze, nie snapshot sprzed czekania na blokadę.
+    db.execute(select(UserModel.id).where(UserModel.id == user_id).with_for_update())
+    return db.scalars(
+        select(StrengthScore)
+        .where(StrengthScore.user_id == user_id, StrengthScore.lift.in_(lifts))
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).all()
+
+
+def _adjust(db: Session, lift: str, gender: str, weight_class_name: str, bucket: int, delta: int) -> None:
+    table = StrengthHistogram.__table__
+    for class_name in (weight_class_name, ALL_CLASSES):
+        upsert(
+            db, table,
+            {"lift": lift, "gender": gender, "weight_class": class_name, "bucket": bucket, "count": delta},
+            {"count": table.c.count + delta}
+        )
+
+
+def refresh_strength_scores(db: Session, user_id: int, lifts: Iterable[str] = RANKED_LIFTS) -> None:
+    """Przelicza wyniki użytkownika i przesuwa je w histogramie. Nie zatwierdza transakcji."""
+    lifts = [lift for lift in lifts if lift in RANKED_LIFTS]
+    if not lifts:
+        return
+    db.flush()
+    current = {score.lift: score for score in _lock_scores(db, user_id, lifts)}
+    rows = db.execute(
+        select(
+            ExerciseModel.name,
+            ExerciseModel.one_rep_max,
+            ExerciseModel.progress_weight,
+            UserModel.gender,
+            UserModel.weight
+        )
+        .join(UserModel, UserModel.id == ExerciseModel.user_id)
+        .where(ExerciseModel.user_id == user_id, ExerciseModel.name.in_(lifts))
+    ).all()
+
+    for row in rows:
+        previous = current.get(row.name)
+        if previous is None and (row.one_rep_max, row.progress_weight) == (DEFAULT_ONE_REP_MAX, DEFAULT_PROGRESS_WEIGHT):
+            continue
+        entry = score_entry(row.one_rep_max + row.progress_weight, row.weight, row.gender)
+        if entry is None:
+            continue
+        class_name, score, bucket = entry
+        if previous is None:
+            db.add(StrengthScore(
+                user_id=user_id, lift=row.name, gender=row.gender,
+                weight_class=class_name, score=score, bucket=bucket
+            ))
+        else:
+            if (previous.gender, previous.weight_class, previous.bucket) == (row.gender, class_name, bucket):
+                previous.score = score
+                continue
+            _adjust(db, previous.lift, previous.gender, previous.weight_class, previous.bucket, -1)
+            previous.gender, previous.weight_class, previous.score, previous.bucket = row.gender, class_name, score, bucket
+        _adjust(db, row.name, row.gender, class_name, bucket, 1)
+
+
+def remove_strength_scores(db: Session, user_id: int) -> None:
+    """Odejmuje użytkownika z histogramu (usunięcie konta). Nie zatwierdza transakcji."""
+    scores = _lock_scores(db, user_id, RANKED_LIFTS)
+    for score in scores:
+        _adjust(db, score.lift, score.gender, score.weight_class, score.bucket, -1)
+    if scores:
+        db.execute(
+            delete(StrengthScore)
+            .where(StrengthScore.user_id == user_id)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def histograms(db: Session, gender: str, class_name: str) -> Dict[Tuple[str, str], List[Tuple[int, int]]]:
+    """Histogramy trzech bojów dla kategorii i całej płci - jedno zapytanie, O(liczba przedziałów)."""
+    result: Dict[Tuple[str, str], List[Tuple[int, int]]] = {}
+    for lift, weight_class_name, bucket, count in db.execute(
+        select(
+            StrengthHistogram.lift,
+            StrengthHistogram.weight_class,
+            StrengthHistogram.bucket,
+            StrengthHistogram.count
+        ).where(
+            StrengthHistogram.gender == gender,
+            StrengthHistogram.weight_class.in_((class_name, ALL_CLASSES)),
+            StrengthHistogram.lift.in_(RANKED_LIFTS),
+            StrengthHistogram.count > 0
+        )
+    ):
+        result.setdefault((lift, weight_class_name), []).append((bucket, count))
+    return result
+
+
+def percentile(histogram: List[Tuple[int, int]], bucket: int) -> Tuple[Optional[float], int]:
+    """Percentyl (połowa własnego przedziału liczona jako poniżej) i liczba osób w rozkładzie."""
+    total = sum(count for _, count in histogram)
+    if total == 0:
+        return None, 0
+    below = sum(count for other, count in histogram if other < bucket)
+    same = sum(count for other, count in histogram if other == bucket)
+    return round((below + same / 2) / total * 100, 1), total
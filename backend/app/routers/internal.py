@@ -0,0 +1,39 @@
+# backend/app/routers/internal.py
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+
+from app.db import pool_status
+from app.jobs import job_runner
+from app.security import password_hasher
+from core import config
+
+
+# Endpointy diagnostyczne - jeśli ustawiono INTERNAL_TOKEN, wymagają nagłówka X-Internal-Token
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    if config.INTERNAL_TOKEN and x_internal_token != config.INTERNAL_TOKEN:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_internal_token)],
+    include_in_schema=False
+)
+
+# Stan puli połączeń do bazy w workerze, który obsłużył żądanie.
+# async def, żeby odpowiadał także wtedy, gdy pula wątków jest zablokowana czekaniem na połączenia.
+@router.get("/db-pool")
+async def get_db_pool_status():
+    return pool_status()
+
+# Statystyki puli procesów haszujących hasła (czasy wywołań, odrzucone żądania)
+@router.get("/password-hasher")
+async def get_password_hasher_status():
+    return password_hasher.stats()
+
+# Stan runnera zadań w tle w tym workerze
+@router.get("/jobs")
+async def get_job_runner_status():
+    return job_runner.stats()
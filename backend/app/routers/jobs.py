@@ -0,0 +1,33 @@
+# backend/app/routers/jobs.py
+import json
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db import get_db
+from app.models.job import Job as JobModel
+from app.schemas.job import JobStatus
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"]
+)
+
+# Stan zadania zwróconego przez endpoint z odpowiedzią 202 (nagłówek Location)
+@router.get("/{job_id}", response_model=JobStatus)
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = db.get(JobModel, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobStatus(
+        id=job.id,
+        kind=job.kind,
+        status=job.status,
+        attempts=job.attempts,
+        max_attempts=job.max_attempts,
+        created_at=job.created_at,
+        run_after=job.run_after,
+        finished_at=job.finished_at,
+        last_error=job.last_error,
+        result=json.loads(job.result) if job.result else None
+    )
@@ -1,11 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, joinedload
 from typing import List
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, List, Optional
 from app.schemas.one_rep_max import Exercise, ExerciseCreate, Set, SetCreate, WeekPlan, WeekPlanCreate, AmrapResult
 from app.models.one_rep_max import Exercise as ExerciseModel, Set as SetModel, WeekPlan as WeekPlanModel
-from app.models.user import User as UserModel
-from app.db import get_db
+from app.models.training_schedule import ExerciseSchedule as ExerciseScheduleModel, TrainingPlanSchedule as TrainingPlanScheduleModel
+from app.db import get_async_db, get_db
+from app.dependencies import resolve_user, user_data_version, user_data_version_async
+from app.rankings import refresh_strength_scores
+from app.serialization import fast_response
+from app.strength import record_amrap_entry
+from app.sync import record_deletions
+from app.versioning import bump_data_version, etag_matches, make_etag, not_modified, set_etag
+from app.volume import invalidate_volume
+from core import config
+from app.plan_templates import get_plan_registry
+from app.routers.plans import catalog_response, get_plan_catalog
 
 router = APIRouter(
     prefix="/users/{user_id}",
@@ -14,40 +27,101 @@ router = APIRouter(
 
 # Pobranie listy ćwiczeń użytkownika
 @router.get("/exercises", response_model=List[Exercise])
-def get_exercises(user_id: int, db: Session = Depends(get_db)):
-    # Sprawdzamy, czy użytkownik istnieje
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="User not found")
-    return db.query(ExerciseModel).filter(ExerciseModel.user_id == user_id).all()
+def get_exercises(
+    user_id: int,
+    request: Request,
+    response: Response,
+    data_version: int = Depends(user_data_version),
+    db: Session = Depends(get_db)
+):
+    etag = make_etag(user_id, data_version, "exercises")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    exercises = db.query(ExerciseModel).filter(ExerciseModel.user_id == user_id).all()
+    if config.FAST_RESPONSES:
+        return fast_response(List[Exercise], exercises, response)
+    return exercises
 
-# Pobranie planu na tydzień dla użytkownika z wyborem wersji
-@router.get("/plan/week/{week_number}", response_model=List[WeekPlan])
-def get_week_plan(user_id: int, week_number: int, plan_version: str = "A", db: Session = Depends(get_db)):
-    if week_number not in range(1, 7):
-        raise HTTPException(status_code=400, detail="Week number must be 1-6")
-    
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    plans = (
-        db.query(WeekPlanModel)
+def _week_plan_select(user_id: int, week_number: int):
+    return (
+        select(WeekPlanModel)
         .options(joinedload(WeekPlanModel.sets))
         .join(ExerciseModel)
-        .filter(WeekPlanModel.week_number == week_number, ExerciseModel.user_id == user_id)
-        .all()
+        .where(WeekPlanModel.week_number == week_number, ExerciseModel.user_id == user_id)
     )
+
+# Pobranie planu na tydzień dla użytkownika z wyborem wersji
+# ETag zależy tylko od wersji danych użytkownika, więc 304 nie wymaga zapytania o plany
+def get_week_plan(
+    user_id: int,
+    week_number: int,
+    request: Request,
+    response: Response,
+    plan_version: str = "A",
+    data_version: int = Depends(user_data_version),
+    db: Session = Depends(get_db)
+):
+    registry = get_plan_registry()
+    if not registry.has_week(week_number):
+        raise HTTPException(status_code=400, detail=registry.week_error())
+
+    etag = make_etag(user_id, data_version, "week", week_number)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
+    plans = db.execute(_week_plan_select(user_id, week_number)).unique().scalars().all()
     
     if not plans:
+        # Wygenerowanie tygodnia podbija wersję - ETag wyślemy przy następnym odczycie
         plans = generate_week_plan(user_id, week_number, db, plan_version)
+    else:
+        set_etag(response, etag)
+
+    if config.FAST_RESPONSES:
+        return fast_response(List[WeekPlan], plans, response)
+    return plans
+
+# Wersja asynchroniczna (DB_ASYNC) - ta sama logika na AsyncSession
+async def get_week_plan_async(
+    user_id: int,
+    week_number: int,
+    request: Request,
+    response: Response,
+    plan_version: str = "A",
+    data_version: int = Depends(user_data_version_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    registry = get_plan_registry()
+    if not registry.has_week(week_number):
+        raise HTTPException(status_code=400, detail=registry.week_error())
+
+    etag = make_etag(user_id, data_version, "week", week_number)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    result = await db.execute(_week_plan_select(user_id, week_number))
+    plans = result.unique().scalars().all()
+
+    if not plans:
+        plans = await db.run_sync(lambda session: generate_week_plan(user_id, week_number, session, plan_version))
+    else:
+        set_etag(response, etag)
 
+    if config.FAST_RESPONSES:
+        return fast_response(List[WeekPlan], plans, response)
     return plans
 
+router.add_api_route(
+    "/plan/week/{week_number}",
+    get_week_plan_async if config.DB_ASYNC else get_week_plan,
+    methods=["GET"],
+    response_model=List[WeekPlan]
+)
+
 # Inicjalizacja ćwiczeń dla użytkownika
 @router.post("/exercises", response_model=List[Exercise])
-def initialize_exercises(user_id: int, exercises: List[ExerciseCreate], db: Session = Depends(get_db)):
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="User not found")
-    
+def initialize_exercises(exercises: List[ExerciseCreate], user_id: int = Depends(resolve_user), db: Session = Depends(get_db)):
     mandatory_exercises = {"squats", "dead_lift", "bench_press"}
     existing_exercises = {ex.name: ex for ex in db.query(ExerciseModel).filter(ExerciseModel.user_id == user_id).all()}
     requested_exercises = {ex.name for ex in exercises}
@@ -66,6 +140,8 @@ def initialize_exercises(user_id: int, exercises: List[ExerciseCreate], db: Sess
         db.add(db_ex)
         db_exercises.append(db_ex)
     
+    if db_exercises:
+        bump_data_version(db, user_id)
     db.commit()
     for ex in db_exercises:
         db.refresh(ex)
@@ -80,16 +156,9 @@ def update_exercise(user_id: int, exercise_id: int, updated_data: ExerciseCreate
 
     exercise.one_rep_max = updated_data.one_rep_max
     exercise.progress_weight = 0.0
-
-    sets = (
-        db.query(SetModel)
-        .join(WeekPlanModel)
-        .filter(WeekPlanModel.exercise_id == exercise_id)
-        .all()
-    )
-
-    for s in sets:
-        s.weight = (exercise.one_rep_max * (s.percentage / 100)) + exercise.progress_weight
+    refresh_set_weights(db, exercise)
+    refresh_strength_scores(db, user_id, [exercise.name])
+    bump_data_version(db, user_id)
 
     db.commit()
     db.refresh(exercise)
@@ -106,266 +175,151 @@ def delete_exercise(user_id: int, exercise_id: int, db: Session = Depends(get_db
     if exercise.name in protected_exercises:
         raise HTTPException(status_code=403, detail=f"Cannot delete {exercise.name}")
 
-    db.query(SetModel).filter(SetModel.week_plan_id.in_(
-        db.query(WeekPlanModel.id).filter(WeekPlanModel.exercise_id == exercise_id)
-    )).delete(synchronize_session=False)
-    db.query(WeekPlanModel).filter(WeekPlanModel.exercise_id == exercise_id).delete(synchronize_session=False)
+    # Ćwiczenie z harmonogramu treningów też zniknie - klient synchronizacji i zapisane
+    # podsumowania objętości muszą się o tym dowiedzieć
+    scheduled = db.execute(
+        select(ExerciseScheduleModel.id, TrainingPlanScheduleModel.scheduled_date)
+        .join(TrainingPlanScheduleModel, ExerciseScheduleModel.training_plan_id == TrainingPlanScheduleModel.id)
+        .where(ExerciseScheduleModel.exercise_id == exercise_id)
+    ).all()
+
+    # Plany tygodniowe, serie, wpisy w harmonogramie i wyniki AMRAP usuwa baza (ON DELETE CASCADE)
     db.delete(exercise)
+    record_deletions(db, user_id, "exercises", [exercise_id])
+    if scheduled:
+        record_deletions(db, user_id, "exercise_schedules", [row.id for row in scheduled])
+        invalidate_volume(db, user_id, min(row.scheduled_date for row in scheduled), max(row.scheduled_date for row in scheduled))
+    bump_data_version(db, user_id)
     db.commit()
     return {"message": f"Exercise {exercise.name} deleted successfully"}
 
 # Zapisanie wyniku AMRAP
 @router.post("/plan/week/{week_number}/amrap")
 def record_amrap(user_id: int, week_number: int, result: AmrapResult, db: Session = Depends(get_db)):
-    db_set = (
-        db.query(SetModel)
-        .join(WeekPlanModel)
-        .join(ExerciseModel)
+    row = (
+        db.query(SetModel, WeekPlanModel.week_number, ExerciseModel)
+        .join(WeekPlanModel, SetModel.week_plan_id == WeekPlanModel.id)
+        .join(ExerciseModel, WeekPlanModel.exercise_id == ExerciseModel.id)
         .filter(SetModel.id == result.set_id, ExerciseModel.user_id == user_id)
         .first()
     )
-    if not db_set or not db_set.is_amrap:
+    if not row or not row[0].is_amrap:
         raise HTTPException(status_code=404, detail="Set not found or not AMRAP or not owned by user")
 
-    week_plan = db.query(WeekPlanModel).filter(WeekPlanModel.id == db_set.week_plan_id).first()
-    exercise = db.query(ExerciseModel).filter(ExerciseModel.id == week_plan.exercise_id).first()
+    if result.reps_performed < 0:
+        raise HTTPException(status_code=400, detail="reps_performed cannot be negative")
+
+    db_set, plan_week_number, exercise = row
+
+    # Wynik i podsumowanie siły zapisujemy z ciężarem, z jakim seria była wykonana (przed progresem)
+    entry = record_amrap_entry(db, exercise, plan_week_number, db_set.weight, db_set.reps, result.reps_performed)
 
     if result.reps_performed >= db_set.reps * 2:
         increment = 2.5 if exercise.name == "bench_press" else 5.0
         exercise.progress_weight += increment
-        db.commit()
-        db.refresh(exercise)
+        refresh_set_weights(db, exercise, after_week=plan_week_number)
+        refresh_strength_scores(db, user_id, [exercise.name])
+        bump_data_version(db, user_id)
+    db.commit()
 
-        future_sets = (
-            db.query(SetModel)
-            .join(WeekPlanModel)
-            .filter(WeekPlanModel.exercise_id == exercise.id, WeekPlanModel.week_number > week_plan.week_number)
-            .all()
-        )
-        for s in future_sets:
-            s.weight = (exercise.one_rep_max * (s.percentage / 100)) + exercise.progress_weight
-        db.commit()
+    return {
+        "message": "AMRAP recorded",
+        "progress_weight": exercise.progress_weight,
+        "estimated_1rm": entry.estimated_1rm,
+        "personal_record": entry.is_pr
+    }
 
-    return {"message": "AMRAP recorded", "progress_weight": exercise.progress_weight}
+# Przeliczenie zapisanych ciężarów serii po zmianie 1RM lub progresu ćwiczenia - jeden UPDATE
+# zamiast ładowania wszystkich serii do ORM. W trybie "computed" ciężar jest liczony przy odczycie,
+# więc nie dotykamy tabeli sets wcale.
+def refresh_set_weights(db: Session, exercise: ExerciseModel, after_week: Optional[int] = None) -> None:
+    if config.SET_WEIGHT_MODE == "computed":
+        return
+
+    plan_ids = select(WeekPlanModel.id).where(WeekPlanModel.exercise_id == exercise.id)
+    if after_week is not None:
+        plan_ids = plan_ids.where(WeekPlanModel.week_number > after_week)
+
+    sets = SetModel.__table__
+    db.execute(
+        update(sets)
+        .where(sets.c.week_plan_id.in_(plan_ids))
+        .values(weight=(exercise.one_rep_max * (sets.c.percentage / 100)) + exercise.progress_weight)
+    )
 
 # Funkcja pomocnicza do generowania planu z wyborem wersji
 def generate_week_plan(user_id: int, week_number: int, db: Session, plan_version: str = "A") -> List[WeekPlanModel]:
     exercises = db.query(ExerciseModel).filter(ExerciseModel.user_id == user_id).all()
-    plans = []
-
-    # Definicja Planu A (obecny)
-    week_plans_a = {
-        1: {
-            "squats": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "dead_lift": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "bench_press": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)]
-        },
-        2: {
-            "squats": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "dead_lift": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "bench_press": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)]
-        },
-        3: {
-            "squats": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "dead_lift": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "bench_press": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)]
-        },
-        4: {
-            "squats": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "dead_lift": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "bench_press": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)]
-        },
-        5: {
-            "squats": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "dead_lift": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "bench_press": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)]
-        },
-        6: {
-            "squats": [(5, 50, False), (4, 60, False), (3, 70, False), (2, 80, False), (1, 90, False), (1, 100, False)],
-            "dead_lift": [(5, 50, False), (4, 60, False), (3, 70, False), (2, 80, False), (1, 90, False), (1, 100, False)],
-            "bench_press": [(5, 50, False), (4, 60, False), (3, 70, False), (2, 80, False), (1, 90, False), (1, 100, False)]
-        }
-    }
+    try:
+        materialize_week_plans(db, exercises, plan_version, weeks=(week_number,))
+        bump_data_version(db, user_id)
+        db.commit()
+    except IntegrityError:
+        # Równoległe żądanie wygenerowało już ten tydzień (uq_week_plans_exercise_id_week_number)
+        db.rollback()
 
-    # Definicja Planu B (zmodyfikowany)
-    week_plans_b = {
-        1: {
-            "squats": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "dead_lift": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "bench_press": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)]
-        },
-        2: {
-            "squats": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "dead_lift": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "bench_press": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)]
-        },
-        3: {
-            "squats": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "dead_lift": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "bench_press": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)]
-        },
-        4: {
-            "squats": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "dead_lift": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "bench_press": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)]
-        },
-        5: {
-            "squats": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "dead_lift": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "bench_press": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)]
-        },
-        6: {
-            "squats": [(5, 60, False), (4, 70, False), (3, 80, False), (2, 90, True), (1, 100, False)],
-            "dead_lift": [(5, 60, False), (4, 70, False), (3, 80, False), (2, 90, True), (1, 100, False)],
-            "bench_press": [(5, 60, False), (4, 70, False), (3, 80, False), (2, 90, True), (1, 100, False)]
-        }
-    }
+    return (
+        db.query(WeekPlanModel)
+        .options(joinedload(WeekPlanModel.sets))
+        .join(ExerciseModel)
+        .filter(WeekPlanModel.week_number == week_number, ExerciseModel.user_id == user_id)
+        .all()
+    )
 
-    week_plans = week_plans_a if plan_version == "A" else week_plans_b
+# Hurtowe tworzenie planów tygodniowych i serii dla podanych ćwiczeń.
+# Niezależnie od liczby ćwiczeń i tygodni wykonuje trzy zapytania: wielowierszowy INSERT planów,
+# SELECT nadanych id i wielowierszowy INSERT serii. Nie zatwierdza transakcji - robi to wywołujący.
+def materialize_week_plans(
+    db: Session,
+    exercises: List[ExerciseModel],
+    plan_version: str,
+    weeks: Optional[Iterable[int]] = None
+) -> Dict[str, int]:
+    registry = get_plan_registry()
+    weeks = tuple(registry.weeks if weeks is None else weeks)
 
+    templates = {}
     for exercise in exercises:
-        if week_number not in week_plans or exercise.name not in week_plans[week_number]:
-            continue
-        
-        plan = WeekPlanModel(week_number=week_number, exercise_id=exercise.id)
-        db.add(plan)
-        db.flush()
-        
-        for reps, percentage, is_amrap in week_plans[week_number][exercise.name]:
-            weight = (exercise.one_rep_max * (percentage / 100)) + exercise.progress_weight
-            db_set = SetModel(week_plan_id=plan.id, reps=reps, percentage=percentage, is_amrap=is_amrap, weight=weight)
-            db.add(db_set)
-        plans.append(plan)
-    
-    db.commit()
-    return plans
+        for week in weeks:
+            template = registry.sets_for(plan_version, week, exercise.name)
+            if template:
+                templates[(exercise.id, week)] = (exercise, template)
 
-@router.get("/compare-plans", response_model=Dict[str, Any])
-def compare_training_plans(db: Session = Depends(get_db)):
-    """
-    Porównuje plany treningowe A i B, pokazując różnice w układzie ćwiczeń
-    
-    Returns:
-        Słownik z opisem obu planów treningowych
-    """
-    # Definicja Planu A
-    week_plans_a = {
-        1: {
-            "squats": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "dead_lift": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "bench_press": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)]
-        },
-        2: {
-            "squats": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "dead_lift": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "bench_press": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)]
-        },
-        3: {
-            "squats": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "dead_lift": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "bench_press": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)]
-        },
-        4: {
-            "squats": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "dead_lift": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)],
-            "bench_press": [(6, 65, False), (4, 75, False), (2, 85, False), (2, 90, False), (2, 90, True), (4, 75, False)]
-        },
-        5: {
-            "squats": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "dead_lift": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "bench_press": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)]
-        },
-        6: {
-            "squats": [(5, 50, False), (4, 60, False), (3, 70, False), (2, 80, False), (1, 90, False), (1, 100, False)],
-            "dead_lift": [(5, 50, False), (4, 60, False), (3, 70, False), (2, 80, False), (1, 90, False), (1, 100, False)],
-            "bench_press": [(5, 50, False), (4, 60, False), (3, 70, False), (2, 80, False), (1, 90, False), (1, 100, False)]
-        }
-    }
+    if not templates:
+        return {"week_plans": 0, "sets": 0}
 
-    # Definicja Planu B
-    week_plans_b = {
-        1: {
-            "squats": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "dead_lift": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "bench_press": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)]
-        },
-        2: {
-            "squats": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "dead_lift": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "bench_press": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)]
-        },
-        3: {
-            "squats": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "dead_lift": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)],
-            "bench_press": [(6, 62.5, False), (6, 70, False), (6, 70, False), (6, 70, True)]
-        },
-        4: {
-            "squats": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "dead_lift": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)],
-            "bench_press": [(4, 70, False), (4, 75, False), (4, 80, False), (4, 80, False), (4, 80, True)]
-        },
-        5: {
-            "squats": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "dead_lift": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)],
-            "bench_press": [(4, 50, False), (3, 65, False), (2, 80, False), (1, 90, False)]
-        },
-        6: {
-            "squats": [(5, 60, False), (4, 70, False), (3, 80, False), (2, 90, True), (1, 100, False)],
-            "dead_lift": [(5, 60, False), (4, 70, False), (3, 80, False), (2, 90, True), (1, 100, False)],
-            "bench_press": [(5, 60, False), (4, 70, False), (3, 80, False), (2, 90, True), (1, 100, False)]
-        }
-    }
-    
-    # Opis różnic między planami
-    differences = {
-        "plan_a": {
-            "description": "Plan A (klasyczny) - różnicuje treningi dla każdego ćwiczenia w ciągu tygodni 1-3 (rotacja 6/4/2, 4/6/6, 5/6/4)",
-            "characteristics": [
-                "Tydzień 1-3: Każde ćwiczenie ma inny schemat w różnych tygodniach",
-                "Tydzień 4: Wszystkie ćwiczenia wykonywane w schemacie 6/4/2 z AMRAP",
-                "Tydzień 5: Deload - lżejsze obciążenia dla regeneracji",
-                "Tydzień 6: Test maksymalnego ciężaru (do 100% 1RM)"
-            ]
-        },
-        "plan_b": {
-            "description": "Plan B (zmodyfikowany) - prostszy, z powtarzającym się schematem 6/4/6/4 w tygodniach 1-4",
-            "characteristics": [
-                "Tydzień 1 i 3: Wszystkie ćwiczenia w schemacie 6 powtórzeń",
-                "Tydzień 2 i 4: Wszystkie ćwiczenia w schemacie 4 powtórzeń",
-                "Tydzień 5: Deload - lżejsze obciążenia dla regeneracji",
-                "Tydzień 6: Test maksymalnego ciężaru z AMRAP na przedostatnim zestawie"
-            ]
-        },
-        "key_differences": [
-            "Plan A ma bardziej zróżnicowany układ treningów w tygodniach 1-3",
-            "Plan B ma prostszą, bardziej powtarzalną strukturę (6/4/6/4)",
-            "W Planie B, AMRAP występuje również w tygodniu 6 przed ostatnim obciążeniem"
-        ]
-    }
-    
-    # Tworzenie czytelnej reprezentacji planów
-    plan_a_readable = {}
-    plan_b_readable = {}
-    
-    for week in range(1, 7):
-        plan_a_readable[f"week_{week}"] = {}
-        plan_b_readable[f"week_{week}"] = {}
-        
-        for exercise in ["squats", "dead_lift", "bench_press"]:
-            plan_a_readable[f"week_{week}"][exercise] = [
-                {"reps": r, "percentage": p, "is_amrap": a} 
-                for r, p, a in week_plans_a[week][exercise]
-            ]
-            plan_b_readable[f"week_{week}"][exercise] = [
-                {"reps": r, "percentage": p, "is_amrap": a} 
-                for r, p, a in week_plans_b[week][exercise]
-            ]
-    
-    return {
-        "differences": differences,
-        "plan_a": plan_a_readable,
-        "plan_b": plan_b_readable
-    }
-    
-    # router.add_api_route("/compare-plans", compare_plans, methods=["GET"], response_model=dict)
-    
\ No newline at end of file
+    db.execute(
+        insert(WeekPlanModel.__table__),
+        [{"week_number": week, "exercise_id": exercise_id} for exercise_id, week in templates]
+    )
+
+    # MySQL nie obsługuje RETURNING - odczytujemy id nowych planów jednym zapytaniem
+    plan_ids = {}
+    for plan_id, exercise_id, week in db.execute(
+        select(WeekPlanModel.id, WeekPlanModel.exercise_id, WeekPlanModel.week_number)
+        .where(
+            WeekPlanModel.exercise_id.in_({exercise_id for exercise_id, _ in templates}),
+            WeekPlanModel.week_number.in_(weeks)
+        )
+    ):
+        plan_ids[(exercise_id, week)] = max(plan_id, plan_ids.get((exercise_id, week), 0))
+
+    set_rows = []
+    for key, (exercise, template) in templates.items():
+        for reps, percentage, is_amrap in template:
+            set_rows.append({
+                "week_plan_id": plan_ids[key],
+                "reps": reps,
+                "percentage": percentage,
+                "is_amrap": is_amrap,
+                "weight": (exercise.one_rep_max * (percentage / 100)) + exercise.progress_weight
+            })
+    db.execute(insert(SetModel.__table__), set_rows)
+
+    return {"week_plans": len(templates), "sets": len(set_rows)}
+
+# Zachowane dla starszych klientów - te same bajty co GET /plans/compare, bez sesji bazy danych
+@router.get("/compare-plans", response_model=Dict[str, Any])
+async def compare_training_plans(request: Request):
+    catalog = get_plan_catalog()
+    return catalog_response(request, catalog, "compare", catalog.compare)
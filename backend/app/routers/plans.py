@@ -0,0 +1,141 @@
+# backend/app/routers/plans.py
+import json
+import threading
+from typing import Dict, Optional
+
+from fastapi import APIRouter, HTTPException, Request, Response
+
+from app.plan_templates import PlanRegistry, get_plan_registry
+from app.versioning import etag_matches, make_etag, not_modified
+from core import config
+
+router = APIRouter(
+    prefix="/plans",
+    tags=["plans"]
+)
+
+
+# Katalog planów serializowany raz na wersję szablonów (registry.stamp) - żądania zwracają gotowe bajty
+class PlanCatalog:
+    __slots__ = ("stamp", "index", "compare", "versions")
+
+    def __init__(self, registry: PlanRegistry):
+        self.stamp = registry.stamp
+        self.index = _dump(build_index(registry))
+        self.compare = _dump(build_comparison(registry))
+        self.versions: Dict[str, bytes] = {
+            version: _dump(build_version(registry, version)) for version in registry.versions
+        }
+
+
+def _dump(payload) -> bytes:
+    # Ten sam format co JSONResponse FastAPI
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _readable_weeks(registry: PlanRegistry, version: str) -> dict:
+    return {
+        f"week_{week}": {
+            exercise: [
+                {"reps": r, "percentage": p, "is_amrap": a}
+                for r, p, a in registry.sets_for(version, week, exercise)
+            ]
+            for exercise in registry.exercises
+        }
+        for week in registry.weeks
+    }
+
+
+def build_index(registry: PlanRegistry) -> dict:
+    return {
+        "revision": registry.revision,
+        "weeks": list(registry.weeks),
+        "exercises": list(registry.exercises),
+        "plans": [
+            {
+                "version": version,
+                "description": registry.info(version)["description"],
+                "characteristics": list(registry.info(version)["characteristics"]),
+            }
+            for version in registry.versions
+        ],
+    }
+
+
+def build_version(registry: PlanRegistry, version: str) -> dict:
+    info = registry.info(version)
+    return {
+        "version": version,
+        "description": info["description"],
+        "characteristics": list(info["characteristics"]),
+        "weeks": _readable_weeks(registry, version),
+    }
+
+
+def build_comparison(registry: PlanRegistry) -> dict:
+    # Opis różnic między planami
+    differences = {}
+    for version in registry.versions:
+        info = registry.info(version)
+        differences[f"plan_{version.lower()}"] = {
+            "description": info["description"],
+            "characteristics": list(info["characteristics"])
+        }
+    differences["key_differences"] = list(registry.key_differences)
+
+    # Czytelna reprezentacja planów
+    result = {"differences": differences}
+    for version in registry.versions:
+        result[f"plan_{version.lower()}"] = _readable_weeks(registry, version)
+    return result
+
+
+_lock = threading.Lock()
+_catalog: Optional[PlanCatalog] = None
+
+
+def get_plan_catalog() -> PlanCatalog:
+    global _catalog
+    registry = get_plan_registry()
+    catalog = _catalog
+    if catalog is not None and catalog.stamp == registry.stamp:
+        return catalog
+    with _lock:
+        if _catalog is None or _catalog.stamp != registry.stamp:
+            _catalog = PlanCatalog(registry)
+        return _catalog
+
+
+def catalog_response(request: Request, catalog: PlanCatalog, name: str, body: bytes) -> Response:
+    # Szablony zmieniają się tylko przy wdrożeniu nowego pliku - ETag wynika z ich wersji
+    etag = make_etag("plans", catalog.stamp, name)
+    cache_control = f"public, max-age={config.PLAN_CATALOG_MAX_AGE}"
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return Response(
+        content=body,
+        media_type="application/json",
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
+
+
+# Endpointy nie używają bazy danych ani puli wątków - async def
+@router.get("/")
+@router.get("", include_in_schema=False)
+async def list_plans(request: Request):
+    catalog = get_plan_catalog()
+    return catalog_response(request, catalog, "index", catalog.index)
+
+# Musi być zarejestrowane przed /{plan_version}
+@router.get("/compare")
+async def compare_plans(request: Request):
+    catalog = get_plan_catalog()
+    return catalog_response(request, catalog, "compare", catalog.compare)
+
+@router.get("/{plan_version}")
+async def get_plan(plan_version: str, request: Request):
+    catalog = get_plan_catalog()
+    body = catalog.versions.get(plan_version)
+    if body is None:
+        raise HTTPException(status_code=404, detail=get_plan_registry().version_error())
+    return catalog_response(request, catalog, plan_version, body)
@@ -0,0 +1,213 @@
+# backend/app/routers/stats.py
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db import get_async_db, get_db
+from app.dependencies import resolve_user, resolve_user_async
+from app.models.one_rep_max import Exercise as ExerciseModel
+from app.models.user import User as UserModel
+from app.models.strength import AmrapEntry as AmrapEntryModel, ExerciseStrength as ExerciseStrengthModel
+from app.rankings import ALL_CLASSES, RANKED_LIFTS, dots_coefficient, histograms, percentile, score_bucket, weight_class
+from app.schemas.stats import AmrapHistoryEntry, ExerciseStrengthSummary, StrengthRanking, VolumeStats
+from app.volume import bucket_after, bucket_floor, bucket_starts, completed_volume, compute_volume
+from core import config
+
+router = APIRouter(
+    prefix="/users/{user_id}/stats",
+    tags=["stats"]
+)
+
+
+# Podsumowanie siły: ćwiczenia użytkownika z gotowymi statystykami - bez odczytu historii AMRAP
+def _strength_select(user_id: int):
+    return (
+        select(
+            ExerciseModel.id.label("exercise_id"),
+            ExerciseModel.name,
+            ExerciseModel.one_rep_max,
+            ExerciseModel.progress_weight,
+            func.coalesce(ExerciseStrengthModel.entries, 0).label("entries"),
+            func.coalesce(ExerciseStrengthModel.pr_count, 0).label("pr_count"),
+            ExerciseStrengthModel.best_e1rm,
+            ExerciseStrengthModel.best_e1rm_at,
+            ExerciseStrengthModel.best_weight,
+            ExerciseStrengthModel.best_reps,
+            ExerciseStrengthModel.last_e1rm,
+            ExerciseStrengthModel.last_recorded_at,
+            ExerciseStrengthModel.trend_e1rm,
+        )
+        .outerjoin(ExerciseStrengthModel, ExerciseStrengthModel.exercise_id == ExerciseModel.id)
+        .where(ExerciseModel.user_id == user_id)
+        .order_by(ExerciseModel.id)
+    )
+
+def get_strength_stats(user_id: int = Depends(resolve_user), db: Session = Depends(get_db)):
+    return [dict(row) for row in db.execute(_strength_select(user_id)).mappings()]
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_strength_stats_async(user_id: int = Depends(resolve_user_async), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(_strength_select(user_id))
+    return [dict(row) for row in result.mappings()]
+
+router.add_api_route(
+    "/strength",
+    get_strength_stats_async if config.DB_ASYNC else get_strength_stats,
+    methods=["GET"],
+    response_model=List[ExerciseStrengthSummary]
+)
+
+
+# Historia wyników AMRAP ćwiczenia do wykresu - od najnowszych, stronicowana po id (X-Next-Cursor)
+def _history_select(user_id: int, exercise_id: int, limit: int, before_id: Optional[int]):
+    query = select(AmrapEntryModel).where(
+        AmrapEntryModel.exercise_id == exercise_id,
+        AmrapEntryModel.user_id == user_id
+    )
+    if before_id is not None:
+        query = query.where(AmrapEntryModel.id < before_id)
+    return query.order_by(AmrapEntryModel.id.desc()).limit(limit + 1)
+
+def _history_page(response: Response, entries: list, limit: int) -> list:
+    if len(entries) > limit:
+        entries = entries[:limit]
+        response.headers["X-Next-Cursor"] = str(entries[-1].id)
+    return entries
+
+def get_strength_history(
+    exercise_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    before_id: Optional[int] = None,
+    user_id: int = Depends(resolve_user),
+    db: Session = Depends(get_db)
+):
+    entries = db.scalars(_history_select(user_id, exercise_id, limit, before_id)).all()
+    return _history_page(response, entries, limit)
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_strength_history_async(
+    exercise_id: int,
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    before_id: Optional[int] = None,
+    user_id: int = Depends(resolve_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    entries = (await db.scalars(_history_select(user_id, exercise_id, limit, before_id))).all()
+    return _history_page(response, entries, limit)
+
+router.add_api_route(
+    "/strength/{exercise_id}/history",
+    get_strength_history_async if config.DB_ASYNC else get_strength_history,
+    methods=["GET"],
+    response_model=List[AmrapHistoryEntry]
+)
+
+
+# Objętość treningowa w tygodniach/miesiącach. Zakres [from, to] jest rozszerzany do pełnych
+# przedziałów; domyślnie ostatni rok. Zakończone przedziały pochodzą z volume_rollups (app/volume.py).
+@router.get("/volume", response_model=VolumeStats)
+def get_volume_stats(
+    bucket: str = Query("week", pattern="^(week|month)$"),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    user_id: int = Depends(resolve_user),
+    db: Session = Depends(get_db)
+):
+    today = date.today()
+    to_date = to_date or today
+    from_date = from_date or to_date - timedelta(days=365)
+    if from_date > to_date:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+
+    first = bucket_floor(from_date, bucket)
+    end = bucket_after(to_date, bucket)
+    starts = bucket_starts(first, end, bucket)
+    if len(starts) > config.VOLUME_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range exceeds {config.VOLUME_MAX_BUCKETS} buckets")
+
+    # Przedziały przed bieżącym są zakończone - z zapisanych sum; bieżący i przyszłe liczone na żywo
+    split = min(max(first, bucket_floor(today, bucket)), end)
+    sessions, rows = {}, []
+    if first < split:
+        sessions, rows = completed_volume(db, user_id, bucket, first, split)
+    if split < end:
+        live_sessions, live_rows = compute_volume(db, user_id, bucket, split, end)
+        sessions.update(live_sessions)
+        rows.extend(live_rows)
+
+    exercises = {
+        exercise.id: exercise for exercise in db.execute(
+            select(
+                ExerciseModel.id,
+                ExerciseModel.name,
+                (ExerciseModel.one_rep_max + ExerciseModel.progress_weight).label("training_max")
+            ).where(ExerciseModel.user_id == user_id)
+        )
+    }
+    per_bucket = {start: [] for start in starts}
+    for row in sorted(rows, key=lambda row: row["exercise_id"]):
+        exercise = exercises.get(row["exercise_id"])
+        avg_weight = row["tonnage"] / row["total_reps"] if row["total_reps"] else 0.0
+        per_bucket[row["bucket_start"]].append({
+            "exercise_id": row["exercise_id"],
+            "name": exercise.name if exercise else None,
+            "tonnage": row["tonnage"],
+            "sets": row["total_sets"],
+            "reps": row["total_reps"],
+            "sessions": row["sessions"],
+            "avg_weight": round(avg_weight, 2),
+            "avg_intensity": round(avg_weight / exercise.training_max * 100, 1) if exercise and exercise.training_max else None
+        })
+
+    return {
+        "bucket": bucket,
+        "buckets": [
+            {
+                "start": start,
+                "sessions": sessions.get(start, 0),
+                "tonnage": sum(item["tonnage"] for item in items),
+                "exercises": items
+            }
+            for start, items in per_bucket.items()
+        ]
+    }
+
+
+# Pozycja użytkownika wśród osób tej samej płci i kategorii wagowej - z histogramów (app/rankings.py)
+@router.get("/ranking", response_model=StrengthRanking)
+def get_strength_ranking(user_id: int = Depends(resolve_user), db: Session = Depends(get_db)):
+    user = db.query(UserModel.gender, UserModel.weight).filter(UserModel.id == user_id).first()
+    if user.gender not in ("M", "F"):
+        raise HTTPException(status_code=400, detail="Ranking is available for gender 'M' or 'F'")
+
+    class_name = weight_class(user.weight, user.gender)
+    coefficient = dots_coefficient(user.weight, user.gender)
+    distribution = histograms(db, user.gender, class_name)
+    lifts = db.execute(
+        select(ExerciseModel.name, (ExerciseModel.one_rep_max + ExerciseModel.progress_weight).label("training_max"))
+        .where(ExerciseModel.user_id == user_id, ExerciseModel.name.in_(RANKED_LIFTS))
+    ).all()
+
+    rankings = []
+    for lift in sorted(lifts, key=lambda row: RANKED_LIFTS.index(row.name)):
+        dots = lift.training_max * coefficient
+        bucket = score_bucket(dots)
+        class_percentile, class_count = percentile(distribution.get((lift.name, class_name), []), bucket)
+        gender_percentile, gender_count = percentile(distribution.get((lift.name, ALL_CLASSES), []), bucket)
+        rankings.append({
+            "lift": lift.name,
+            "training_max": lift.training_max,
+            "dots": round(dots, 2),
+            "class_percentile": class_percentile,
+            "class_count": class_count,
+            "gender_percentile": gender_percentile,
+            "gender_count": gender_count
+        })
+
+    return {"gender": user.gender, "bodyweight": user.weight, "weight_class": class_name, "lifts": rankings}
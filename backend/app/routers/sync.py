@@ -0,0 +1,98 @@
+# backend/app/routers/sync.py
+import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db import get_async_db, get_db
+from app.models.user import User as UserModel
+from app.schemas.sync import SyncChanges
+from app.serialization import fast_response
+from app.sync import change_queries, cursor_expired, group_deletions, next_cursor, parse_cursor, tombstones_query
+from core import config
+
+router = APIRouter(
+    prefix="/users",
+    tags=["sync"]
+)
+
+
+def _parse_since(since: Optional[str]) -> Optional[datetime.datetime]:
+    if since is None:
+        return None
+    try:
+        return parse_cursor(since)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid sync cursor")
+
+
+def _sync_payload(user: UserModel, server_now: datetime.datetime, since, changes: dict, deleted: dict):
+    payload = dict(
+        changes,
+        cursor=next_cursor(server_now),
+        full=since is None,
+        user=user,
+        deleted=deleted
+    )
+    if config.FAST_RESPONSES:
+        return fast_response(SyncChanges, payload)
+    return payload
+
+
+# Zmiany danych użytkownika od kursora `since` (pole cursor z poprzedniej odpowiedzi).
+# Bez kursora albo z kursorem starszym niż SYNC_TOMBSTONE_TTL_DAYS zwracamy wszystko (full=True).
+def get_sync(
+    user_id: int,
+    since: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    since_at = _parse_since(since)
+    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Czas bazy odczytany przed zapytaniami - zmiany zapisane w trakcie przyjdą w następnej synchronizacji
+    server_now = db.scalar(select(func.now()))
+    if since_at is not None and cursor_expired(since_at, server_now):
+        since_at = None
+
+    changes = {
+        name: [dict(row) for row in db.execute(query).mappings()]
+        for name, query in change_queries(user_id, since_at).items()
+    }
+    deleted = group_deletions(db.execute(tombstones_query(user_id, since_at))) if since_at is not None else {}
+    return _sync_payload(user, server_now, since_at, changes, deleted)
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_sync_async(
+    user_id: int,
+    since: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    since_at = _parse_since(since)
+    user = await db.scalar(select(UserModel).where(UserModel.id == user_id))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    server_now = await db.scalar(select(func.now()))
+    if since_at is not None and cursor_expired(since_at, server_now):
+        since_at = None
+
+    changes = {}
+    for name, query in change_queries(user_id, since_at).items():
+        result = await db.execute(query)
+        changes[name] = [dict(row) for row in result.mappings()]
+    deleted = {}
+    if since_at is not None:
+        deleted = group_deletions(await db.execute(tombstones_query(user_id, since_at)))
+    return _sync_payload(user, server_now, since_at, changes, deleted)
+
+router.add_api_route(
+    "/{user_id}/sync",
+    get_sync_async if config.DB_ASYNC else get_sync,
+    methods=["GET"],
+    response_model=SyncChanges
+)
@@ -1,12 +1,19 @@
 # backend/app/routers/training_schedule.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload, selectinload
+from typing import List, Optional, Tuple
 from datetime import date, timedelta
 import datetime
+import uuid
 
-from app.db import get_db
-from app.models.user import User as UserModel
+from app.db import get_async_db, get_db
+from app.dependencies import resolve_user, resolve_user_async
+from app.serialization import fast_response
+from app.sync import record_deletions
+from app.volume import invalidate_volume
+from core import config
 from app.models.one_rep_max import Exercise as ExerciseModel
 from app.models.training_schedule import TrainingPlanSchedule as TrainingPlanScheduleModel
 from app.models.training_schedule import ExerciseSchedule as ExerciseScheduleModel
@@ -16,31 +23,74 @@ from app.schemas.training_schedule import (
     TrainingPlanScheduleUpdate,
     ExerciseSchedule,
     ExerciseScheduleCreate,
-    ExerciseScheduleUpdate
+    ExerciseScheduleUpdate,
+    ExerciseScheduleOperation,
+    ExerciseScheduleOperationResult,
+    TrainingCalendar,
+    TrainingSeries,
+    TrainingSeriesCreate,
+    TrainingSeriesUpdate
 )
 
+# Separator nazw treningów w GROUP_CONCAT - znak, który nie występuje w nazwach
+CALENDAR_NAME_SEPARATOR = "\x1f"
+
 router = APIRouter(
     prefix="/users/{user_id}/training-schedule",
     tags=["training-schedule"]
 )
 
-# Pobieranie wszystkich planów treningowych użytkownika
-@router.get("/", response_model=List[TrainingPlanSchedule])
+# Pomocnicze funkcje dla asynchronicznych wersji endpointów (DB_ASYNC).
+# Odpowiedź nie zawiera szczegółów ćwiczenia, więc ładujemy tylko ExerciseSchedule (selectin).
+def _training_plans_select(user_id: int):
+    return (
+        select(TrainingPlanScheduleModel)
+        .where(TrainingPlanScheduleModel.user_id == user_id)
+        .options(selectinload(TrainingPlanScheduleModel.exercises))
+    )
+
+def _parse_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        scheduled_date, training_plan_id = cursor.split("_", 1)
+        return date.fromisoformat(scheduled_date), int(training_plan_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _after_cursor(cursor: str):
+    # Keyset po (scheduled_date, id) - korzysta z indeksu (user_id, scheduled_date), bez OFFSET
+    scheduled_date, training_plan_id = _parse_cursor(cursor)
+    return or_(
+        TrainingPlanScheduleModel.scheduled_date > scheduled_date,
+        and_(
+            TrainingPlanScheduleModel.scheduled_date == scheduled_date,
+            TrainingPlanScheduleModel.id > training_plan_id
+        )
+    )
+
+def _page(training_plans: list, limit: Optional[int], response: Response) -> list:
+    # Pobieramy limit + 1 planów; nadmiarowy oznacza, że istnieje kolejna strona
+    if limit is not None and len(training_plans) > limit:
+        training_plans = training_plans[:limit]
+        last = training_plans[-1]
+        response.headers["X-Next-Cursor"] = f"{last.scheduled_date.isoformat()}_{last.id}"
+    return training_plans
+
+# Pobieranie planów treningowych użytkownika. Z parametrem limit - stronicowanie:
+# kolejna strona to ?cursor=<X-Next-Cursor>; bez limitu zwracamy cały zakres dat.
 def get_all_training_plans(
-    user_id: int, 
+    response: Response,
     from_date: Optional[date] = None, 
     to_date: Optional[date] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    user_id: int = Depends(resolve_user),
     db: Session = Depends(get_db)
 ):
-    # Sprawdzenie czy użytkownik istnieje
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="Użytkownik nie znaleziony")
-    
-    # Przygotowanie zapytania
+    # Przygotowanie zapytania - ćwiczenia planów jednym dodatkowym zapytaniem (selectin)
     query = db.query(TrainingPlanScheduleModel).filter(
         TrainingPlanScheduleModel.user_id == user_id
     ).options(
-        joinedload(TrainingPlanScheduleModel.exercises).joinedload(ExerciseScheduleModel.exercise)
+        selectinload(TrainingPlanScheduleModel.exercises)
     )
     
     # Dodaj filtrowanie po dacie jeśli podano
@@ -48,23 +98,59 @@ def get_all_training_plans(
         query = query.filter(TrainingPlanScheduleModel.scheduled_date >= from_date)
     if to_date:
         query = query.filter(TrainingPlanScheduleModel.scheduled_date <= to_date)
+    if cursor:
+        query = query.filter(_after_cursor(cursor))
     
     # Sortuj po dacie
-    training_plans = query.order_by(TrainingPlanScheduleModel.scheduled_date).all()
+    query = query.order_by(TrainingPlanScheduleModel.scheduled_date, TrainingPlanScheduleModel.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    training_plans = _page(query.all(), limit, response)
     
+    if config.FAST_RESPONSES:
+        return fast_response(List[TrainingPlanSchedule], training_plans, response)
+    return training_plans
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_all_training_plans_async(
+    response: Response,
+    from_date: Optional[date] = None, 
+    to_date: Optional[date] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    cursor: Optional[str] = None,
+    user_id: int = Depends(resolve_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = _training_plans_select(user_id)
+    if from_date:
+        query = query.where(TrainingPlanScheduleModel.scheduled_date >= from_date)
+    if to_date:
+        query = query.where(TrainingPlanScheduleModel.scheduled_date <= to_date)
+    if cursor:
+        query = query.where(_after_cursor(cursor))
+
+    query = query.order_by(TrainingPlanScheduleModel.scheduled_date, TrainingPlanScheduleModel.id)
+    if limit is not None:
+        query = query.limit(limit + 1)
+    result = await db.execute(query)
+    training_plans = _page(result.scalars().all(), limit, response)
+    if config.FAST_RESPONSES:
+        return fast_response(List[TrainingPlanSchedule], training_plans, response)
     return training_plans
 
+router.add_api_route(
+    "/",
+    get_all_training_plans_async if config.DB_ASYNC else get_all_training_plans,
+    methods=["GET"],
+    response_model=List[TrainingPlanSchedule]
+)
+
 # Pobieranie harmonogramu na konkretny dzień
-@router.get("/day/{day_date}", response_model=List[TrainingPlanSchedule])
 def get_training_plans_for_day(
-    user_id: int, 
     day_date: date,
+    user_id: int = Depends(resolve_user),
     db: Session = Depends(get_db)
 ):
-    # Sprawdzenie czy użytkownik istnieje
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="Użytkownik nie znaleziony")
-    
     # Pobierz plany treningowe na dany dzień
     training_plans = db.query(TrainingPlanScheduleModel).filter(
         TrainingPlanScheduleModel.user_id == user_id,
@@ -75,16 +161,29 @@ def get_training_plans_for_day(
     
     return training_plans
 
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_training_plans_for_day_async(
+    day_date: date,
+    user_id: int = Depends(resolve_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(
+        _training_plans_select(user_id).where(TrainingPlanScheduleModel.scheduled_date == day_date)
+    )
+    return result.scalars().all()
+
+router.add_api_route(
+    "/day/{day_date}",
+    get_training_plans_for_day_async if config.DB_ASYNC else get_training_plans_for_day,
+    methods=["GET"],
+    response_model=List[TrainingPlanSchedule]
+)
+
 # Pobieranie harmonogramu na bieżący tydzień
-@router.get("/current-week", response_model=List[TrainingPlanSchedule])
 def get_training_plans_for_current_week(
-    user_id: int, 
+    user_id: int = Depends(resolve_user),
     db: Session = Depends(get_db)
 ):
-    # Sprawdzenie czy użytkownik istnieje
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="Użytkownik nie znaleziony")
-    
     # Oblicz datę początku i końca bieżącego tygodnia
     today = datetime.date.today()
     start_of_week = today - timedelta(days=today.weekday())
@@ -101,17 +200,97 @@ def get_training_plans_for_current_week(
     
     return training_plans
 
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_training_plans_for_current_week_async(
+    user_id: int = Depends(resolve_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    today = datetime.date.today()
+    start_of_week = today - timedelta(days=today.weekday())
+    end_of_week = start_of_week + timedelta(days=6)
+    
+    result = await db.execute(
+        _training_plans_select(user_id)
+        .where(
+            TrainingPlanScheduleModel.scheduled_date >= start_of_week,
+            TrainingPlanScheduleModel.scheduled_date <= end_of_week
+        )
+        .order_by(TrainingPlanScheduleModel.scheduled_date)
+    )
+    return result.scalars().all()
+
+router.add_api_route(
+    "/current-week",
+    get_training_plans_for_current_week_async if config.DB_ASYNC else get_training_plans_for_current_week,
+    methods=["GET"],
+    response_model=List[TrainingPlanSchedule]
+)
+
+# Kalendarz miesiąca: liczba i nazwy treningów dla każdego dnia z jednego zapytania GROUP BY,
+# bez ładowania ćwiczeń. Musi być zarejestrowany przed /{training_plan_id}.
+def _month_range(month: str) -> Tuple[date, date]:
+    try:
+        first_day = datetime.datetime.strptime(month, "%Y-%m").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Month must be in YYYY-MM format")
+    next_month = (first_day + timedelta(days=32)).replace(day=1)
+    return first_day, next_month
+
+def _calendar_select(user_id: int, month: str):
+    first_day, next_month = _month_range(month)
+    return (
+        select(
+            TrainingPlanScheduleModel.scheduled_date,
+            func.count(TrainingPlanScheduleModel.id).label("count"),
+            func.aggregate_strings(TrainingPlanScheduleModel.name, CALENDAR_NAME_SEPARATOR).label("names")
+        )
+        .where(
+            TrainingPlanScheduleModel.user_id == user_id,
+            TrainingPlanScheduleModel.scheduled_date >= first_day,
+            TrainingPlanScheduleModel.scheduled_date < next_month
+        )
+        .group_by(TrainingPlanScheduleModel.scheduled_date)
+        .order_by(TrainingPlanScheduleModel.scheduled_date)
+    )
+
+def _calendar(month: str, rows) -> dict:
+    return {
+        "month": month,
+        "days": [
+            {"date": row.scheduled_date, "count": row.count, "names": row.names.split(CALENDAR_NAME_SEPARATOR)}
+            for row in rows
+        ]
+    }
+
+def get_training_calendar(
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+    user_id: int = Depends(resolve_user),
+    db: Session = Depends(get_db)
+):
+    return _calendar(month, db.execute(_calendar_select(user_id, month)).all())
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_training_calendar_async(
+    month: str = Query(..., pattern=r"^\d{4}-\d{2}$"),
+    user_id: int = Depends(resolve_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    result = await db.execute(_calendar_select(user_id, month))
+    return _calendar(month, result.all())
+
+router.add_api_route(
+    "/calendar",
+    get_training_calendar_async if config.DB_ASYNC else get_training_calendar,
+    methods=["GET"],
+    response_model=TrainingCalendar
+)
+
 # Pobieranie konkretnego planu treningowego
-@router.get("/{training_plan_id}", response_model=TrainingPlanSchedule)
 def get_training_plan(
-    user_id: int, 
     training_plan_id: int,
+    user_id: int = Depends(resolve_user),
     db: Session = Depends(get_db)
 ):
-    # Sprawdzenie czy użytkownik istnieje
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="Użytkownik nie znaleziony")
-    
     # Pobierz plan treningowy
     training_plan = db.query(TrainingPlanScheduleModel).filter(
         TrainingPlanScheduleModel.user_id == user_id,
@@ -125,17 +304,35 @@ def get_training_plan(
     
     return training_plan
 
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_training_plan_async(
+    training_plan_id: int,
+    user_id: int = Depends(resolve_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    training_plan = await db.scalar(
+        _training_plans_select(user_id).where(TrainingPlanScheduleModel.id == training_plan_id)
+    )
+    
+    if not training_plan:
+        raise HTTPException(status_code=404, detail="Plan treningowy nie znaleziony")
+    
+    return training_plan
+
+router.add_api_route(
+    "/{training_plan_id}",
+    get_training_plan_async if config.DB_ASYNC else get_training_plan,
+    methods=["GET"],
+    response_model=TrainingPlanSchedule
+)
+
 # Tworzenie nowego planu treningowego
 @router.post("/", response_model=TrainingPlanSchedule)
 def create_training_plan(
-    user_id: int, 
     training_plan: TrainingPlanScheduleCreate,
+    user_id: int = Depends(resolve_user),
     db: Session = Depends(get_db)
 ):
-    # Sprawdzenie czy użytkownik istnieje
-    if not db.query(UserModel).filter(UserModel.id == user_id).first():
-        raise HTTPException(status_code=404, detail="Użytkownik nie znaleziony")
-    
     # Sprawdź czy wszystkie ćwiczenia istnieją i należą do użytkownika
     exercise_ids = [exercise.exercise_id for exercise in training_plan.exercises]
     user_exercises = db.query(ExerciseModel).filter(
@@ -172,6 +369,7 @@ def create_training_plan(
         )
         db.add(db_exercise_schedule)
     
+    invalidate_volume(db, user_id, training_plan.scheduled_date)
     db.commit()
     db.refresh(db_training_plan)
     
@@ -184,6 +382,178 @@ def create_training_plan(
     
     return db_training_plan
 
+# Serie powtarzających się treningów. Reguła jest rozwijana po stronie serwera do zwykłych
+# wierszy planów i ćwiczeń, wstawianych hurtowo w jednej transakcji; wystąpienia łączy series_id.
+def _expand_recurrence(series: TrainingSeriesCreate) -> List[date]:
+    weekdays = sorted(set(series.weekdays))
+    if not weekdays or weekdays[0] < 0 or weekdays[-1] > 6:
+        raise HTTPException(status_code=400, detail="Dni tygodnia muszą być z zakresu 0-6 (0 - poniedziałek)")
+    if series.interval < 1:
+        raise HTTPException(status_code=400, detail="Interwał musi wynosić co najmniej 1 tydzień")
+    if (series.until is None) == (series.count is None):
+        raise HTTPException(status_code=400, detail="Podaj dokładnie jedno z pól: until albo count")
+    if series.count is not None and series.count < 1:
+        raise HTTPException(status_code=400, detail="Liczba wystąpień musi być dodatnia")
+
+    max_occurrences = config.TRAINING_SERIES_MAX_OCCURRENCES
+    dates = []
+    week_start = series.start_date - timedelta(days=series.start_date.weekday())
+    while True:
+        for weekday in weekdays:
+            day = week_start + timedelta(days=weekday)
+            if day < series.start_date:
+                continue
+            if series.until is not None and day > series.until:
+                return dates
+            if len(dates) == max_occurrences:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Reguła generuje więcej niż {max_occurrences} wystąpień"
+                )
+            dates.append(day)
+            if len(dates) == series.count:
+                return dates
+        week_start += timedelta(weeks=series.interval)
+
+def _ensure_user_exercises(db: Session, user_id: int, exercises: List[ExerciseScheduleCreate]) -> None:
+    exercise_ids = {exercise.exercise_id for exercise in exercises}
+    found = db.query(func.count(ExerciseModel.id)).filter(
+        ExerciseModel.id.in_(exercise_ids),
+        ExerciseModel.user_id == user_id
+    ).scalar()
+    if found != len(exercise_ids):
+        raise HTTPException(
+            status_code=400, 
+            detail="Niektóre z wybranych ćwiczeń nie istnieją lub nie należą do tego użytkownika"
+        )
+
+def _insert_series_exercises(db: Session, plan_ids: List[int], exercises: List[ExerciseScheduleCreate]) -> None:
+    rows = [
+        dict(exercise.model_dump(), training_plan_id=plan_id)
+        for plan_id in plan_ids
+        for exercise in exercises
+    ]
+    if rows:
+        db.execute(insert(ExerciseScheduleModel.__table__), rows)
+
+# Wystąpienia serii od from_date włącznie ("to i następne"); bez from_date - cała seria
+def _series_occurrences(db: Session, user_id: int, series_id: str, from_date: Optional[date]):
+    query = select(TrainingPlanScheduleModel.id, TrainingPlanScheduleModel.scheduled_date).where(
+        TrainingPlanScheduleModel.user_id == user_id,
+        TrainingPlanScheduleModel.series_id == series_id
+    )
+    if from_date:
+        query = query.where(TrainingPlanScheduleModel.scheduled_date >= from_date)
+    occurrences = db.execute(query.order_by(TrainingPlanScheduleModel.scheduled_date)).all()
+    if not occurrences:
+        raise HTTPException(status_code=404, detail="Seria treningów nie znaleziona")
+    return occurrences
+
+def _series_summary(series_id: str, dates: List[date]) -> dict:
+    return {"series_id": series_id, "occurrences": len(dates), "first_date": dates[0], "last_date": dates[-1]}
+
+# Tworzenie serii powtarzających się treningów
+@router.post("/series", response_model=TrainingSeries)
+def create_training_series(
+    series: TrainingSeriesCreate,
+    user_id: int = Depends(resolve_user),
+    db: Session = Depends(get_db)
+):
+    dates = _expand_recurrence(series)
+    if not dates:
+        raise HTTPException(status_code=400, detail="Reguła nie generuje żadnego wystąpienia")
+    _ensure_user_exercises(db, user_id, series.exercises)
+
+    # MySQL nie ma RETURNING - id nowych planów odczytujemy jednym zapytaniem po series_id
+    series_id = uuid.uuid4().hex
+    db.execute(
+        insert(TrainingPlanScheduleModel.__table__),
+        [
+            {
+                "user_id": user_id,
+                "name": series.name,
+                "scheduled_date": day,
+                "notes": series.notes,
+                "series_id": series_id
+            }
+            for day in dates
+        ]
+    )
+    plan_ids = db.scalars(
+        select(TrainingPlanScheduleModel.id).where(TrainingPlanScheduleModel.series_id == series_id)
+    ).all()
+    _insert_series_exercises(db, plan_ids, series.exercises)
+    invalidate_volume(db, user_id, dates[0], dates[-1])
+    db.commit()
+
+    return _series_summary(series_id, dates)
+
+# Aktualizacja "tego i następnych" wystąpień serii
+@router.patch("/series/{series_id}", response_model=TrainingSeries)
+def update_training_series(
+    series_id: str,
+    update_data: TrainingSeriesUpdate,
+    from_date: Optional[date] = None,
+    user_id: int = Depends(resolve_user),
+    db: Session = Depends(get_db)
+):
+    update_dict = update_data.model_dump(exclude_unset=True, exclude={"exercises"})
+    # Pominięte pole zostaje bez zmian, ale jawny null w kolumnie NOT NULL to błąd klienta
+    if "name" in update_dict and update_dict["name"] is None:
+        raise HTTPException(status_code=400, detail="Nazwa treningu nie może być pusta")
+
+    occurrences = _series_occurrences(db, user_id, series_id, from_date)
+    plan_ids = [occurrence.id for occurrence in occurrences]
+
+    if update_dict:
+        db.execute(
+            update(TrainingPlanScheduleModel)
+            .where(TrainingPlanScheduleModel.id.in_(plan_ids))
+            .values(**update_dict)
+            .execution_options(synchronize_session=False)
+        )
+
+    # Nowa lista ćwiczeń zastępuje dotychczasową we wszystkich wybranych wystąpieniach
+    if update_data.exercises is not None:
+        _ensure_user_exercises(db, user_id, update_data.exercises)
+        replaced_ids = db.scalars(
+            select(ExerciseScheduleModel.id).where(ExerciseScheduleModel.training_plan_id.in_(plan_ids))
+        ).all()
+        db.execute(
+            delete(ExerciseScheduleModel)
+            .where(ExerciseScheduleModel.id.in_(replaced_ids))
+            .execution_options(synchronize_session=False)
+        )
+        record_deletions(db, user_id, "exercise_schedules", replaced_ids)
+        invalidate_volume(db, user_id, occurrences[0].scheduled_date, occurrences[-1].scheduled_date)
+        _insert_series_exercises(db, plan_ids, update_data.exercises)
+
+    db.commit()
+    return _series_summary(series_id, [occurrence.scheduled_date for occurrence in occurrences])
+
+# Usuwanie "tego i następnych" wystąpień serii
+@router.delete("/series/{series_id}")
+def delete_training_series(
+    series_id: str,
+    from_date: Optional[date] = None,
+    user_id: int = Depends(resolve_user),
+    db: Session = Depends(get_db)
+):
+    occurrences = _series_occurrences(db, user_id, series_id, from_date)
+    plan_ids = [occurrence.id for occurrence in occurrences]
+
+    # Jedno zapytanie - ćwiczenia w planach usuwa baza (ON DELETE CASCADE)
+    db.execute(
+        delete(TrainingPlanScheduleModel)
+        .where(TrainingPlanScheduleModel.id.in_(plan_ids))
+        .execution_options(synchronize_session=False)
+    )
+    record_deletions(db, user_id, "training_plan_schedules", plan_ids)
+    invalidate_volume(db, user_id, occurrences[0].scheduled_date, occurrences[-1].scheduled_date)
+    db.commit()
+
+    return {"message": f"Usunięto {len(plan_ids)} wystąpień serii treningów"}
+
 # Aktualizacja planu treningowego
 @router.patch("/{training_plan_id}", response_model=TrainingPlanSchedule)
 def update_training_plan(
@@ -202,10 +572,15 @@ def update_training_plan(
         raise HTTPException(status_code=404, detail="Plan treningowy nie znaleziony")
     
     # Aktualizuj dane
+    previous_date = training_plan.scheduled_date
     update_dict = update_data.dict(exclude_unset=True)
     for key, value in update_dict.items():
         setattr(training_plan, key, value)
     
+    # Przeniesienie treningu zmienia objętość w obu przedziałach
+    if training_plan.scheduled_date != previous_date:
+        invalidate_volume(db, user_id, previous_date)
+        invalidate_volume(db, user_id, training_plan.scheduled_date)
     db.commit()
     db.refresh(training_plan)
     
@@ -234,8 +609,10 @@ def delete_training_plan(
     if not training_plan:
         raise HTTPException(status_code=404, detail="Plan treningowy nie znaleziony")
     
-    # Usuń plan treningowy (kaskadowe usuwanie ćwiczeń dzięki relacji)
+    # Usuń plan treningowy (ćwiczenia w planie usuwa kaskada w bazie)
     db.delete(training_plan)
+    record_deletions(db, user_id, "training_plan_schedules", [training_plan_id])
+    invalidate_volume(db, user_id, training_plan.scheduled_date)
     db.commit()
     
     return {"message": f"Plan treningowy '{training_plan.name}' został usunięty"}
@@ -277,11 +654,115 @@ def add_exercise_to_plan(
         notes=exercise.notes
     )
     db.add(db_exercise_schedule)
+    invalidate_volume(db, user_id, training_plan.scheduled_date)
     db.commit()
     db.refresh(db_exercise_schedule)
     
     return db_exercise_schedule
 
+# Kolumny NOT NULL, które można zmienić operacją update
+REQUIRED_SCHEDULE_FIELDS = ("sets", "reps", "weight")
+
+# Zbiorcze zmiany ćwiczeń w planie: create/update/delete w jednej transakcji, z jednym
+# sprawdzeniem planu i jednym zapytaniem o istniejące wiersze. Błędna operacja (nieznane id,
+# cudze ćwiczenie) nie przerywa pozostałych - jej wynik ma status 404, a null w wymaganym
+# polu aktualizacji - 422. Liczbę operacji ogranicza TRAINING_BATCH_MAX_OPERATIONS.
+@router.post("/{training_plan_id}/exercises/batch", response_model=List[ExerciseScheduleOperationResult])
+def batch_exercises_in_plan(
+    user_id: int, 
+    training_plan_id: int,
+    operations: List[ExerciseScheduleOperation] = Body(..., max_length=config.TRAINING_BATCH_MAX_OPERATIONS),
+    db: Session = Depends(get_db)
+):
+    # Sprawdź czy plan treningowy istnieje i należy do użytkownika
+    training_plan = db.query(TrainingPlanScheduleModel.scheduled_date).filter(
+        TrainingPlanScheduleModel.id == training_plan_id,
+        TrainingPlanScheduleModel.user_id == user_id
+    ).first()
+    
+    if not training_plan:
+        raise HTTPException(status_code=404, detail="Plan treningowy nie znaleziony")
+
+    # Istniejące ćwiczenia tego planu i ćwiczenia użytkownika - po jednym zapytaniu
+    schedule_ids = {operation.id for operation in operations if operation.op != "create"}
+    existing_ids = set(db.scalars(
+        select(ExerciseScheduleModel.id).where(
+            ExerciseScheduleModel.training_plan_id == training_plan_id,
+            ExerciseScheduleModel.id.in_(schedule_ids)
+        )
+    )) if schedule_ids else set()
+    exercise_ids = {operation.exercise_id for operation in operations if operation.op == "create"}
+    user_exercise_ids = set(db.scalars(
+        select(ExerciseModel.id).where(
+            ExerciseModel.id.in_(exercise_ids),
+            ExerciseModel.user_id == user_id
+        )
+    )) if exercise_ids else set()
+
+    results = []
+    created = []
+    updates = []
+    deleted_ids = set()
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            if operation.exercise_id not in user_exercise_ids:
+                results.append(ExerciseScheduleOperationResult(
+                    index=index, op=operation.op, status=404,
+                    detail="Ćwiczenie nie znalezione lub nie należy do tego użytkownika"
+                ))
+                continue
+            db_exercise_schedule = ExerciseScheduleModel(
+                training_plan_id=training_plan_id,
+                **operation.model_dump(exclude={"op"})
+            )
+            created.append((len(results), db_exercise_schedule))
+            results.append(ExerciseScheduleOperationResult(index=index, op=operation.op, status=201))
+            continue
+
+        if operation.id not in existing_ids or operation.id in deleted_ids:
+            results.append(ExerciseScheduleOperationResult(
+                index=index, op=operation.op, status=404, id=operation.id,
+                detail="Ćwiczenie w planie nie znalezione"
+            ))
+            continue
+
+        if operation.op == "update":
+            values = operation.model_dump(exclude_unset=True, exclude={"op", "id"})
+            null_fields = [field for field in REQUIRED_SCHEDULE_FIELDS if field in values and values[field] is None]
+            if null_fields:
+                results.append(ExerciseScheduleOperationResult(
+                    index=index, op=operation.op, status=422, id=operation.id,
+                    detail=f"Pola nie mogą być puste: {', '.join(null_fields)}"
+                ))
+                continue
+            if values:
+                updates.append(dict(values, id=operation.id))
+        else:
+            deleted_ids.add(operation.id)
+        results.append(ExerciseScheduleOperationResult(index=index, op=operation.op, status=200, id=operation.id))
+
+    # UPDATE po kluczu głównym (executemany) i jeden DELETE ... WHERE id IN (...)
+    if updates:
+        db.execute(update(ExerciseScheduleModel), updates)
+    if deleted_ids:
+        db.execute(
+            delete(ExerciseScheduleModel)
+            .where(ExerciseScheduleModel.id.in_(deleted_ids))
+            .execution_options(synchronize_session=False)
+        )
+        record_deletions(db, user_id, "exercise_schedules", deleted_ids)
+    # Nowe wiersze przez ORM - MySQL nie ma RETURNING, a wynik musi zawierać ich id
+    if created:
+        db.add_all([db_exercise_schedule for _, db_exercise_schedule in created])
+        db.flush()
+        for position, db_exercise_schedule in created:
+            results[position].id = db_exercise_schedule.id
+    if updates or deleted_ids or created:
+        invalidate_volume(db, user_id, training_plan.scheduled_date)
+    db.commit()
+
+    return results
+
 # Aktualizacja ćwiczenia w planie
 @router.patch("/{training_plan_id}/exercises/{exercise_schedule_id}", response_model=ExerciseSchedule)
 def update_exercise_in_plan(
@@ -314,6 +795,7 @@ def update_exercise_in_plan(
     for key, value in update_dict.items():
         setattr(exercise_schedule, key, value)
     
+    invalidate_volume(db, user_id, training_plan.scheduled_date)
     db.commit()
     db.refresh(exercise_schedule)
     
@@ -347,6 +829,8 @@ def delete_exercise_from_plan(
     
     # Usuń ćwiczenie z planu
     db.delete(exercise_schedule)
+    record_deletions(db, user_id, "exercise_schedules", [exercise_schedule_id])
+    invalidate_volume(db, user_id, training_plan.scheduled_date)
     db.commit()
     
     return {"message": "Ćwiczenie zostało usunięte z planu treningowego"}
\ No newline at end of file
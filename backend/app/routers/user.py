@@ -1,44 +1,206 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from typing import List, Optional, Dict
-from datetime import datetime, timedelta
-import bcrypt as raw_bcrypt
+from datetime import date, datetime, timedelta
+import codecs
+import hashlib
+import json
+import logging
 
-from app.schemas.user import User, UserCreate, UserUpdate, WeightHistory as WeightHistorySchema
-from app.schemas.user import PlanVersionChange, UserLogin, LoginResponse
-from app.models.one_rep_max import Exercise as ExerciseModel, Set as SetModel, WeekPlan as WeekPlanModel
+import numpy as np
+
+from app.schemas.user import User, UserCreate, UserDetail, UserSummary, UserUpdate, WeightHistory as WeightHistorySchema
+from app.schemas.one_rep_max import Exercise as ExerciseSchema
+from app.schemas.user import PlanVersionChange, UserLogin, LoginResponse, WeightImportResult, WeightSeries
+from app.models.one_rep_max import Exercise as ExerciseModel, WeekPlan as WeekPlanModel
 from app.models.user import User as UserModel
 from app.models.weight_history import WeightHistory as WeightHistoryModel
-from app.db import SessionLocal, get_db
-from app.routers.one_rep_max import generate_week_plan  # Import funkcji generującej plan
+from app.models.training_schedule import TrainingPlanSchedule as TrainingPlanScheduleModel
+from app.db import SessionLocal, get_async_db, get_db
+from app.dependencies import known_users, resolve_user
+from core import config
+from app.plan_templates import get_plan_registry
+from app.security import password_hasher
+from app.serialization import fast_response
+from app.export import accepts_gzip, export_filename, export_user_data
+from app.idempotency import find_replay, remember_response
+from app.jobs import enqueue_job, job_accepted, job_handler, job_runner
+from app.weight_import import CsvSampleParser, JsonArraySampleParser, WeightImportError
+from app.weight_trend import bucket_start_expression, forecast, moving_average, next_bucket_start
+from app.rankings import refresh_strength_scores, remove_strength_scores
+from app.sync import record_deletions
+from app.versioning import bump_data_version
+from app.routers.one_rep_max import materialize_week_plans  # Import funkcji generującej plany
 
 router = APIRouter(
     prefix="/users",
     tags=["users"]
 )
 
-@router.get("/", response_model=List[User])
-def get_users(db: Session = Depends(get_db)):
-    # Ładujemy relacje z exercises i weight_history
-    return db.query(UserModel).options(
-        joinedload(UserModel.exercises).joinedload(ExerciseModel.week_plans).joinedload(WeekPlanModel.sets),
-        joinedload(UserModel.weight_history)
-    ).all()
+logger = logging.getLogger("app.users")
+
+# Kolumny projekcji UserSummary - lista i wyszukiwanie nie ładują kolekcji użytkownika
+_USER_SUMMARY_COLUMNS = (
+    UserModel.id,
+    UserModel.nickname,
+    UserModel.age,
+    UserModel.height,
+    UserModel.weight,
+    UserModel.gender,
+    UserModel.weight_goal,
+    UserModel.plan_version,
+)
+
+def _set_next_cursor(response: Response, rows: list, limit: int) -> list:
+    # Pobieramy limit + 1 wierszy; nadmiarowy oznacza, że istnieje kolejna strona
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+    return rows
+
+# Lista użytkowników stronicowana po id (keyset): kolejna strona to ?after_id=<X-Next-Cursor>
+def get_users(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    after_id: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    query = db.query(*_USER_SUMMARY_COLUMNS)
+    if after_id is not None:
+        query = query.filter(UserModel.id > after_id)
+    rows = query.order_by(UserModel.id).limit(limit + 1).all()
+    return _set_next_cursor(response, rows, limit)
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_users_async(
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    after_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    query = select(*_USER_SUMMARY_COLUMNS)
+    if after_id is not None:
+        query = query.where(UserModel.id > after_id)
+    result = await db.execute(query.order_by(UserModel.id).limit(limit + 1))
+    return _set_next_cursor(response, result.all(), limit)
+
+router.add_api_route(
+    "/",
+    get_users_async if config.DB_ASYNC else get_users,
+    methods=["GET"],
+    response_model=List[UserSummary]
+)
+
+# Wyszukiwanie po nicku (indeks ix_users_nickname)
+def get_user_by_nickname(nickname: str, db: Session = Depends(get_db)):
+    user = db.query(*_USER_SUMMARY_COLUMNS).filter(UserModel.nickname == nickname).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_user_by_nickname_async(nickname: str, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(*_USER_SUMMARY_COLUMNS).where(UserModel.nickname == nickname))).first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+router.add_api_route(
+    "/by-nickname/{nickname}",
+    get_user_by_nickname_async if config.DB_ASYNC else get_user_by_nickname,
+    methods=["GET"],
+    response_model=UserSummary
+)
+
+# Kolekcje, które można dołączyć do profilu (?include=exercises,plans,weight_history,schedules).
+# "plans" oznacza ćwiczenia razem z planami tygodniowymi i seriami.
+USER_INCLUDES = ("exercises", "plans", "weight_history", "schedules")
+# Bez parametru include zwracamy to samo co wcześniej (zgodność z istniejącymi klientami)
+DEFAULT_USER_INCLUDES = frozenset({"exercises", "plans", "weight_history"})
+
+def _parse_includes(include: Optional[str]) -> frozenset:
+    if include is None:
+        return DEFAULT_USER_INCLUDES
+    includes = frozenset(part.strip() for part in include.split(",") if part.strip())
+    unknown = includes.difference(USER_INCLUDES)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}. Allowed: {', '.join(USER_INCLUDES)}"
+        )
+    if "plans" in includes:
+        includes |= {"exercises"}
+    return includes
+
+def _user_load_options(includes: frozenset) -> list:
+    # Każda kolekcja osobnym zapytaniem (selectin) - bez iloczynu kartezjańskiego serii i historii wagi
+    options = []
+    if "plans" in includes:
+        options.append(
+            selectinload(UserModel.exercises).selectinload(ExerciseModel.week_plans).selectinload(WeekPlanModel.sets)
+        )
+    elif "exercises" in includes:
+        options.append(selectinload(UserModel.exercises).noload(ExerciseModel.week_plans))
+    if "weight_history" in includes:
+        options.append(selectinload(UserModel.weight_history))
+    if "schedules" in includes:
+        options.append(selectinload(UserModel.training_schedules).selectinload(TrainingPlanScheduleModel.exercises))
+    return options
+
+def _user_payload(user: UserModel, includes: frozenset) -> dict:
+    # Słownik zawiera tylko dołączone kolekcje; response_model_exclude_unset pomija resztę
+    payload = UserSummary.model_validate(user).model_dump()
+    if "exercises" in includes:
+        exclude = None if "plans" in includes else {"week_plans"}
+        payload["exercises"] = [
+            ExerciseSchema.model_validate(exercise).model_dump(exclude=exclude) for exercise in user.exercises
+        ]
+    if "weight_history" in includes:
+        payload["weight_history"] = user.weight_history
+    if "schedules" in includes:
+        payload["training_schedules"] = user.training_schedules
+    return payload
 
-@router.get("/{user_id}", response_model=User)
-def get_user(user_id: int, db: Session = Depends(get_db)):
+def get_user(user_id: int, include: Optional[str] = None, db: Session = Depends(get_db)):
+    includes = _parse_includes(include)
     user = (
         db.query(UserModel)
-        .options(
-            joinedload(UserModel.exercises).joinedload(ExerciseModel.week_plans).joinedload(WeekPlanModel.sets),
-            joinedload(UserModel.weight_history)
-        )
+        .options(*_user_load_options(includes))
         .filter(UserModel.id == user_id)
         .first()
     )
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    if config.FAST_RESPONSES:
+        return fast_response(UserDetail, _user_payload(user, includes), exclude_unset=True)
+    return _user_payload(user, includes)
+
+# Wersja asynchroniczna (DB_ASYNC)
+async def get_user_async(user_id: int, include: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    includes = _parse_includes(include)
+    user = await db.scalar(
+        select(UserModel)
+        .options(*_user_load_options(includes))
+        .where(UserModel.id == user_id)
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    if config.FAST_RESPONSES:
+        return fast_response(UserDetail, _user_payload(user, includes), exclude_unset=True)
+    return _user_payload(user, includes)
+
+router.add_api_route(
+    "/{user_id}",
+    get_user_async if config.DB_ASYNC else get_user,
+    methods=["GET"],
+    response_model=UserDetail,
+    response_model_exclude_unset=True
+)
 
 @router.post("/", response_model=User)
 def create_user(user: UserCreate, plan_version: Optional[str] = "A", db: Session = Depends(get_db)):
@@ -47,11 +209,12 @@ def create_user(user: UserCreate, plan_version: Optional[str] = "A", db: Session
     if user.gender not in ["M", "F"]:
         raise HTTPException(status_code=400, detail="Gender must be 'M' or 'F'")
     
-    if plan_version not in ["A", "B"]:
-        raise HTTPException(status_code=400, detail="Plan version must be 'A' or 'B'")
+    registry = get_plan_registry()
+    if not registry.has_version(plan_version):
+        raise HTTPException(status_code=400, detail=registry.version_error())
 
     # Zahaszuj hasło
-    hashed_password = UserModel.hash_password(user.password)
+    hashed_password = password_hasher.hash(user.password)
     
     # Utwórz słownik z danymi użytkownika
     user_data = user.dict(exclude={"password"})
@@ -59,8 +222,7 @@ def create_user(user: UserCreate, plan_version: Optional[str] = "A", db: Session
     
     db_user = UserModel(**user_data)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    db.flush()
     
     # Generowanie domyślnych ćwiczeń dla nowego użytkownika
     default_exercises = [
@@ -68,43 +230,66 @@ def create_user(user: UserCreate, plan_version: Optional[str] = "A", db: Session
         {"name": "dead_lift", "one_rep_max": 100.0},
         {"name": "bench_press", "one_rep_max": 100.0}
     ]
-    for ex in default_exercises:
-        db_ex = ExerciseModel(name=ex["name"], one_rep_max=ex["one_rep_max"], user_id=db_user.id)
-        db.add(db_ex)
-    db.commit()
+    db_exercises = [
+        ExerciseModel(name=ex["name"], one_rep_max=ex["one_rep_max"], progress_weight=0.0, user_id=db_user.id)
+        for ex in default_exercises
+    ]
+    db.add_all(db_exercises)
+    db.flush()
     
-    # Generowanie planu treningowego dla wybranego plan_version
-    for week in range(1, 7):
-        generate_week_plan(db_user.id, week, db, plan_version)
+    # Generowanie planu treningowego dla wybranego plan_version - wszystko w jednej transakcji,
+    # a przy BACKGROUND_JOBS w zadaniu w tle (GET planu tygodnia dogeneruje tydzień, jeśli zadanie jeszcze trwa)
+    if config.BACKGROUND_JOBS:
+        enqueue_job(db, "generate_week_plans", {"user_id": db_user.id, "plan_version": plan_version}, user_id=db_user.id)
+    else:
+        materialize_week_plans(db, db_exercises, plan_version)
     
     db.commit()
+    db.refresh(db_user)
+    job_runner.wake()
     return db_user
 
+@job_handler("generate_week_plans")
+def _generate_week_plans_job(db: Session, payload: dict) -> Dict[str, int]:
+    user_id = payload["user_id"]
+    # Pomijamy tygodnie wygenerowane już na żądanie przez GET planu tygodnia
+    existing = set(db.scalars(
+        select(WeekPlanModel.week_number).join(ExerciseModel).where(ExerciseModel.user_id == user_id).distinct()
+    ))
+    weeks = [week for week in get_plan_registry().weeks if week not in existing]
+    exercises = db.query(ExerciseModel).filter(ExerciseModel.user_id == user_id).all()
+    written = materialize_week_plans(db, exercises, payload["plan_version"], weeks=weeks)
+    if written["week_plans"]:
+        bump_data_version(db, user_id)
+    return written
+
 @router.post("/login", response_model=LoginResponse)
 def login_user(user_data: UserLogin, db: Session = Depends(get_db)):
     user = db.query(UserModel).filter(UserModel.nickname == user_data.nickname).first()
     if not user:
-        print(f"Użytkownik {user_data.nickname} nie znaleziony")
+        logger.info("login failed", extra={"reason": "unknown_user"})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nieprawidłowa nazwa użytkownika lub hasło",
         )
-    print(f"[DEBUG] Używana wersja bcrypt: {getattr(raw_bcrypt, '__version__', 'BRAK VERSION')}")
-    print(f"Sprawdzanie hasła dla {user.nickname}")
-    print(f"Hasło podane: {user_data.password}")
-    print(f"Hasło w bazie: {user.password_hash}")
-    print(f"Hasło podane (raw): {repr(user_data.password)}")
-
     
-    password_match = user.verify_password(user_data.password)
-    print(f"Weryfikacja hasła: {password_match}")
+    password_match, new_hash = password_hasher.verify_and_update(user_data.password, user.password_hash)
     
     if not password_match:
+        logger.info("login failed", extra={"reason": "bad_password", "user_id": user.id})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Nieprawidłowa nazwa użytkownika lub hasło",
         )
     
+    # Koszt bcrypt w konfiguracji się zmienił - zapisz hash z nowym kosztem
+    if new_hash:
+        user.password_hash = new_hash
+        db.commit()
+        logger.info("password rehashed", extra={"user_id": user.id, "rounds": password_hasher.rounds})
+    
+    logger.info("login succeeded", extra={"user_id": user.id})
+    
     # Zwróć dane użytkownika
     return {
         "id": user.id,
@@ -127,7 +312,7 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
     
     # Sprawdź i zaktualizuj hasło, jeśli jest podane
     if "password" in update_data and update_data["password"]:
-        hashed_password = UserModel.hash_password(update_data["password"])
+        hashed_password = password_hasher.hash(update_data["password"])
         update_data["password_hash"] = hashed_password
         del update_data["password"]  # Usuń niezahaszowane hasło z dicta
     
@@ -139,43 +324,259 @@ def update_user(user_id: int, user_update: UserUpdate, db: Session = Depends(get
     for key, value in update_data.items():
         setattr(user, key, value)
     
+    # Masa ciała i płeć wpływają na wynik DOTS i kategorię wagową w rankingu
+    if "weight" in update_data or "gender" in update_data:
+        refresh_strength_scores(db, user_id)
     db.commit()
     db.refresh(user)
     return user
 
+# Usunięcie całego konta kilkoma zapytaniami: ćwiczenia, plany, serie, historia wagi, harmonogram
+# i podsumowania znikają kaskadą ON DELETE CASCADE w bazie, bez ładowania wierszy do sesji.
+# Wyniki rankingu zdejmujemy wcześniej, bo histogramy trzymają liczniki, których kaskada nie zmniejszy.
+# Zwraca False, jeśli użytkownika już nie było. Nie zatwierdza transakcji.
+def purge_user_account(db: Session, user_id: int) -> bool:
+    remove_strength_scores(db, user_id)
+    deleted = db.execute(
+        delete(UserModel).where(UserModel.id == user_id).execution_options(synchronize_session=False)
+    ).rowcount
+    known_users.discard(user_id)
+    return deleted > 0
+
 @router.delete("/{user_id}")
-def delete_user(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+def delete_user(user_id: int, response: Response, db: Session = Depends(get_db)):
+    user = db.query(UserModel.nickname).filter(UserModel.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    db.delete(user)
+    if config.BACKGROUND_JOBS:
+        job = enqueue_job(db, "delete_user", {"user_id": user_id}, user_id=user_id)
+        db.commit()
+        job_runner.wake()
+        return job_accepted(response, job, f"Deletion of user {user.nickname} scheduled")
+    purge_user_account(db, user_id)
     db.commit()
     return {"message": f"User {user.nickname} deleted successfully"}
 
+@job_handler("delete_user")
+def _delete_user_job(db: Session, payload: dict) -> Optional[dict]:
+    # Konto mogło zostać usunięte przez wcześniejsze zadanie - wtedy nic nie robimy
+    purge_user_account(db, payload["user_id"])
+    return None
+
 @router.get("/{user_id}/weight_history", response_model=List[WeightHistorySchema])
-def get_weight_history(user_id: int, db: Session = Depends(get_db)):
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
+def get_weight_history(user_id: int = Depends(resolve_user), db: Session = Depends(get_db)):
     history = db.query(WeightHistoryModel).filter(WeightHistoryModel.user_id == user_id).order_by(WeightHistoryModel.recorded_at.desc()).all()
     return history
 
-@router.post("/{user_id}/weight_history", response_model=WeightHistorySchema)
-def create_weight_history(user_id: int, weight: float, db: Session = Depends(get_db)):
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+# Historia wagi zagregowana w przedziałach (bucket) ze średnią kroczącą z `window` przedziałów.
+# Strony rosnąco po dacie: kolejna to ?after=<X-Next-Cursor>. Trend i prognoza (z `trend_buckets`
+# ostatnich przedziałów) są liczone tylko dla pierwszej strony.
+@router.get("/{user_id}/weight_history/series", response_model=WeightSeries)
+def get_weight_series(
+    user_id: int,
+    response: Response,
+    bucket: str = Query("week", pattern="^(day|week|month)$"),
+    window: int = Query(4, ge=1, le=52),
+    after: Optional[date] = None,
+    limit: int = Query(104, ge=1, le=1000),
+    trend: str = Query("linear", pattern="^(linear|robust)$"),
+    trend_buckets: int = Query(12, ge=2, le=104),
+    horizon_days: int = Query(28, ge=1, le=365),
+    db: Session = Depends(get_db)
+):
+    # Cel wagi jest potrzebny do prognozy - to samo zapytanie sprawdza, czy użytkownik istnieje
+    user = db.query(UserModel.weight_goal).filter(UserModel.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    
+
+    start = bucket_start_expression(WeightHistoryModel.recorded_at, bucket).label("bucket_start")
+    buckets = (
+        db.query(
+            start,
+            func.avg(WeightHistoryModel.weight).label("mean"),
+            func.min(WeightHistoryModel.weight).label("min"),
+            func.max(WeightHistoryModel.weight).label("max"),
+            func.count(WeightHistoryModel.id).label("count")
+        )
+        .filter(WeightHistoryModel.user_id == user_id)
+        .group_by(start)
+    )
+
+    page_query = buckets
+    warmup = []
+    if after is not None:
+        # Filtr po recorded_at (indeks user_id, recorded_at), a nie po wyrażeniu przedziału
+        boundary = next_bucket_start(after, bucket)
+        page_query = page_query.filter(WeightHistoryModel.recorded_at >= boundary)
+        if window > 1:
+            # Przedziały sprzed strony, żeby średnia krocząca była ciągła między stronami
+            warmup = (
+                buckets.filter(WeightHistoryModel.recorded_at < boundary)
+                .order_by(start.desc())
+                .limit(window - 1)
+                .all()
+            )[::-1]
+
+    rows = page_query.order_by(start).limit(limit + 1).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = rows[-1].bucket_start.isoformat()
+
+    means = np.array([row.mean for row in warmup + rows], dtype=float)
+    averages = moving_average(means, window, warmup=len(warmup))
+    points = [
+        {
+            "bucket_start": row.bucket_start,
+            "mean": round(row.mean, 2),
+            "min": round(row.min, 2),
+            "max": round(row.max, 2),
+            "count": row.count,
+            "moving_average": round(float(average), 2),
+        }
+        for row, average in zip(rows, averages)
+    ]
+
+    trend_result = None
+    if after is None:
+        recent = buckets.order_by(start.desc()).limit(trend_buckets).all()[::-1]
+        trend_result = forecast(
+            [row.bucket_start for row in recent],
+            [row.mean for row in recent],
+            user.weight_goal,
+            trend,
+            horizon_days
+        )
+
+    return {"bucket": bucket, "window": window, "points": points, "trend": trend_result}
+
+# Hurtowy import pomiarów wagi: JSON (tablica obiektów) albo CSV, parsowane w trakcie odbierania treści.
+# Duplikaty (ten sam recorded_at w imporcie lub w bazie) są pomijane, wiersze zapisywane wielowierszowymi
+# INSERT-ami po WEIGHT_IMPORT_CHUNK_SIZE. Z nagłówkiem Idempotency-Key ponowienie zwraca pierwszą odpowiedź.
+@router.post("/{user_id}/weight_history/batch", response_model=WeightImportResult)
+async def import_weight_history(
+    request: Request,
+    user_id: int = Depends(resolve_user),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: Session = Depends(get_db)
+):
+    content_type = request.headers.get("content-type", "application/json").split(";")[0].strip().lower()
+    if content_type in ("text/csv", "application/csv"):
+        parser = CsvSampleParser()
+    elif content_type == "application/json":
+        parser = JsonArraySampleParser()
+    else:
+        raise HTTPException(status_code=415, detail="Use application/json or text/csv")
+
+    samples: Dict[datetime, float] = {}
+    received = 0
+    body_hash = hashlib.sha256(content_type.encode())
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+
+    def collect(batch):
+        nonlocal received
+        received += len(batch)
+        if received > config.WEIGHT_IMPORT_MAX_ROWS:
+            raise HTTPException(status_code=413, detail=f"At most {config.WEIGHT_IMPORT_MAX_ROWS} measurements per request")
+        for sample in batch:
+            # Ten sam znacznik czasu kilka razy w imporcie - zostaje ostatnia wartość
+            samples[sample.recorded_at] = sample.weight
+
+    try:
+        async for chunk in request.stream():
+            body_hash.update(chunk)
+            collect(parser.feed(decoder.decode(chunk)))
+        collect(parser.feed(decoder.decode(b"", final=True)))
+        collect(parser.close())
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=422, detail="Request body must be UTF-8")
+    except WeightImportError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    return await run_in_threadpool(
+        _store_weight_import, db, user_id, samples, received, idempotency_key, body_hash.hexdigest()
+    )
+
+def _store_weight_import(
+    db: Session,
+    user_id: int,
+    samples: Dict[datetime, float],
+    received: int,
+    idempotency_key: Optional[str],
+    request_hash: str
+):
+    if idempotency_key:
+        replay = find_replay(db, user_id, idempotency_key, request_hash)
+        if replay is not None:
+            return replay
+
+    # Unikalny klucz (user_id, recorded_at) odrzuca duplikaty także przy równoległych importach -
+    # bez wcześniejszego SELECT, a liczba wstawionych wierszy to rowcount INSERT IGNORE
+    rows = [
+        {"user_id": user_id, "weight": weight, "recorded_at": recorded_at}
+        for recorded_at, weight in sorted(samples.items())
+    ]
+    statement = (
+        insert(WeightHistoryModel.__table__)
+        .prefix_with("IGNORE", dialect="mysql")
+        .prefix_with("OR IGNORE", dialect="sqlite")
+    )
+    inserted = 0
+    for start in range(0, len(rows), config.WEIGHT_IMPORT_CHUNK_SIZE):
+        inserted += db.execute(statement, rows[start:start + config.WEIGHT_IMPORT_CHUNK_SIZE]).rowcount
+
+    result = {"received": received, "inserted": inserted, "duplicates": received - inserted}
+    if idempotency_key:
+        remember_response(db, user_id, idempotency_key, request_hash, 200, json.dumps(result, separators=(",", ":")))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Równoległe żądanie z tym samym kluczem zdążyło zapisać wynik - zwracamy jego odpowiedź
+        db.rollback()
+        replay = find_replay(db, user_id, idempotency_key, request_hash) if idempotency_key else None
+        if replay is None:
+            raise
+        return replay
+
+    logger.info("weight history imported", extra={"user_id": user_id, **result})
+    return result
+
+# Eksport wszystkich danych użytkownika, strumieniowo; gzip, jeśli klient go akceptuje (Accept-Encoding)
+@router.get("/{user_id}/export")
+def export_user(
+    request: Request,
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$"),
+    user_id: int = Depends(resolve_user)
+):
+    gzip = accepts_gzip(request.headers.get("accept-encoding"))
+    media_type = "text/csv; charset=utf-8" if export_format == "csv" else "application/x-ndjson"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{export_filename(user_id, export_format)}"',
+        "Vary": "Accept-Encoding",
+    }
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(export_user_data(user_id, export_format, gzip=gzip), media_type=media_type, headers=headers)
+
+@router.post("/{user_id}/weight_history", response_model=WeightHistorySchema)
+def create_weight_history(weight: float, user_id: int = Depends(resolve_user), db: Session = Depends(get_db)):
     weight_history = WeightHistoryModel(user_id=user_id, weight=weight)
     db.add(weight_history)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # Pomiar z tej samej sekundy narusza unikalny (user_id, recorded_at); brak użytkownika obsługuje resolve_user
+        db.rollback()
+        if db.query(UserModel.id).filter(UserModel.id == user_id).first() is None:
+            raise
+        raise HTTPException(status_code=409, detail="Weight already recorded at this time")
     db.refresh(weight_history)
     return weight_history
 
 @router.post("/{user_id}/change-plan", response_model=Dict[str, str], status_code=status.HTTP_200_OK)
-def change_training_plan(user_id: int, plan_data: PlanVersionChange, db: Session = Depends(get_db)):
+def change_training_plan(user_id: int, plan_data: PlanVersionChange, response: Response, db: Session = Depends(get_db)):
     """
     Zmiana planu treningowego użytkownika i regeneracja wszystkich planów tygodniowych.
+    Przy BACKGROUND_JOBS regeneracja idzie do zadania w tle, a endpoint zwraca 202 z adresem zadania.
     
     Args:
         user_id: ID użytkownika
@@ -187,8 +588,9 @@ def change_training_plan(user_id: int, plan_data: PlanVersionChange, db: Session
     """
     # Sprawdź, czy plan_version jest poprawny
     plan_version = plan_data.plan_version
-    if plan_version not in ["A", "B"]:
-        raise HTTPException(status_code=400, detail="Plan version must be 'A' or 'B'")
+    registry = get_plan_registry()
+    if not registry.has_version(plan_version):
+        raise HTTPException(status_code=400, detail=registry.version_error())
     
     # Sprawdź, czy użytkownik istnieje
     user = db.query(UserModel).filter(UserModel.id == user_id).first()
@@ -199,31 +601,46 @@ def change_training_plan(user_id: int, plan_data: PlanVersionChange, db: Session
     if user.plan_version == plan_version:
         return {"message": f"User already has plan version {plan_version}"}
     
-    # Usuń istniejące plany tygodniowe (i powiązane serie ćwiczeń)
-    # Najpierw usuń serie (sets)
-    db.query(SetModel).filter(
-        SetModel.week_plan_id.in_(
-            db.query(WeekPlanModel.id).join(ExerciseModel).filter(ExerciseModel.user_id == user_id)
-        )
-    ).delete(synchronize_session=False)
-    
-    # Następnie usuń plany tygodniowe (week_plans)
-    db.query(WeekPlanModel).filter(
-        WeekPlanModel.exercise_id.in_(
-            db.query(ExerciseModel.id).filter(ExerciseModel.user_id == user_id)
-        )
-    ).delete(synchronize_session=False)
+    if config.BACKGROUND_JOBS:
+        job = enqueue_job(db, "change_training_plan", {"user_id": user_id, "plan_version": plan_version}, user_id=user_id)
+        db.commit()
+        job_runner.wake()
+        return job_accepted(response, job, f"Change of plan version to {plan_version} scheduled")
     
-    # Aktualizuj wersję planu użytkownika
-    user.plan_version = plan_version
+    written = _replace_week_plans(db, user, plan_version)
     db.commit()
     
-    # Regeneruj plany tygodniowe dla wszystkich ćwiczeń użytkownika
-    for week in range(1, 7):
-        generate_week_plan(user_id, week, db, plan_version)
-    
     return {
         "message": f"Successfully changed plan version to {plan_version} and regenerated all training plans",
         "user_id": str(user_id),
-        "plan_version": plan_version
-    }
\ No newline at end of file
+        "plan_version": plan_version,
+        "week_plans": str(written["week_plans"]),
+        "sets": str(written["sets"])
+    }
+
+@job_handler("change_training_plan")
+def _change_training_plan_job(db: Session, payload: dict) -> Optional[dict]:
+    user = db.query(UserModel).filter(UserModel.id == payload["user_id"]).first()
+    # Użytkownik usunięty albo zmiana już wykonana przez wcześniejsze zadanie
+    if user is None or user.plan_version == payload["plan_version"]:
+        return None
+    return dict(_replace_week_plans(db, user, payload["plan_version"]), plan_version=payload["plan_version"])
+
+def _replace_week_plans(db: Session, user: UserModel, plan_version: str) -> Dict[str, int]:
+    user_id = user.id
+    # Usuń istniejące plany tygodniowe (i powiązane serie ćwiczeń)
+    week_plan_ids = [
+        row.id for row in
+        db.query(WeekPlanModel.id).join(ExerciseModel).filter(ExerciseModel.user_id == user_id)
+    ]
+    # Serie (sets) usuwa baza kaskadą razem z planami tygodniowymi
+    db.query(WeekPlanModel).filter(
+        WeekPlanModel.id.in_(week_plan_ids)
+    ).delete(synchronize_session=False)
+    record_deletions(db, user_id, "week_plans", week_plan_ids)
+    
+    # Aktualizuj wersję planu użytkownika i regeneruj plany tygodniowe w tej samej transakcji
+    user.plan_version = plan_version
+    bump_data_version(db, user_id)
+    exercises = db.query(ExerciseModel).filter(ExerciseModel.user_id == user_id).all()
+    return materialize_week_plans(db, exercises, plan_version)
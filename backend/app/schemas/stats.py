@@ -0,0 +1,71 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import date, datetime
+
+# Podsumowanie siły ćwiczenia (GET /users/{user_id}/stats/strength) - z exercise_strength_stats
+class ExerciseStrengthSummary(BaseModel):
+    exercise_id: int
+    name: str
+    one_rep_max: float
+    progress_weight: float
+    entries: int = 0
+    pr_count: int = 0
+    best_e1rm: Optional[float] = None
+    best_e1rm_at: Optional[datetime] = None
+    best_weight: Optional[float] = None
+    best_reps: Optional[int] = None
+    last_e1rm: Optional[float] = None
+    last_recorded_at: Optional[datetime] = None
+    trend_e1rm: Optional[float] = None
+
+class AmrapHistoryEntry(BaseModel):
+    id: int
+    week_number: int
+    weight: float
+    target_reps: int
+    reps_performed: int
+    e1rm_epley: float
+    e1rm_brzycki: Optional[float] = None
+    estimated_1rm: float
+    is_pr: bool
+    recorded_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# Objętość treningowa (GET /users/{user_id}/stats/volume)
+class ExerciseVolume(BaseModel):
+    exercise_id: int
+    name: Optional[str] = None
+    tonnage: float
+    sets: int
+    reps: int
+    sessions: int
+    avg_weight: float
+    avg_intensity: Optional[float] = None  # % aktualnego 1RM (z progresem)
+
+class VolumeBucketStats(BaseModel):
+    start: date
+    sessions: int
+    tonnage: float
+    exercises: List[ExerciseVolume]
+
+class VolumeStats(BaseModel):
+    bucket: str
+    buckets: List[VolumeBucketStats]
+
+# Ranking siły względnej (GET /users/{user_id}/stats/ranking); percentyl None - brak danych
+class LiftRanking(BaseModel):
+    lift: str
+    training_max: float
+    dots: float
+    class_percentile: Optional[float] = None
+    class_count: int
+    gender_percentile: Optional[float] = None
+    gender_count: int
+
+class StrengthRanking(BaseModel):
+    gender: str
+    bodyweight: float
+    weight_class: str
+    lifts: List[LiftRanking]
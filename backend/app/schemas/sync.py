@@ -0,0 +1,42 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import date, datetime
+from app.schemas.one_rep_max import Set
+from app.schemas.training_schedule import ExerciseSchedule
+from app.schemas.user import UserSummary, WeightHistory
+
+# Wiersze synchronizacji są płaskie - dzieci przychodzą w swoich listach, tylko gdy same się zmieniły
+class SyncExercise(BaseModel):
+    id: int
+    name: str
+    one_rep_max: float
+    progress_weight: float
+    user_id: int
+
+class SyncWeekPlan(BaseModel):
+    id: int
+    week_number: int
+    exercise_id: int
+
+class SyncTrainingPlan(BaseModel):
+    id: int
+    user_id: int
+    name: str
+    scheduled_date: date
+    notes: Optional[str] = None
+    series_id: Optional[str] = None
+    created_at: datetime
+
+# Odpowiedź GET /users/{user_id}/sync. full=True - klient ma zastąpić swoje dane (brak lub
+# przeterminowany kursor); w przeciwnym razie nadpisuje zmienione wiersze i usuwa te z `deleted`.
+class SyncChanges(BaseModel):
+    cursor: str
+    full: bool
+    user: UserSummary
+    exercises: List[SyncExercise]
+    week_plans: List[SyncWeekPlan]
+    sets: List[Set]
+    weight_history: List[WeightHistory]
+    training_plan_schedules: List[SyncTrainingPlan]
+    exercise_schedules: List[ExerciseSchedule]
+    deleted: Dict[str, List[int]]
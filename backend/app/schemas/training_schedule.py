@@ -1,6 +1,6 @@
 # backend/app/schemas/training_schedule.py
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Annotated, Optional, List, Literal, Union
 from datetime import date, datetime
 
 class ExerciseScheduleBase(BaseModel):
@@ -33,11 +33,46 @@ class TrainingPlanSchedule(TrainingPlanScheduleBase):
     id: int
     user_id: int
     created_at: datetime
+    series_id: Optional[str] = None
     exercises: List[ExerciseSchedule]
 
     class Config:
         from_attributes = True
 
+# Kalendarz miesiąca - liczba i nazwy treningów w każdym dniu, w którym coś zaplanowano
+class CalendarDay(BaseModel):
+    date: date
+    count: int
+    names: List[str]
+
+class TrainingCalendar(BaseModel):
+    month: str
+    days: List[CalendarDay]
+
+# Reguła powtarzania: dni tygodnia (0 - poniedziałek ... 6 - niedziela), co ile tygodni
+# oraz data końcowa (until) albo liczba wystąpień (count)
+class TrainingSeriesCreate(BaseModel):
+    name: str
+    notes: Optional[str] = None
+    start_date: date
+    weekdays: List[int]
+    interval: int = 1
+    until: Optional[date] = None
+    count: Optional[int] = None
+    exercises: List[ExerciseScheduleCreate]
+
+# Zmiana "tego i następnych" wystąpień serii - exercises zastępuje całą listę ćwiczeń
+class TrainingSeriesUpdate(BaseModel):
+    name: Optional[str] = None
+    notes: Optional[str] = None
+    exercises: Optional[List[ExerciseScheduleCreate]] = None
+
+class TrainingSeries(BaseModel):
+    series_id: str
+    occurrences: int
+    first_date: date
+    last_date: date
+
 # Schemat dla aktualizacji planu treningowego
 class TrainingPlanScheduleUpdate(BaseModel):
     name: Optional[str] = None
@@ -50,4 +85,29 @@ class ExerciseScheduleUpdate(BaseModel):
     reps: Optional[int] = None
     weight: Optional[float] = None
     rest_time: Optional[int] = None
-    notes: Optional[str] = None
\ No newline at end of file
+    notes: Optional[str] = None
+
+# Operacje żądania zbiorczego na ćwiczeniach planu (POST /{training_plan_id}/exercises/batch)
+class ExerciseScheduleCreateOperation(ExerciseScheduleCreate):
+    op: Literal["create"]
+
+class ExerciseScheduleUpdateOperation(ExerciseScheduleUpdate):
+    op: Literal["update"]
+    id: int
+
+class ExerciseScheduleDeleteOperation(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+ExerciseScheduleOperation = Annotated[
+    Union[ExerciseScheduleCreateOperation, ExerciseScheduleUpdateOperation, ExerciseScheduleDeleteOperation],
+    Field(discriminator="op")
+]
+
+# Wynik pojedynczej operacji - status jak dla odpowiadającego jej pojedynczego endpointu
+class ExerciseScheduleOperationResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: Optional[int] = None
+    detail: Optional[str] = None
@@ -1,7 +1,8 @@
 from pydantic import BaseModel
 from typing import Optional, List
 from app.schemas.one_rep_max import Exercise
-from datetime import datetime
+from app.schemas.training_schedule import TrainingPlanSchedule
+from datetime import date, datetime
 
 # Definicja WeightHistory w tym samym pliku
 class WeightHistory(BaseModel):
@@ -13,6 +14,37 @@ class WeightHistory(BaseModel):
     class Config:
         from_attributes = True
 
+# Wynik importu historii wagi (POST /users/{user_id}/weight_history/batch)
+class WeightImportResult(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int
+
+# Zagregowana historia wagi (GET /users/{user_id}/weight_history/series)
+class WeightSeriesPoint(BaseModel):
+    bucket_start: date
+    mean: float
+    min: float
+    max: float
+    count: int
+    moving_average: float
+
+class WeightTrend(BaseModel):
+    method: str
+    buckets: int
+    slope_per_week: float
+    current: float
+    projected_date: date
+    projected: float
+    goal: Optional[float] = None
+    goal_date: Optional[date] = None
+
+class WeightSeries(BaseModel):
+    bucket: str
+    window: int
+    points: List[WeightSeriesPoint]
+    trend: Optional[WeightTrend] = None
+
 class UserBase(BaseModel):
     nickname: str
     age: int
@@ -47,6 +79,26 @@ class User(UserBase):
     class Config:
         from_attributes = True
         
+# Lekka projekcja użytkownika dla listy i wyszukiwania po nicku (bez kolekcji)
+class UserSummary(BaseModel):
+    id: int
+    nickname: str
+    age: int
+    height: float
+    weight: float
+    gender: str
+    weight_goal: Optional[float] = None
+    plan_version: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+# Profil z kolekcjami wybranymi przez ?include= - pominięte kolekcje nie trafiają do odpowiedzi
+class UserDetail(UserSummary):
+    exercises: Optional[List[Exercise]] = None
+    weight_history: Optional[List[WeightHistory]] = None
+    training_schedules: Optional[List[TrainingPlanSchedule]] = None
+
 class PlanVersionChange(BaseModel):
     plan_version: str
 
@@ -0,0 +1,149 @@
+# backend/app/security.py
+"""
+Haszowanie haseł (bcrypt) w osobnej puli procesów.
+
+bcrypt celowo kosztuje dziesiątki milisekund CPU, więc seria logowań liczona w wątkach
+requestów zagładza pozostałe endpointy workera. Tutaj obliczenia idą do ograniczonej
+ProcessPoolExecutor; gdy w kolejce czeka już PASSWORD_HASH_QUEUE_LIMIT zadań, od razu
+rzucamy PasswordHasherBusy (serwer zamienia to na 503), zamiast ustawiać żądania w kolejce.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import lru_cache
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from core import config
+
+logger = logging.getLogger("app.security")
+
+
+@lru_cache(maxsize=None)
+def password_context(rounds: int = config.BCRYPT_ROUNDS) -> CryptContext:
+    return CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+
+
+# Funkcje wykonywane w procesach puli - zwracają wynik i czas obliczeń w sekundach
+def _hash_in_worker(password: str, rounds: int) -> Tuple[str, float]:
+    start = time.perf_counter()
+    password_hash = password_context(rounds).hash(password)
+    return password_hash, time.perf_counter() - start
+
+
+def _verify_in_worker(password: str, password_hash: str, rounds: int) -> Tuple[Tuple[bool, Optional[str]], float]:
+    start = time.perf_counter()
+    result = password_context(rounds).verify_and_update(password, password_hash)
+    return result, time.perf_counter() - start
+
+
+def _noop() -> None:
+    return None
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, queue_limit: int, timeout: float, rounds: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.rounds = rounds
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._stats = {"calls": 0, "rejected": 0, "timeouts": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # spawn - proces workera uvicorna ma już wątki, fork mógłby skopiować zablokowane locki
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def start(self) -> None:
+        """Uruchamia procesy puli z wyprzedzeniem, żeby pierwsze logowanie nie czekało na spawn."""
+        executor = self._get_executor()
+        for future in [executor.submit(_noop) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run(self, operation: str, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            logger.warning("password hasher saturated", extra={"operation": operation})
+            raise PasswordHasherBusy()
+
+        start = time.perf_counter()
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        # Slot zwalniamy dopiero, gdy zadanie opuści pulę - po przekroczeniu czasu bcrypt wciąż może
+        # czekać w kolejce albo się liczyć, a limit workers + queue_limit ma obejmować także takie zadania
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            result, compute = future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            # Zadanie jeszcze w kolejce zostanie anulowane; już liczone zwolni slot po zakończeniu
+            future.cancel()
+            with self._lock:
+                self._stats["timeouts"] += 1
+            logger.warning("password hasher timeout", extra={"operation": operation, "timeout_s": self.timeout})
+            raise PasswordHasherBusy()
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["total_ms"] += elapsed_ms
+            self._stats["max_ms"] = max(self._stats["max_ms"], elapsed_ms)
+        logger.debug(
+            "password hasher call",
+            extra={
+                "operation": operation,
+                "total_ms": round(elapsed_ms, 2),
+                "compute_ms": round(compute * 1000, 2),
+                "queue_ms": round(elapsed_ms - compute * 1000, 2),
+            }
+        )
+        return result
+
+    def hash(self, password: str) -> str:
+        return self._run("hash", _hash_in_worker, password, self.rounds)
+
+    def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """Zwraca (czy hasło pasuje, nowy hash albo None). Nowy hash pojawia się, gdy zmienił się koszt bcrypt."""
+        return self._run("verify", _verify_in_worker, password, password_hash, self.rounds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["avg_ms"] = round(stats["total_ms"] / stats["calls"], 2) if stats["calls"] else 0.0
+        stats["total_ms"] = round(stats["total_ms"], 2)
+        stats["max_ms"] = round(stats["max_ms"], 2)
+        stats.update(workers=self.workers, queue_limit=self.queue_limit, rounds=self.rounds)
+        return stats
+
+
+password_hasher = PasswordHasher(
+    workers=config.PASSWORD_HASH_WORKERS,
+    queue_limit=config.PASSWORD_HASH_QUEUE_LIMIT,
+    timeout=config.PASSWORD_HASH_TIMEOUT,
+    rounds=config.BCRYPT_ROUNDS,
+)
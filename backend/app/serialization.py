@@ -0,0 +1,39 @@
+# backend/app/serialization.py
+"""
+Szybka ścieżka serializacji odpowiedzi (FAST_RESPONSES).
+
+Standardowo FastAPI buduje z obiektów ORM instancje response_model, zrzuca je do słowników
+(model_dump), a JSONResponse koduje je jeszcze raz przez json.dumps. Tutaj obiekty ORM są
+walidowane raz przez skompilowany TypeAdapter i od razu kodowane do JSON w pydantic-core,
+bez pośrednich słowników. Wynik ma te same bajty co JSONResponse (zwarty JSON, UTF-8 bez
+escapowania) - sprawdza to benchmarks/serialization.py.
+"""
+from functools import lru_cache
+from typing import Any, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type: Any) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def dump_json(response_type: Any, obj: Any, exclude_unset: bool = False) -> bytes:
+    adapter = _adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True), exclude_unset=exclude_unset)
+
+
+def fast_response(
+    response_type: Any,
+    obj: Any,
+    response: Optional[Response] = None,
+    exclude_unset: bool = False
+) -> Response:
+    """Gotowa odpowiedź JSON; nagłówki ustawione wcześniej na `response` (np. ETag) są przenoszone."""
+    return Response(
+        content=dump_json(response_type, obj, exclude_unset=exclude_unset),
+        media_type="application/json",
+        headers=dict(response.headers) if response is not None else None
+    )
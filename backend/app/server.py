@@ -1,14 +1,37 @@
 # backend/app/server.py
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware  # ← DODAJ TEN IMPORT
-from app.db import Base, engine
-from app.routers import user, one_rep_max, training_schedule
+from fastapi.responses import JSONResponse
+from app.db import Base, engine, warm_up_pool, warm_up_async_pool
+from app.log import setup_logging, shutdown_logging
+from app.security import PasswordHasherBusy, password_hasher
+from app.jobs import job_runner
+from app.routers import user, one_rep_max, training_schedule, plans, stats, sync, jobs, internal
+from core import config
 from app.models import User, Exercise, WeekPlan, Set, WeightHistory, TrainingPlanSchedule, ExerciseSchedule
 
 # Tworzymy tabele (jeśli nie istnieją) - opcjonalne, bo używamy Alembic
 # Base.metadata.create_all(bind=engine)
 
-app = FastAPI()
+# Start i zatrzymanie workera
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    setup_logging()
+    await run_in_threadpool(warm_up_pool)
+    await warm_up_async_pool()
+    await run_in_threadpool(password_hasher.start)
+    if config.BACKGROUND_JOBS:
+        await job_runner.start()
+    yield
+    await job_runner.stop()
+    password_hasher.shutdown()
+    shutdown_logging()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # ← DODAJ CAŁĄ TĘ SEKCJĘ TUTAJ (zaraz po utworzeniu app)
 app.add_middleware(
@@ -19,6 +42,15 @@ app.add_middleware(
     allow_headers=["*"],  # Pozwala na wszystkie nagłówki
 )
 
+# Pula haszowania haseł jest pełna - szybka odmowa zamiast czekania w kolejce
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Serwer jest przeciążony, spróbuj ponownie za chwilę"},
+        headers={"Retry-After": "1"}
+    )
+
 @app.get("/")
 def read_root():
     return {"message": "Hello from FastAPI!"}
@@ -26,4 +58,9 @@ def read_root():
 # Rejestracja routerów
 app.include_router(one_rep_max.router, prefix="", tags=["exercises"])
 app.include_router(user.router)
-app.include_router(training_schedule.router, tags=["training-schedule"])
\ No newline at end of file
+app.include_router(training_schedule.router, tags=["training-schedule"])
+app.include_router(plans.router)
+app.include_router(sync.router)
+app.include_router(stats.router)
+app.include_router(jobs.router)
+app.include_router(internal.router)
@@ -0,0 +1,108 @@
+# backend/app/strength.py
+"""
+Szacowany 1RM z wyników AMRAP i podsumowania siły per ćwiczenie.
+
+Każdy wynik AMRAP zapisujemy z szacowanym 1RM według wzorów Epleya i Brzyckiego. Do porównań
+używamy wzoru Brzyckiego do 10 powtórzeń (dokładniejszy przy niskich powtórzeniach), powyżej -
+Epleya. Podsumowanie (exercise_strength_stats) jest aktualizowane w tej samej transakcji co
+zapis wyniku, więc GET /users/{user_id}/stats/strength czyta jeden wiersz na ćwiczenie.
+"""
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.one_rep_max import Exercise as ExerciseModel
+from app.models.strength import AmrapEntry, ExerciseStrength
+from app.upsert import upsert
+from core import config
+
+BRZYCKI_MAX_REPS = 10
+
+
+def epley(weight: float, reps: int) -> float:
+    if reps <= 1:
+        return weight
+    return weight * (1 + reps / 30)
+
+
+def brzycki(weight: float, reps: int) -> Optional[float]:
+    if reps <= 1:
+        return weight
+    if reps >= 37:
+        return None
+    return weight * 36 / (37 - reps)
+
+
+def estimated_one_rep_max(weight: float, reps: int) -> float:
+    if reps < 1:
+        return 0.0
+    if reps <= BRZYCKI_MAX_REPS:
+        return brzycki(weight, reps)
+    return epley(weight, reps)
+
+
+def record_amrap_entry(
+    db: Session,
+    exercise: ExerciseModel,
+    week_number: int,
+    weight: float,
+    target_reps: int,
+    reps_performed: int
+) -> AmrapEntry:
+    """Zapisuje wynik i aktualizuje podsumowanie ćwiczenia. Nie zatwierdza transakcji - robi to wywołujący."""
+    # Wiersz podsumowania musi istnieć, zanim go zablokujemy - FOR UPDATE na brakującym wierszu
+    # niczego nie blokuje i dwa pierwsze zapisy kończyłyby się konfliktem klucza głównego.
+    # Upsert nie zmienia istniejącego wiersza.
+    table = ExerciseStrength.__table__
+    upsert(
+        db, table,
+        {"exercise_id": exercise.id, "user_id": exercise.user_id, "entries": 0, "pr_count": 0},
+        {"exercise_id": table.c.exercise_id}
+    )
+    # Blokada wiersza podsumowania - równoległe zapisy dla tego samego ćwiczenia idą po kolei
+    stats = db.scalars(
+        select(ExerciseStrength)
+        .where(ExerciseStrength.exercise_id == exercise.id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    ).one()
+
+    # Czas serwera bazy, jak w kolumnach z server_default
+    now = func.now()
+    e1rm = estimated_one_rep_max(weight, reps_performed)
+    is_pr = reps_performed > 0 and (stats.best_e1rm is None or e1rm > stats.best_e1rm)
+    entry = AmrapEntry(
+        user_id=exercise.user_id,
+        exercise_id=exercise.id,
+        week_number=week_number,
+        weight=weight,
+        target_reps=target_reps,
+        reps_performed=reps_performed,
+        e1rm_epley=epley(weight, reps_performed) if reps_performed > 0 else 0.0,
+        e1rm_brzycki=brzycki(weight, reps_performed) if reps_performed > 0 else 0.0,
+        estimated_1rm=e1rm,
+        is_pr=is_pr,
+        recorded_at=now
+    )
+    db.add(entry)
+    db.flush()
+
+    stats.entries += 1
+    if reps_performed < 1:
+        return entry
+
+    if is_pr:
+        stats.pr_count += 1
+        stats.best_e1rm = e1rm
+        stats.best_e1rm_at = now
+        stats.best_result_id = entry.id
+    stats.best_weight = weight if stats.best_weight is None else max(stats.best_weight, weight)
+    stats.best_reps = reps_performed if stats.best_reps is None else max(stats.best_reps, reps_performed)
+    stats.last_e1rm = e1rm
+    stats.last_recorded_at = now
+    if stats.trend_e1rm is None:
+        stats.trend_e1rm = e1rm
+    else:
+        stats.trend_e1rm = config.STRENGTH_TREND_ALPHA * e1rm + (1 - config.STRENGTH_TREND_ALPHA) * stats.trend_e1rm
+    return entry
@@ -0,0 +1,132 @@
+# backend/app/sync.py
+"""
+Synchronizacja przyrostowa danych użytkownika (GET /users/{user_id}/sync).
+
+Śledzone tabele mają kolumnę updated_at ustawianą przy INSERT i każdym UPDATE, a usunięcia
+zapisujemy w sync_tombstones. Kursor to czas serwera bazy danych z chwili odczytu cofnięty
+o SYNC_CURSOR_LAG sekund: transakcja, która zapisała wiersz przed odczytem, ale zatwierdziła
+go po nim, trafi do następnej synchronizacji. Klient nadpisuje wiersze po id, więc wiersze
+wysłane ponownie niczego nie psują.
+
+Usunięcie rodzica obejmuje jego dzieci: tombstone ćwiczenia dotyczy też jego planów tygodniowych
+i serii, planu tygodniowego - jego serii, a planu treningowego - ćwiczeń w tym planie.
+"""
+import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import Select, delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.one_rep_max import Exercise, Set, WeekPlan
+from app.models.sync_tombstone import SyncTombstone
+from app.models.training_schedule import ExerciseSchedule, TrainingPlanSchedule
+from app.models.weight_history import WeightHistory
+from core import config
+
+
+def record_deletions(db: Session, user_id: int, table_name: str, row_ids: Iterable[int]) -> None:
+    """Zapisuje ślady usuniętych wierszy. Nie zatwierdza transakcji - robi to wywołujący."""
+    rows = [{"user_id": user_id, "table_name": table_name, "row_id": row_id} for row_id in row_ids]
+    if not rows:
+        return
+    db.execute(insert(SyncTombstone.__table__), rows)
+
+    # Stare ślady nie są już potrzebne - kursor starszy niż SYNC_TOMBSTONE_TTL_DAYS wymusza
+    # pełną synchronizację. Dzień zapasu na różnicę zegarów aplikacji i bazy.
+    cutoff = datetime.datetime.now() - datetime.timedelta(days=config.SYNC_TOMBSTONE_TTL_DAYS + 1)
+    db.execute(
+        delete(SyncTombstone)
+        .where(SyncTombstone.user_id == user_id, SyncTombstone.deleted_at < cutoff)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def parse_cursor(cursor: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(cursor)
+
+
+def next_cursor(server_now: datetime.datetime) -> str:
+    return (server_now - datetime.timedelta(seconds=config.SYNC_CURSOR_LAG)).isoformat()
+
+
+def cursor_expired(since: datetime.datetime, server_now: datetime.datetime) -> bool:
+    return since < server_now - datetime.timedelta(days=config.SYNC_TOMBSTONE_TTL_DAYS)
+
+
+# Zapytania o wiersze zmienione od `since` (None - wszystkie), po jednym na tabelę
+def change_queries(user_id: int, since: Optional[datetime.datetime]) -> Dict[str, Select]:
+    def changed(query: Select, *columns) -> Select:
+        if since is None:
+            return query
+        return query.where(or_(*(column >= since for column in columns)))
+
+    # W trybie "computed" ciężar serii zależy od 1RM ćwiczenia - zmiana ćwiczenia zmienia jego serie
+    set_changes = (Set.updated_at, Exercise.updated_at) if config.SET_WEIGHT_MODE == "computed" else (Set.updated_at,)
+
+    return {
+        "exercises": changed(
+            select(Exercise.id, Exercise.name, Exercise.one_rep_max, Exercise.progress_weight, Exercise.user_id)
+            .where(Exercise.user_id == user_id),
+            Exercise.updated_at
+        ),
+        "week_plans": changed(
+            select(WeekPlan.id, WeekPlan.week_number, WeekPlan.exercise_id)
+            .join(Exercise, WeekPlan.exercise_id == Exercise.id)
+            .where(Exercise.user_id == user_id),
+            WeekPlan.updated_at
+        ),
+        "sets": changed(
+            select(Set.id, Set.week_plan_id, Set.reps, Set.percentage, Set.is_amrap, Set.weight)
+            .join(WeekPlan, Set.week_plan_id == WeekPlan.id)
+            .join(Exercise, WeekPlan.exercise_id == Exercise.id)
+            .where(Exercise.user_id == user_id),
+            *set_changes
+        ),
+        "weight_history": changed(
+            select(WeightHistory.id, WeightHistory.user_id, WeightHistory.weight, WeightHistory.recorded_at)
+            .where(WeightHistory.user_id == user_id),
+            WeightHistory.updated_at
+        ),
+        "training_plan_schedules": changed(
+            select(
+                TrainingPlanSchedule.id,
+                TrainingPlanSchedule.user_id,
+                TrainingPlanSchedule.name,
+                TrainingPlanSchedule.scheduled_date,
+                TrainingPlanSchedule.notes,
+                TrainingPlanSchedule.series_id,
+                TrainingPlanSchedule.created_at
+            )
+            .where(TrainingPlanSchedule.user_id == user_id),
+            TrainingPlanSchedule.updated_at
+        ),
+        "exercise_schedules": changed(
+            select(
+                ExerciseSchedule.id,
+                ExerciseSchedule.training_plan_id,
+                ExerciseSchedule.exercise_id,
+                ExerciseSchedule.sets,
+                ExerciseSchedule.reps,
+                ExerciseSchedule.weight,
+                ExerciseSchedule.rest_time,
+                ExerciseSchedule.notes
+            )
+            .join(TrainingPlanSchedule, ExerciseSchedule.training_plan_id == TrainingPlanSchedule.id)
+            .where(TrainingPlanSchedule.user_id == user_id),
+            ExerciseSchedule.updated_at
+        ),
+    }
+
+
+def tombstones_query(user_id: int, since: datetime.datetime) -> Select:
+    return select(SyncTombstone.table_name, SyncTombstone.row_id).where(
+        SyncTombstone.user_id == user_id,
+        SyncTombstone.deleted_at >= since
+    )
+
+
+def group_deletions(rows) -> Dict[str, List[int]]:
+    deleted: Dict[str, List[int]] = {}
+    for table_name, row_id in rows:
+        deleted.setdefault(table_name, []).append(row_id)
+    return deleted
@@ -0,0 +1,22 @@
+# backend/app/upsert.py
+"""
+INSERT ... ON DUPLICATE KEY UPDATE niezależny od dialektu.
+
+Produkcja działa na MySQL, ale testy domyślnie na SQLite - tam to samo zapytanie ma postać
+INSERT ... ON CONFLICT (klucz główny) DO UPDATE. W obu wyrażenia w `update` odwołują się do
+istniejącego wiersza (np. table.c.count + 1).
+"""
+from typing import Any, Dict
+
+from sqlalchemy import Table
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+
+def upsert(db: Session, table: Table, values: Dict[str, Any], update: Dict[str, Any]) -> None:
+    """Wstawia wiersz albo aktualizuje istniejący o tym samym kluczu głównym."""
+    if db.get_bind().dialect.name == "sqlite":
+        statement = sqlite.insert(table).values(**values)
+        db.execute(statement.on_conflict_do_update(index_elements=list(table.primary_key.columns), set_=update))
+    else:
+        db.execute(mysql.insert(table).values(**values).on_duplicate_key_update(**update))
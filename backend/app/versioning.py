@@ -0,0 +1,48 @@
+# backend/app/versioning.py
+"""
+Wersja danych użytkownika i warunkowe GET.
+
+users.data_version rośnie w tej samej transakcji co każda zmiana ćwiczeń lub planów
+użytkownika. Odczyty planów i ćwiczeń budują z niej silny ETag, więc na If-None-Match
+odpowiadamy 304 po odczycie jednego wiersza users, bez zapytań do tabel planów.
+"""
+from fastapi import Request, Response
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.user import User as UserModel
+
+# Odpowiedź może być trzymana przez klienta, ale przed użyciem musi być zweryfikowana (ETag)
+REVALIDATE_CACHE_CONTROL = "private, no-cache"
+
+
+def bump_data_version(db: Session, user_id: int) -> None:
+    """Unieważnia ETagi użytkownika. Nie zatwierdza transakcji - robi to wywołujący."""
+    db.execute(
+        update(UserModel)
+        .where(UserModel.id == user_id)
+        .values(data_version=UserModel.data_version + 1)
+    )
+
+
+def make_etag(*parts) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match porównuje słabo - prefiks W/ nie ma znaczenia
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def set_etag(response: Response, etag: str, cache_control: str = REVALIDATE_CACHE_CONTROL) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
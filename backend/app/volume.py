@@ -0,0 +1,177 @@
+# backend/app/volume.py
+"""
+Objętość treningowa (tonaż = serie x powtórzenia x ciężar) z zaplanowanych treningów.
+
+Agregacja to GROUP BY po przedziale i ćwiczeniu w MySQL. Zakończone przedziały zapisujemy
+w volume_buckets/volume_rollups przy pierwszym odczycie; kolejne odczyty liczą na żywo tylko
+bieżący (i przyszłe) przedziały. Każda zmiana harmonogramu unieważnia zapisane przedziały
+obejmujące zmienione daty (invalidate_volume), więc edycja starego treningu nie zostawia
+nieaktualnych sum. Zapis brakujących przedziałów i unieważnienie blokują wiersz użytkownika,
+więc odczyt nie zapisze sum policzonych sprzed zmiany, którą unieważnienie już usunęło.
+Średnia intensywność jest liczona przy odczycie z aktualnego 1RM.
+"""
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, insert, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.training_schedule import ExerciseSchedule, TrainingPlanSchedule
+from app.models.user import User
+from app.models.volume import VolumeBucket, VolumeRollup
+from app.weight_trend import bucket_start_expression, next_bucket_start
+
+VOLUME_BUCKETS = ("week", "month")
+
+
+def bucket_floor(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    return day.replace(day=1)
+
+
+def bucket_after(start: date, bucket: str) -> date:
+    return next_bucket_start(start, bucket).date()
+
+
+def bucket_starts(first: date, end: date, bucket: str) -> List[date]:
+    starts = []
+    while first < end:
+        starts.append(first)
+        first = bucket_after(first, bucket)
+    return starts
+
+
+def invalidate_volume(db: Session, user_id: int, first_day: date, last_day: Optional[date] = None) -> None:
+    """Usuwa zapisane przedziały obejmujące dni [first_day, last_day]. Nie zatwierdza transakcji."""
+    last_day = last_day or first_day
+    _lock_user(db, user_id)
+    for model in (VolumeRollup, VolumeBucket):
+        db.execute(
+            delete(model)
+            .where(
+                model.user_id == user_id,
+                or_(*(
+                    and_(
+                        model.bucket == bucket,
+                        model.bucket_start >= bucket_floor(first_day, bucket),
+                        model.bucket_start <= last_day
+                    )
+                    for bucket in VOLUME_BUCKETS
+                ))
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _lock_user(db: Session, user_id: int) -> None:
+    # Blokada do końca transakcji - unieważnienie i zapis przedziałów użytkownika idą po kolei
+    db.execute(select(User.id).where(User.id == user_id).with_for_update())
+
+
+def compute_volume(db: Session, user_id: int, bucket: str, start: date, end: date) -> Tuple[Dict[date, int], list]:
+    """Liczba treningów na przedział i objętość per (przedział, ćwiczenie) dla dni [start, end)."""
+    bucket_start = bucket_start_expression(TrainingPlanSchedule.scheduled_date, bucket).label("bucket_start")
+    in_range = and_(
+        TrainingPlanSchedule.user_id == user_id,
+        TrainingPlanSchedule.scheduled_date >= start,
+        TrainingPlanSchedule.scheduled_date < end
+    )
+    sessions = db.execute(
+        select(bucket_start, func.count(func.distinct(TrainingPlanSchedule.id)).label("sessions"))
+        .join(ExerciseSchedule, ExerciseSchedule.training_plan_id == TrainingPlanSchedule.id)
+        .where(in_range)
+        .group_by(bucket_start)
+    ).all()
+    per_exercise = db.execute(
+        select(
+            bucket_start,
+            ExerciseSchedule.exercise_id,
+            func.sum(ExerciseSchedule.sets * ExerciseSchedule.reps * ExerciseSchedule.weight).label("tonnage"),
+            func.sum(ExerciseSchedule.sets).label("total_sets"),
+            func.sum(ExerciseSchedule.sets * ExerciseSchedule.reps).label("total_reps"),
+            func.count(func.distinct(ExerciseSchedule.training_plan_id)).label("sessions")
+        )
+        .join(TrainingPlanSchedule, ExerciseSchedule.training_plan_id == TrainingPlanSchedule.id)
+        .where(in_range)
+        .group_by(bucket_start, ExerciseSchedule.exercise_id)
+    ).all()
+    return {row.bucket_start: row.sessions for row in sessions}, [row._asdict() for row in per_exercise]
+
+
+def _store_completed(db: Session, user_id: int, bucket: str, missing: List[date]) -> None:
+    sessions, rows = compute_volume(db, user_id, bucket, missing[0], bucket_after(missing[-1], bucket))
+    wanted = set(missing)
+    db.execute(
+        insert(VolumeBucket.__table__),
+        [{"user_id": user_id, "bucket": bucket, "bucket_start": start, "sessions": sessions.get(start, 0)} for start in missing]
+    )
+    rollups = [dict(row, user_id=user_id, bucket=bucket) for row in rows if row["bucket_start"] in wanted]
+    if rollups:
+        db.execute(insert(VolumeRollup.__table__), rollups)
+
+
+def _stored_starts(db: Session, user_id: int, bucket: str, start: date, end: date) -> set:
+    return set(db.scalars(
+        select(VolumeBucket.bucket_start).where(
+            VolumeBucket.user_id == user_id,
+            VolumeBucket.bucket == bucket,
+            VolumeBucket.bucket_start >= start,
+            VolumeBucket.bucket_start < end
+        )
+    ))
+
+
+def _read_completed(db: Session, user_id: int, bucket: str, start: date, end: date) -> Tuple[Dict[date, int], list]:
+    sessions = dict(db.execute(
+        select(VolumeBucket.bucket_start, VolumeBucket.sessions).where(
+            VolumeBucket.user_id == user_id,
+            VolumeBucket.bucket == bucket,
+            VolumeBucket.bucket_start >= start,
+            VolumeBucket.bucket_start < end
+        )
+    ).all())
+    rows = [
+        row._asdict() for row in db.execute(
+            select(
+                VolumeRollup.bucket_start,
+                VolumeRollup.exercise_id,
+                VolumeRollup.tonnage,
+                VolumeRollup.total_sets,
+                VolumeRollup.total_reps,
+                VolumeRollup.sessions
+            ).where(
+                VolumeRollup.user_id == user_id,
+                VolumeRollup.bucket == bucket,
+                VolumeRollup.bucket_start >= start,
+                VolumeRollup.bucket_start < end
+            )
+        )
+    ]
+    return sessions, rows
+
+
+def completed_volume(db: Session, user_id: int, bucket: str, start: date, end: date) -> Tuple[Dict[date, int], list]:
+    """Objętość zakończonych przedziałów [start, end) - z zapisanych wierszy, brakujące liczone i zapisywane.
+
+    Nie zatwierdza ani nie wycofuje transakcji wywołującego - brakujące przedziały zapisuje w osobnej sesji.
+    """
+    if set(bucket_starts(start, end, bucket)) <= _stored_starts(db, user_id, bucket, start, end):
+        return _read_completed(db, user_id, bucket, start, end)
+
+    with Session(bind=db.get_bind()) as fill:
+        # Pod blokadą sprawdzamy ponownie - równoległe żądanie mogło już zapisać te przedziały,
+        # a trwająca zmiana harmonogramu kończy się (z unieważnieniem) przed naszym odczytem
+        _lock_user(fill, user_id)
+        stored = _stored_starts(fill, user_id, bucket, start, end)
+        missing = [first for first in bucket_starts(start, end, bucket) if first not in stored]
+        try:
+            if missing:
+                _store_completed(fill, user_id, bucket, missing)
+            fill.commit()
+        except IntegrityError:
+            # Bez blokady wierszy (np. SQLite) równoległe żądanie mogło zapisać je przed nami
+            fill.rollback()
+        # Nowa transakcja sesji widzi zapisane przedziały; transakcja wywołującego mogłaby mieć starszy snapshot
+        return _read_completed(fill, user_id, bucket, start, end)
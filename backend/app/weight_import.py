@@ -0,0 +1,158 @@
+# backend/app/weight_import.py
+"""
+Przyrostowe parsery importu historii wagi (JSON i CSV).
+
+Parsery dostają kolejne fragmenty zdekodowanego tekstu (feed) i zwracają pomiary, gdy tylko
+są kompletne, więc treść żądania jest przetwarzana w trakcie odbierania.
+
+JSON: tablica obiektów {"recorded_at": "2025-01-01T07:30:00", "weight": 81.2}.
+CSV: wiersze "recorded_at,weight" (nagłówek opcjonalny, kolejność kolumn wg nagłówka).
+Znaczniki czasu w ISO 8601; czas ze strefą jest przeliczany na UTC.
+"""
+import csv
+import json
+import math
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional, Tuple
+
+# Fragment JSON-a, który nie daje się zdekodować, może być po prostu niepełny - ale nie w nieskończoność
+MAX_PENDING_ITEM_CHARS = 64 * 1024
+
+
+class WeightSample(NamedTuple):
+    recorded_at: datetime
+    weight: float
+
+
+class WeightImportError(ValueError):
+    pass
+
+
+def parse_timestamp(value: str) -> datetime:
+    value = value.strip()
+    if value.endswith(("Z", "z")):
+        value = value[:-1] + "+00:00"
+    timestamp = datetime.fromisoformat(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    # Kolumna DATETIME przechowuje pełne sekundy - tak samo porównujemy duplikaty
+    return timestamp.replace(microsecond=0)
+
+
+def parse_weight(value) -> float:
+    if isinstance(value, bool):
+        raise ValueError("weight must be a number")
+    weight = float(value)
+    if not math.isfinite(weight) or not 0 < weight < 1000:
+        raise ValueError("weight must be between 0 and 1000")
+    return weight
+
+
+class JsonArraySampleParser:
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._state = "start"
+        self._items = 0
+
+    def _sample(self, item) -> WeightSample:
+        self._items += 1
+        if not isinstance(item, dict):
+            raise WeightImportError(f"Item {self._items}: expected an object")
+        try:
+            return WeightSample(parse_timestamp(item["recorded_at"]), parse_weight(item["weight"]))
+        except KeyError as e:
+            raise WeightImportError(f"Item {self._items}: missing field {e.args[0]}")
+        except (TypeError, ValueError, AttributeError) as e:
+            raise WeightImportError(f"Item {self._items}: {e}")
+
+    def feed(self, text: str) -> List[WeightSample]:
+        self._buffer += text
+        samples = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+
+            if self._state == "start":
+                if char != "[":
+                    raise WeightImportError("Expected a JSON array")
+                pos += 1
+                self._state = "first"
+            elif self._state in ("first", "item"):
+                if char == "]" and self._state == "first":
+                    pos += 1
+                    self._state = "done"
+                    continue
+                try:
+                    item, pos = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # Element urwany na granicy fragmentu - czekamy na resztę
+                    if len(buffer) - pos > MAX_PENDING_ITEM_CHARS:
+                        raise WeightImportError(f"Item {self._items + 1}: invalid JSON")
+                    break
+                samples.append(self._sample(item))
+                self._state = "separator"
+            elif self._state == "separator":
+                if char == ",":
+                    self._state = "item"
+                elif char == "]":
+                    self._state = "done"
+                else:
+                    raise WeightImportError(f"Item {self._items}: expected ',' or ']'")
+                pos += 1
+            else:
+                raise WeightImportError("Unexpected data after the JSON array")
+
+        self._buffer = buffer[pos:]
+        return samples
+
+    def close(self) -> List[WeightSample]:
+        if self._buffer.strip() or self._state != "done":
+            raise WeightImportError("Unexpected end of JSON array")
+        return []
+
+
+class CsvSampleParser:
+    def __init__(self):
+        self._buffer = ""
+        self._line = 0
+        self._columns: Optional[Tuple[int, int]] = None
+
+    def _parse_line(self, line: str) -> Optional[WeightSample]:
+        self._line += 1
+        line = line.rstrip("\r")
+        if not line.strip():
+            return None
+        fields = [field.strip() for field in next(csv.reader([line]))]
+
+        if self._columns is None:
+            names = [field.lower() for field in fields]
+            if "recorded_at" in names or "weight" in names:
+                try:
+                    self._columns = (names.index("recorded_at"), names.index("weight"))
+                except ValueError:
+                    raise WeightImportError("CSV header must contain recorded_at and weight columns")
+                return None
+            self._columns = (0, 1)
+
+        try:
+            return WeightSample(parse_timestamp(fields[self._columns[0]]), parse_weight(fields[self._columns[1]]))
+        except IndexError:
+            raise WeightImportError(f"Line {self._line}: expected recorded_at and weight")
+        except ValueError as e:
+            raise WeightImportError(f"Line {self._line}: {e}")
+
+    def feed(self, text: str) -> List[WeightSample]:
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split("\n")
+        return [sample for sample in map(self._parse_line, lines) if sample is not None]
+
+    def close(self) -> List[WeightSample]:
+        sample = self._parse_line(self._buffer)
+        self._buffer = ""
+        return [sample] if sample is not None else []
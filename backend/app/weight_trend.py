@@ -0,0 +1,135 @@
+# backend/app/weight_trend.py
+"""
+Agregacja historii wagi do przedziałów (dzień/tydzień/miesiąc) i prognoza trendu.
+
+Grupowanie odbywa się w bazie, więc do aplikacji trafia jeden wiersz na przedział zamiast
+wszystkich pomiarów. Średnie kroczące i dopasowanie trendu liczone są wektorowo w NumPy na
+średnich z przedziałów.
+"""
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import Date, func
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+BUCKETS = ("day", "week", "month")
+TREND_METHODS = ("linear", "robust")
+# Dalszych dat osiągnięcia celu nie podajemy - przy prawie płaskim trendzie byłyby bez znaczenia
+MAX_GOAL_DAYS = 3650
+
+
+class week_start(FunctionElement):
+    type = Date()
+    inherit_cache = True
+
+
+class month_start(FunctionElement):
+    type = Date()
+    inherit_cache = True
+
+
+@compiles(week_start)
+def _week_start_mysql(element, compiler, **kw):
+    return f"subdate(date({compiler.process(element.clauses, **kw)}), weekday({compiler.process(element.clauses, **kw)}))"
+
+
+@compiles(month_start)
+def _month_start_mysql(element, compiler, **kw):
+    return f"subdate(date({compiler.process(element.clauses, **kw)}), dayofmonth({compiler.process(element.clauses, **kw)}) - 1)"
+
+
+# SQLite (testy) nie ma subdate/weekday - te same daty z modyfikatorów funkcji date()
+@compiles(week_start, "sqlite")
+def _week_start_sqlite(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)}, '-6 days', 'weekday 1')"
+
+
+@compiles(month_start, "sqlite")
+def _month_start_sqlite(element, compiler, **kw):
+    return f"date({compiler.process(element.clauses, **kw)}, 'start of month')"
+
+
+def bucket_start_expression(column, bucket: str):
+    """Początek przedziału dla znacznika czasu: dzień, poniedziałek tygodnia albo 1. dzień miesiąca."""
+    if bucket == "day":
+        return func.date(column, type_=Date)
+    if bucket == "week":
+        return week_start(column)
+    return month_start(column)
+
+
+def next_bucket_start(start: date, bucket: str) -> datetime:
+    """Początek przedziału następującego po `start` - pozwala filtrować po recorded_at (indeks) zamiast po wyrażeniu."""
+    if bucket == "day":
+        following = start + timedelta(days=1)
+    elif bucket == "week":
+        following = start - timedelta(days=start.weekday()) + timedelta(days=7)
+    else:
+        following = start.replace(day=1) + timedelta(days=calendar.monthrange(start.year, start.month)[1])
+    return datetime.combine(following, datetime.min.time())
+
+
+def moving_average(values: np.ndarray, window: int, warmup: int = 0) -> np.ndarray:
+    """
+    Średnia krocząca z `window` ostatnich wartości (na początku serii - z tylu, ile jest).
+    Pierwsze `warmup` wartości to przedziały sprzed bieżącej strony - nie są zwracane.
+    """
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    end = np.arange(1, len(values) + 1)
+    begin = np.maximum(end - window, 0)
+    return ((sums[end] - sums[begin]) / (end - begin))[warmup:]
+
+
+def fit_trend(days: np.ndarray, weights: np.ndarray, method: str):
+    """Zwraca (nachylenie w kg/dzień, wyraz wolny). "robust" to estymator Theila-Sena (mediana nachyleń par)."""
+    if method == "robust":
+        i, j = np.triu_indices(len(days), k=1)
+        dx = days[j] - days[i]
+        valid = dx != 0
+        slope = float(np.median((weights[j] - weights[i])[valid] / dx[valid]))
+        intercept = float(np.median(weights - slope * days))
+        return slope, intercept
+    slope, intercept = np.polyfit(days, weights, 1)
+    return float(slope), float(intercept)
+
+
+def forecast(
+    starts: list,
+    weights: list,
+    goal: Optional[float],
+    method: str,
+    horizon_days: int
+) -> Optional[dict]:
+    """Trend z średnich przedziałów (od najstarszego) i prognoza względem celu wagi użytkownika."""
+    if len(starts) < 2:
+        return None
+
+    origin = starts[-1]
+    days = np.array([(start - origin).days for start in starts], dtype=float)
+    values = np.asarray(weights, dtype=float)
+    slope, intercept = fit_trend(days, values, method)
+
+    # Oś czasu zaczyna się w ostatnim przedziale, więc wyraz wolny to obecna waga wg trendu
+    current = intercept
+    goal_date = None
+    if goal is not None:
+        remaining = goal - current
+        if abs(remaining) < 0.05:
+            goal_date = origin
+        elif slope != 0 and 0 < remaining / slope <= MAX_GOAL_DAYS:
+            # Zaokrąglenie przed ceil - błąd zmiennoprzecinkowy nie może dodać całego dnia
+            goal_date = origin + timedelta(days=int(np.ceil(round(remaining / slope, 6))))
+
+    return {
+        "method": method,
+        "buckets": len(starts),
+        "slope_per_week": round(slope * 7, 3),
+        "current": round(current, 2),
+        "projected_date": origin + timedelta(days=horizon_days),
+        "projected": round(current + slope * horizon_days, 2),
+        "goal": goal,
+        "goal_date": goal_date,
+    }
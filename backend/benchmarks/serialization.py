@@ -0,0 +1,139 @@
+# backend/benchmarks/serialization.py
+"""
+Porównanie kosztu CPU serializacji odpowiedzi: standardowa ścieżka FastAPI
+(response_model + jsonable_encoder + JSONResponse) kontra FAST_RESPONSES (app/serialization.py).
+
+Uruchomienie z katalogu backend:
+    python -m benchmarks.serialization [--iterations 200] [--weight-entries 365]
+
+Dane są budowane w pamięci (obiekty ORM bez sesji), baza danych nie jest potrzebna.
+Skrypt sprawdza też, że obie ścieżki zwracają identyczne bajty.
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+# Silnik bazy tworzony przy imporcie app.db nie łączy się z bazą, ale potrzebuje sterownika
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+
+from app.models import Exercise, ExerciseSchedule, Set, TrainingPlanSchedule, User, WeekPlan, WeightHistory  # noqa: E402
+from app.plan_templates import get_plan_registry  # noqa: E402
+from app.routers.user import _user_payload  # noqa: E402
+from app.routers.user import router as user_router  # noqa: E402
+from app.routers.one_rep_max import router as one_rep_max_router  # noqa: E402
+from app.schemas.one_rep_max import WeekPlan as WeekPlanSchema  # noqa: E402
+from app.schemas.user import UserDetail  # noqa: E402
+from app.serialization import dump_json  # noqa: E402
+
+
+def build_user(weight_entries: int, schedules: int) -> User:
+    registry = get_plan_registry()
+    user = User(id=1, nickname="benchmark", age=30, height=180.0, weight=80.0, gender="M", plan_version="A")
+    set_id = 1
+    plan_id = 1
+    for exercise_id, name in enumerate(registry.exercises, start=1):
+        exercise = Exercise(id=exercise_id, name=name, one_rep_max=100.0, progress_weight=2.5, user_id=1)
+        for week in registry.weeks:
+            plan = WeekPlan(id=plan_id, week_number=week, exercise_id=exercise_id)
+            for reps, percentage, is_amrap in registry.sets_for("A", week, name):
+                plan.sets.append(Set(
+                    id=set_id, week_plan_id=plan_id, reps=reps, percentage=percentage,
+                    is_amrap=is_amrap, weight=100.0 * percentage / 100 + 2.5
+                ))
+                set_id += 1
+            exercise.week_plans.append(plan)
+            plan_id += 1
+        user.exercises.append(exercise)
+
+    start = datetime(2025, 1, 1, 7, 30)
+    for i in range(weight_entries):
+        user.weight_history.append(WeightHistory(
+            id=i + 1, user_id=1, weight=80.0 + (i % 7) * 0.1, recorded_at=start + timedelta(days=i)
+        ))
+    for i in range(schedules):
+        schedule = TrainingPlanSchedule(
+            id=i + 1, user_id=1, name=f"Trening {i + 1}", scheduled_date=(start + timedelta(days=i)).date(),
+            notes="Ciężki dzień", created_at=start
+        )
+        schedule.exercises.append(ExerciseSchedule(
+            id=i + 1, training_plan_id=i + 1, exercise_id=1, sets=5, reps=5, weight=102.5, rest_time=180
+        ))
+        user.training_schedules.append(schedule)
+    return user
+
+
+def find_route(router, path: str):
+    return next(route for route in router.routes if route.path == path and "GET" in route.methods)
+
+
+async def standard_body(route, content) -> bytes:
+    # To samo, co robi FastAPI dla endpointu zwracającego obiekty z response_model
+    serialized = await serialize_response(
+        field=route.response_field,
+        response_content=content,
+        exclude_unset=route.response_model_exclude_unset,
+        is_coroutine=False,
+    )
+    return JSONResponse(serialized).body
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--weight-entries", type=int, default=365)
+    parser.add_argument("--schedules", type=int, default=50)
+    args = parser.parse_args()
+
+    user = build_user(args.weight_entries, args.schedules)
+    includes = frozenset({"exercises", "plans", "weight_history", "schedules"})
+    week_plans = [plan for exercise in user.exercises for plan in exercise.week_plans if plan.week_number == 1]
+
+    cases = [
+        (
+            "GET /users/{user_id}",
+            find_route(user_router, "/users/{user_id}"),
+            lambda: _user_payload(user, includes),
+            lambda: dump_json(UserDetail, _user_payload(user, includes), exclude_unset=True),
+        ),
+        (
+            "GET /users/{user_id}/plan/week/{week_number}",
+            find_route(one_rep_max_router, "/users/{user_id}/plan/week/{week_number}"),
+            lambda: week_plans,
+            lambda: dump_json(List[WeekPlanSchema], week_plans),
+        ),
+    ]
+
+    loop = asyncio.new_event_loop()
+    try:
+        for name, route, content, fast in cases:
+            standard = lambda: loop.run_until_complete(standard_body(route, content()))  # noqa: E731
+            body = standard()
+            if fast() != body:
+                raise SystemExit(f"{name}: fast path output differs from the standard response")
+
+            standard_cpu = cpu_per_call(standard, args.iterations)
+            fast_cpu = cpu_per_call(fast, args.iterations)
+            print(
+                f"{name}: {len(body)} B, standard {standard_cpu * 1000:.3f} ms, "
+                f"fast {fast_cpu * 1000:.3f} ms, saved {(standard_cpu - fast_cpu) * 1000:.3f} ms "
+                f"({(1 - fast_cpu / standard_cpu) * 100:.0f}%) CPU per request"
+            )
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
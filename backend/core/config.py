@@ -13,4 +13,91 @@ DEBUG = os.getenv("DEBUG", "False") == "True"
 APP_HOST = os.getenv("APP_HOST", "0.0.0.0")
 APP_PORT = int(os.getenv("APP_PORT", "8000"))
 
-DATABASE_URL = f"mysql+mysqldb://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
\ No newline at end of file
+DATABASE_URL = os.getenv("DATABASE_URL", f"mysql+mysqldb://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}")
+
+# Pula połączeń - domyślne wartości zależą od środowiska, każdą można nadpisać zmienną środowiskową.
+# Każdy worker uvicorna ma własną pulę, więc serwer otwiera maksymalnie
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) połączeń - musi to się zmieścić w max_connections MySQL.
+_POOL_DEFAULTS = {
+    "local": {"size": 5, "overflow": 5, "recycle": 1800, "timeout": 30, "warmup": 1},
+    "dev": {"size": 5, "overflow": 10, "recycle": 1800, "timeout": 10, "warmup": 2},
+    "prod": {"size": 10, "overflow": 10, "recycle": 1800, "timeout": 5, "warmup": 5},
+}
+_pool_defaults = _POOL_DEFAULTS.get(ENV, _POOL_DEFAULTS["local"])
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", _pool_defaults["size"]))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", _pool_defaults["overflow"]))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", _pool_defaults["recycle"]))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", _pool_defaults["timeout"]))
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", _pool_defaults["warmup"]))
+DB_ECHO = os.getenv("DB_ECHO", str(DEBUG and ENV != "prod")) == "True"
+
+# Token wymagany przez endpointy /internal (puste = bez sprawdzania, np. lokalnie)
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
+
+# Szybka ścieżka odpowiedzi dla ciężkich odczytów: serializacja prosto do JSON przez pydantic-core
+# (app/serialization.py) zamiast response_model + jsonable_encoder + json.dumps. Bajty są takie same.
+FAST_RESPONSES = os.getenv("FAST_RESPONSES", "False") == "True"
+
+# Asynchroniczny stos bazy danych (aiomysql) dla najczęściej odczytywanych endpointów
+DB_ASYNC = os.getenv("DB_ASYNC", "False") == "True"
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
+
+# Szablony planów treningowych (plik z danymi + interwał sprawdzania zmian w sekundach)
+PLAN_TEMPLATES_PATH = os.getenv(
+    "PLAN_TEMPLATES_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "plan_templates.json"),
+)
+PLAN_TEMPLATES_CHECK_INTERVAL = float(os.getenv("PLAN_TEMPLATES_CHECK_INTERVAL", "5"))
+# Czas (s), przez jaki klienci i proxy mogą trzymać katalog planów bez ponownej weryfikacji ETagu
+PLAN_CATALOG_MAX_AGE = int(os.getenv("PLAN_CATALOG_MAX_AGE", "3600"))
+
+# Ciężar serii: "stored" - zapisany w sets.weight, "computed" - wyliczany przy odczycie z 1RM ćwiczenia
+SET_WEIGHT_MODE = os.getenv("SET_WEIGHT_MODE", "stored")
+
+# Haszowanie haseł - rozmiar puli procesów, limit oczekujących zadań (powyżej - 503),
+# maksymalny czas oczekiwania na wynik w sekundach i koszt bcrypt (zmiana => rehash przy logowaniu)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+PASSWORD_HASH_TIMEOUT = float(os.getenv("PASSWORD_HASH_TIMEOUT", "10"))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Cache istniejących użytkowników w workerze (liczba wpisów i czas życia w sekundach)
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))
+
+# Import historii wagi - maksymalna liczba pomiarów w jednym żądaniu i wierszy w jednym INSERT
+WEIGHT_IMPORT_MAX_ROWS = int(os.getenv("WEIGHT_IMPORT_MAX_ROWS", "10000"))
+WEIGHT_IMPORT_CHUNK_SIZE = int(os.getenv("WEIGHT_IMPORT_CHUNK_SIZE", "500"))
+# Jak długo (w godzinach) zapamiętujemy odpowiedzi dla nagłówka Idempotency-Key
+IDEMPOTENCY_KEY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_KEY_TTL_HOURS", "24"))
+
+# Maksymalna liczba wystąpień generowanych z jednej reguły powtarzania harmonogramu
+TRAINING_SERIES_MAX_OCCURRENCES = int(os.getenv("TRAINING_SERIES_MAX_OCCURRENCES", "366"))
+# Maksymalna liczba operacji w jednym żądaniu zbiorczym na ćwiczeniach planu
+TRAINING_BATCH_MAX_OPERATIONS = int(os.getenv("TRAINING_BATCH_MAX_OPERATIONS", "200"))
+
+# Synchronizacja przyrostowa: o ile sekund cofamy kursor względem zegara bazy (zmiany z transakcji
+# zatwierdzonych tuż po odczycie przyjdą ponownie) i jak długo trzymamy ślady usuniętych wierszy
+SYNC_CURSOR_LAG = int(os.getenv("SYNC_CURSOR_LAG", "60"))
+SYNC_TOMBSTONE_TTL_DAYS = int(os.getenv("SYNC_TOMBSTONE_TTL_DAYS", "30"))
+
+# Waga najnowszego wyniku w trendzie szacowanego 1RM (średnia wykładnicza, 0-1)
+STRENGTH_TREND_ALPHA = float(os.getenv("STRENGTH_TREND_ALPHA", "0.3"))
+# Maksymalna liczba przedziałów w jednym zapytaniu o objętość treningową
+VOLUME_MAX_BUCKETS = int(os.getenv("VOLUME_MAX_BUCKETS", "520"))
+
+# Zadania w tle (app/jobs.py): zmiana planu, usuwanie konta i generowanie planu przy rejestracji
+# zwracają 202 i wykonują się poza żądaniem. Liczba równoległych zadań na worker, odstęp odpytywania
+# kolejki (s), liczba prób, bazowe i maksymalne opóźnienie ponowienia (s) oraz czas, po którym
+# zadanie "running" porzucone przez zatrzymany worker wraca do kolejki (s)
+BACKGROUND_JOBS = os.getenv("BACKGROUND_JOBS", "False") == "True"
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "2"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "2"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "5"))
+JOBS_RETRY_BASE_DELAY = float(os.getenv("JOBS_RETRY_BASE_DELAY", "5"))
+JOBS_RETRY_MAX_DELAY = float(os.getenv("JOBS_RETRY_MAX_DELAY", "300"))
+JOBS_LOCK_TIMEOUT = int(os.getenv("JOBS_LOCK_TIMEOUT", "600"))
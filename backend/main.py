@@ -8,9 +8,11 @@ from core import config
 @click.command()
 @click.option("--env", type=click.Choice(["local", "dev", "prod"], case_sensitive=False), default="local")
 @click.option("--debug", is_flag=True, default=False)
-def main(env: str, debug: bool):
+@click.option("--async-db", is_flag=True, default=False, help="Use the async (aiomysql) stack for hot read endpoints")
+def main(env: str, debug: bool, async_db: bool):
     os.environ["ENV"] = env
     os.environ["DEBUG"] = str(debug)
+    os.environ["DB_ASYNC"] = str(async_db)
     
     # Host i port pobierzemy z configu (zależnego od env)
     uvicorn.run(
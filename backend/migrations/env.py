@@ -26,6 +26,12 @@ from app.models.user import User # noqa
 from app.models.one_rep_max import Exercise, Set, WeekPlan # noqa
 from app.models.weight_history import WeightHistory # noqa
 from app.models.training_schedule import TrainingPlanSchedule, ExerciseSchedule # noqa
+from app.models.idempotency_key import IdempotencyKey # noqa
+from app.models.sync_tombstone import SyncTombstone # noqa
+from app.models.strength import AmrapEntry, ExerciseStrength # noqa
+from app.models.volume import VolumeBucket, VolumeRollup # noqa
+from app.models.ranking import StrengthScore, StrengthHistogram # noqa
+from app.models.job import Job # noqa
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
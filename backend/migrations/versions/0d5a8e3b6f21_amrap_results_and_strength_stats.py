@@ -0,0 +1,67 @@
+"""amrap results and strength stats
+
+Revision ID: 0d5a8e3b6f21
+Revises: 7b4e2f9c1d58
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0d5a8e3b6f21'
+down_revision: Union[str, None] = '7b4e2f9c1d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('amrap_results',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.Column('week_number', sa.Integer(), nullable=False),
+    sa.Column('weight', sa.Float(), nullable=False),
+    sa.Column('target_reps', sa.Integer(), nullable=False),
+    sa.Column('reps_performed', sa.Integer(), nullable=False),
+    sa.Column('e1rm_epley', sa.Float(), nullable=False),
+    sa.Column('e1rm_brzycki', sa.Float(), nullable=True),
+    sa.Column('estimated_1rm', sa.Float(), nullable=False),
+    sa.Column('is_pr', sa.Boolean(), nullable=False),
+    sa.Column('recorded_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_amrap_results_id'), 'amrap_results', ['id'], unique=False)
+    op.create_index('ix_amrap_results_exercise_id_id', 'amrap_results', ['exercise_id', 'id'], unique=False)
+
+    op.create_table('exercise_strength_stats',
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entries', sa.Integer(), nullable=False),
+    sa.Column('pr_count', sa.Integer(), nullable=False),
+    sa.Column('best_e1rm', sa.Float(), nullable=True),
+    sa.Column('best_e1rm_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('best_result_id', sa.Integer(), nullable=True),
+    sa.Column('best_weight', sa.Float(), nullable=True),
+    sa.Column('best_reps', sa.Integer(), nullable=True),
+    sa.Column('last_e1rm', sa.Float(), nullable=True),
+    sa.Column('last_recorded_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('trend_e1rm', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['exercise_id'], ['exercises.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('exercise_id')
+    )
+    op.create_index(op.f('ix_exercise_strength_stats_user_id'), 'exercise_strength_stats', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_exercise_strength_stats_user_id'), table_name='exercise_strength_stats')
+    op.drop_table('exercise_strength_stats')
+    op.drop_index('ix_amrap_results_exercise_id_id', table_name='amrap_results')
+    op.drop_index(op.f('ix_amrap_results_id'), table_name='amrap_results')
+    op.drop_table('amrap_results')
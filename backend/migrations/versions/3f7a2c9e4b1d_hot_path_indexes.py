@@ -0,0 +1,61 @@
+"""hot path indexes
+
+Revision ID: 3f7a2c9e4b1d
+Revises: 84b8a9df9168
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7a2c9e4b1d'
+down_revision: Union[str, None] = '84b8a9df9168'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Usuń zdublowane plany (exercise_id, week_number) przed założeniem unikalnego klucza -
+    # zostaje plan o najniższym id, serie duplikatów są usuwane razem z nimi
+    op.execute(
+        "DELETE s FROM sets s "
+        "JOIN week_plans wp ON s.week_plan_id = wp.id "
+        "JOIN week_plans keep ON keep.exercise_id = wp.exercise_id "
+        "AND keep.week_number = wp.week_number AND keep.id < wp.id"
+    )
+    op.execute(
+        "DELETE wp FROM week_plans wp "
+        "JOIN week_plans keep ON keep.exercise_id = wp.exercise_id "
+        "AND keep.week_number = wp.week_number AND keep.id < wp.id"
+    )
+
+    # Indeksy dopasowane do filtrów w routerach. Pierwsza kolumna każdego z nich to klucz obcy,
+    # więc InnoDB może porzucić swój automatyczny indeks dla FK.
+    op.create_unique_constraint('uq_week_plans_exercise_id_week_number', 'week_plans', ['exercise_id', 'week_number'])
+    op.create_index(op.f('ix_sets_week_plan_id'), 'sets', ['week_plan_id'], unique=False)
+    op.create_index('ix_exercises_user_id_name', 'exercises', ['user_id', 'name'], unique=False)
+    op.create_index('ix_training_plan_schedules_user_id_scheduled_date', 'training_plan_schedules', ['user_id', 'scheduled_date'], unique=False)
+    op.create_index('ix_weight_history_user_id_recorded_at', 'weight_history', ['user_id', 'recorded_at'], unique=False)
+    op.create_index(op.f('ix_exercise_schedules_training_plan_id'), 'exercise_schedules', ['training_plan_id'], unique=False)
+
+
+def downgrade() -> None:
+    # Przed usunięciem indeksu złożonego odtwarzamy indeks na samej kolumnie FK,
+    # inaczej MySQL odmówi (klucz obcy musi mieć indeks)
+    op.create_index('week_plans_exercise_id_fk', 'week_plans', ['exercise_id'], unique=False)
+    op.create_index('exercises_user_id_fk', 'exercises', ['user_id'], unique=False)
+    op.create_index('training_plan_schedules_user_id_fk', 'training_plan_schedules', ['user_id'], unique=False)
+    op.create_index('weight_history_user_id_fk', 'weight_history', ['user_id'], unique=False)
+    op.create_index('sets_week_plan_id_fk', 'sets', ['week_plan_id'], unique=False)
+    op.create_index('exercise_schedules_training_plan_id_fk', 'exercise_schedules', ['training_plan_id'], unique=False)
+
+    op.drop_index(op.f('ix_exercise_schedules_training_plan_id'), table_name='exercise_schedules')
+    op.drop_index('ix_weight_history_user_id_recorded_at', table_name='weight_history')
+    op.drop_index('ix_training_plan_schedules_user_id_scheduled_date', table_name='training_plan_schedules')
+    op.drop_index('ix_exercises_user_id_name', table_name='exercises')
+    op.drop_index(op.f('ix_sets_week_plan_id'), table_name='sets')
+    op.drop_constraint('uq_week_plans_exercise_id_week_number', 'week_plans', type_='unique')
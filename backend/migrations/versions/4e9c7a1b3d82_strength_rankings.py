@@ -0,0 +1,129 @@
+"""strength rankings
+
+Revision ID: 4e9c7a1b3d82
+Revises: b61f0c2e9a47
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+import bisect
+from collections import Counter
+from typing import Optional, Sequence, Tuple, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e9c7a1b3d82'
+down_revision: Union[str, None] = 'b61f0c2e9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Kopia reguł z app/rankings.py z chwili tej migracji - migracja nie może zależeć od kodu
+# aplikacji, który będzie się dalej zmieniał
+RANKED_LIFTS = ('squats', 'bench_press', 'dead_lift')
+ALL_CLASSES = 'all'
+BUCKET_WIDTH = 1.0
+_DOTS = {
+    'M': ((-307.75076, 24.0900756, -0.1918759221, 0.0007391293, -0.000001093), 40.0, 210.0),
+    'F': ((-57.96288, 13.6175032, -0.1126655495, 0.0005158568, -0.0000010706), 40.0, 150.0),
+}
+_WEIGHT_CLASSES = {
+    'M': (59, 66, 74, 83, 93, 105, 120),
+    'F': (47, 52, 57, 63, 69, 76, 84),
+}
+
+
+def _dots_coefficient(bodyweight: float, gender: str) -> float:
+    coefficients, low, high = _DOTS[gender]
+    bodyweight = min(max(bodyweight, low), high)
+    return 500 / sum(c * bodyweight ** power for power, c in enumerate(coefficients))
+
+
+def _weight_class(bodyweight: float, gender: str) -> str:
+    limits = _WEIGHT_CLASSES[gender]
+    index = bisect.bisect_left(limits, bodyweight)
+    if index == len(limits):
+        return f'{limits[-1]}+'
+    return str(limits[index])
+
+
+def _score_entry(training_max: float, bodyweight: float, gender: str) -> Optional[Tuple[str, float, int]]:
+    if gender not in _DOTS:
+        return None
+    score = training_max * _dots_coefficient(bodyweight, gender)
+    return _weight_class(bodyweight, gender), score, int(score // BUCKET_WIDTH)
+
+
+def upgrade() -> None:
+    scores = op.create_table('strength_scores',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('lift', sa.String(length=32), nullable=False),
+    sa.Column('gender', sa.String(length=1), nullable=False),
+    sa.Column('weight_class', sa.String(length=8), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'lift')
+    )
+    histogram = op.create_table('strength_histogram',
+    sa.Column('lift', sa.String(length=32), nullable=False),
+    sa.Column('gender', sa.String(length=1), nullable=False),
+    sa.Column('weight_class', sa.String(length=8), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('lift', 'gender', 'weight_class', 'bucket')
+    )
+    _backfill(scores, histogram)
+
+
+def _backfill(scores: sa.Table, histogram: sa.Table) -> None:
+    # Wyniki istniejących kont - te same reguły co refresh_strength_scores. Boje z domyślnym
+    # 1RM (100) i bez progresu pomijamy, tak jak nowe konta przed pierwszą zmianą.
+    # W trybie --sql nie ma danych do odczytu - konta trafią do rankingu przy pierwszej zmianie.
+    if context.is_offline_mode():
+        return
+
+    users = sa.table('users', sa.column('id'), sa.column('gender'), sa.column('weight'))
+    exercises = sa.table(
+        'exercises', sa.column('user_id'), sa.column('name'), sa.column('one_rep_max'), sa.column('progress_weight')
+    )
+    rows = op.get_bind().execute(
+        sa.select(
+            exercises.c.user_id,
+            exercises.c.name,
+            (exercises.c.one_rep_max + exercises.c.progress_weight).label('training_max'),
+            users.c.gender,
+            users.c.weight
+        )
+        .join(users, users.c.id == exercises.c.user_id)
+        .where(
+            exercises.c.name.in_(RANKED_LIFTS),
+            sa.or_(exercises.c.one_rep_max != 100.0, exercises.c.progress_weight != 0.0)
+        )
+    )
+
+    score_rows, counts = [], Counter()
+    for row in rows:
+        entry = _score_entry(row.training_max, row.weight, row.gender)
+        if entry is None:
+            continue
+        class_name, score, bucket = entry
+        score_rows.append({
+            'user_id': row.user_id, 'lift': row.name, 'gender': row.gender,
+            'weight_class': class_name, 'score': score, 'bucket': bucket
+        })
+        for name in (class_name, ALL_CLASSES):
+            counts[(row.name, row.gender, name, bucket)] += 1
+
+    if score_rows:
+        op.bulk_insert(scores, score_rows)
+        op.bulk_insert(histogram, [
+            {'lift': lift, 'gender': gender, 'weight_class': name, 'bucket': bucket, 'count': count}
+            for (lift, gender, name, bucket), count in counts.items()
+        ])
+
+
+def downgrade() -> None:
+    op.drop_table('strength_histogram')
+    op.drop_table('strength_scores')
@@ -0,0 +1,58 @@
+"""sync change tracking
+
+Revision ID: 7b4e2f9c1d58
+Revises: e2b7c4d91a36
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b4e2f9c1d58'
+down_revision: Union[str, None] = 'e2b7c4d91a36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = (
+    'exercises',
+    'week_plans',
+    'sets',
+    'weight_history',
+    'training_plan_schedules',
+    'exercise_schedules',
+)
+
+
+def upgrade() -> None:
+    # Istniejące wiersze dostają czas migracji - pierwsza synchronizacja i tak jest pełna
+    for table_name in TRACKED_TABLES:
+        op.add_column(table_name, sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.create_index('ix_weight_history_user_id_updated_at', 'weight_history', ['user_id', 'updated_at'], unique=False)
+    op.create_index('ix_training_plan_schedules_user_id_updated_at', 'training_plan_schedules', ['user_id', 'updated_at'], unique=False)
+
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=32), nullable=False),
+    sa.Column('row_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sync_tombstones_id'), 'sync_tombstones', ['id'], unique=False)
+    op.create_index('ix_sync_tombstones_user_id_deleted_at', 'sync_tombstones', ['user_id', 'deleted_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sync_tombstones_user_id_deleted_at', table_name='sync_tombstones')
+    op.drop_index(op.f('ix_sync_tombstones_id'), table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+
+    op.drop_index('ix_training_plan_schedules_user_id_updated_at', table_name='training_plan_schedules')
+    op.drop_index('ix_weight_history_user_id_updated_at', table_name='weight_history')
+    for table_name in TRACKED_TABLES:
+        op.drop_column(table_name, 'updated_at')
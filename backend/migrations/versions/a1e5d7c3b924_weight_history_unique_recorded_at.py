@@ -0,0 +1,43 @@
+"""weight history unique recorded_at
+
+Revision ID: a1e5d7c3b924
+Revises: f7a1c5e28b63
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1e5d7c3b924'
+down_revision: Union[str, None] = 'f7a1c5e28b63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Zdublowane pomiary (user_id, recorded_at) poza tym o najniższym id
+DUPLICATES = (
+    "FROM weight_history wh "
+    "JOIN weight_history keep ON keep.user_id = wh.user_id "
+    "AND keep.recorded_at = wh.recorded_at AND keep.id < wh.id"
+)
+
+
+def upgrade() -> None:
+    # Usunięte duplikaty trafiają do sync_tombstones, żeby klienci synchronizacji też je usunęli
+    op.execute(
+        "INSERT INTO sync_tombstones (user_id, table_name, row_id) "
+        f"SELECT DISTINCT wh.user_id, 'weight_history', wh.id {DUPLICATES}"
+    )
+    op.execute(f"DELETE wh {DUPLICATES}")
+
+    # Unikalny klucz zaczyna się od user_id, więc zastępuje dotychczasowy indeks (także dla FK)
+    op.create_unique_constraint('uq_weight_history_user_id_recorded_at', 'weight_history', ['user_id', 'recorded_at'])
+    op.drop_index('ix_weight_history_user_id_recorded_at', table_name='weight_history')
+
+
+def downgrade() -> None:
+    op.create_index('ix_weight_history_user_id_recorded_at', 'weight_history', ['user_id', 'recorded_at'], unique=False)
+    op.drop_constraint('uq_weight_history_user_id_recorded_at', 'weight_history', type_='unique')
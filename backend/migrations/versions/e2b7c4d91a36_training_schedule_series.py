@@ -0,0 +1,28 @@
+"""training schedule series
+
+Revision ID: e2b7c4d91a36
+Revises: 5c81d0f7a2e4
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c4d91a36'
+down_revision: Union[str, None] = '5c81d0f7a2e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('training_plan_schedules', sa.Column('series_id', sa.String(length=32), nullable=True))
+    op.create_index('ix_training_plan_schedules_series_id_scheduled_date', 'training_plan_schedules', ['series_id', 'scheduled_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_training_plan_schedules_series_id_scheduled_date', table_name='training_plan_schedules')
+    op.drop_column('training_plan_schedules', 'series_id')
@@ -0,0 +1,58 @@
+"""cascade foreign keys
+
+Revision ID: f7a1c5e28b63
+Revises: c3f8d2a61e95
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a1c5e28b63'
+down_revision: Union[str, None] = 'c3f8d2a61e95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (tabela, kolumna, tabela nadrzędna) - klucze obce utworzone wcześniej bez ON DELETE
+CASCADE_FOREIGN_KEYS = (
+    ('exercises', 'user_id', 'users'),
+    ('week_plans', 'exercise_id', 'exercises'),
+    ('sets', 'week_plan_id', 'week_plans'),
+    ('weight_history', 'user_id', 'users'),
+    ('training_plan_schedules', 'user_id', 'users'),
+    ('exercise_schedules', 'training_plan_id', 'training_plan_schedules'),
+    ('exercise_schedules', 'exercise_id', 'exercises'),
+)
+
+
+# Nazwy nadane przez MySQL bazie zbudowanej tymi migracjami - dla trybu --sql, bez dostępu do schematu
+OFFLINE_FOREIGN_KEY_NAMES = {
+    ('exercise_schedules', 'exercise_id'): 'exercise_schedules_ibfk_1',
+    ('exercise_schedules', 'training_plan_id'): 'exercise_schedules_ibfk_2',
+}
+
+
+def _drop_foreign_key(table: str, column: str) -> None:
+    # Stare klucze nie mają nazw w migracjach (MySQL nadał np. exercises_ibfk_1) - szukamy ich w schemacie
+    if context.is_offline_mode():
+        op.drop_constraint(OFFLINE_FOREIGN_KEY_NAMES.get((table, column), f'{table}_ibfk_1'), table, type_='foreignkey')
+        return
+    for fk in sa.inspect(op.get_bind()).get_foreign_keys(table):
+        if fk['constrained_columns'] == [column]:
+            op.drop_constraint(fk['name'], table, type_='foreignkey')
+
+
+def upgrade() -> None:
+    for table, column, referred in CASCADE_FOREIGN_KEYS:
+        _drop_foreign_key(table, column)
+        op.create_foreign_key(f'fk_{table}_{column}', table, referred, [column], ['id'], ondelete='CASCADE')
+
+
+def downgrade() -> None:
+    for table, column, referred in CASCADE_FOREIGN_KEYS:
+        op.drop_constraint(f'fk_{table}_{column}', table, type_='foreignkey')
+        op.create_foreign_key(f'fk_{table}_{column}', table, referred, [column], ['id'])
@@ -0,0 +1,87 @@
+# backend/tests/test_account_purge.py
+from sqlalchemy import func, select
+
+from app.db import SessionLocal
+from app.models.one_rep_max import Exercise, Set, WeekPlan
+from app.models.ranking import StrengthHistogram, StrengthScore
+from app.models.sync_tombstone import SyncTombstone
+from app.models.training_schedule import ExerciseSchedule, TrainingPlanSchedule
+from app.models.weight_history import WeightHistory
+
+
+def counts(user_id: int) -> dict:
+    # Wiersze użytkownika w tabelach, które usuwa kaskada ON DELETE CASCADE
+    with SessionLocal() as db:
+        exercise_ids = select(Exercise.id).where(Exercise.user_id == user_id)
+        plan_ids = select(TrainingPlanSchedule.id).where(TrainingPlanSchedule.user_id == user_id)
+        return {
+            "exercises": db.scalar(select(func.count()).where(Exercise.user_id == user_id)),
+            "week_plans": db.scalar(select(func.count()).where(WeekPlan.exercise_id.in_(exercise_ids))),
+            "sets": db.scalar(
+                select(func.count()).select_from(Set).join(WeekPlan).where(WeekPlan.exercise_id.in_(exercise_ids))
+            ),
+            "weight_history": db.scalar(select(func.count()).where(WeightHistory.user_id == user_id)),
+            "schedules": db.scalar(select(func.count()).where(TrainingPlanSchedule.user_id == user_id)),
+            "schedule_exercises": db.scalar(
+                select(func.count()).where(ExerciseSchedule.training_plan_id.in_(plan_ids))
+            ),
+        }
+
+
+def exercises(client, user_id: int) -> dict:
+    return {exercise["name"]: exercise["id"] for exercise in client.get(f"/users/{user_id}/exercises").json()}
+
+
+def test_deleting_user_removes_all_owned_rows(client, make_user, make_schedule):
+    user, other = make_user(), make_user()
+    for owner in (user, other):
+        make_schedule(owner["id"], exercise_ids=exercises(client, owner["id"]).values(), sets=3, weight=60)
+    assert client.post(f"/users/{user['id']}/weight_history", params={"weight": 79.5}).status_code == 200
+    assert all(counts(user["id"]).values())
+    other_before = counts(other["id"])
+
+    response = client.delete(f"/users/{user['id']}")
+    assert response.status_code == 200
+    assert set(counts(user["id"]).values()) == {0}
+    assert counts(other["id"]) == other_before
+    assert client.get(f"/users/{user['id']}").status_code == 404
+    assert client.delete(f"/users/{user['id']}").status_code == 404
+
+
+def test_deleting_exercise_removes_scheduled_entries_and_leaves_tombstones(client, make_user, make_schedule):
+    user = make_user()
+    response = client.post(f"/users/{user['id']}/exercises", json=[{"name": "ohp", "one_rep_max": 50}])
+    assert response.status_code == 200
+    ohp = response.json()[0]["id"]
+    ids = exercises(client, user["id"])
+    plan = make_schedule(user["id"], exercise_ids=[ids["squats"], ohp], sets=3, weight=60)
+    scheduled_ohp = next(row["id"] for row in plan["exercises"] if row["exercise_id"] == ohp)
+
+    assert client.delete(f"/users/{user['id']}/exercises/{ohp}").status_code == 200
+
+    remaining = client.get(f"/users/{user['id']}/training-schedule/{plan['id']}").json()["exercises"]
+    assert [row["exercise_id"] for row in remaining] == [ids["squats"]]
+    assert "ohp" not in exercises(client, user["id"])
+    with SessionLocal() as db:
+        tombstones = set(db.execute(
+            select(SyncTombstone.table_name, SyncTombstone.row_id).where(SyncTombstone.user_id == user["id"])
+        ).tuples())
+    assert {("exercises", ohp), ("exercise_schedules", scheduled_ohp)} <= tombstones
+
+
+def test_main_lifts_cannot_be_deleted(client, make_user):
+    user = make_user()
+    squats = exercises(client, user["id"])["squats"]
+    assert client.delete(f"/users/{user['id']}/exercises/{squats}").status_code == 403
+
+
+def test_deleting_ranked_user_updates_histogram(client, make_user):
+    user, other = make_user(), make_user()
+    for owner, one_rep_max in ((user, 150), (other, 160)):
+        squats = exercises(client, owner["id"])["squats"]
+        client.patch(f"/users/{owner['id']}/exercises/{squats}", json={"name": "squats", "one_rep_max": one_rep_max})
+
+    assert client.delete(f"/users/{user['id']}").status_code == 200
+    with SessionLocal() as db:
+        assert db.scalar(select(func.sum(StrengthHistogram.count)).where(StrengthHistogram.lift == "squats")) == 2
+        assert db.scalar(select(func.count()).where(StrengthScore.user_id == user["id"])) == 0
@@ -0,0 +1,39 @@
+# backend/tests/test_dependencies.py
+from sqlalchemy import delete
+
+from app.db import SessionLocal
+from app.dependencies import KnownUserCache, known_users
+from app.models.user import User
+
+
+def test_cache_expires_and_evicts():
+    cache = KnownUserCache(maxsize=2, ttl=60)
+    cache.add(1)
+    cache.add(2)
+    cache.add(3)
+    assert 1 not in cache and 2 in cache and 3 in cache
+    cache.discard(2)
+    assert 2 not in cache
+
+    expired = KnownUserCache(maxsize=2, ttl=-1)
+    expired.add(1)
+    assert 1 not in expired
+
+
+def test_unknown_user_is_not_found(client):
+    assert client.get("/users/999999/weight_history").status_code == 404
+
+
+def test_write_for_user_deleted_by_another_worker_is_not_found(client, make_user):
+    user = make_user()
+    assert client.get(f"/users/{user['id']}/weight_history").status_code == 200
+    assert user["id"] in known_users
+
+    # Inny worker usunął konto - cache tego workera nic o tym nie wie
+    with SessionLocal() as db:
+        db.execute(delete(User).where(User.id == user["id"]))
+        db.commit()
+
+    response = client.post(f"/users/{user['id']}/weight_history", params={"weight": 80})
+    assert response.status_code == 404
+    assert user["id"] not in known_users
@@ -0,0 +1,127 @@
+# backend/tests/test_exercise_batch.py
+import pytest
+
+from core import config
+
+
+@pytest.fixture
+def exercises(client, user):
+    return {exercise["name"]: exercise["id"] for exercise in client.get(f"/users/{user['id']}/exercises").json()}
+
+
+@pytest.fixture
+def plan(client, user, exercises):
+    response = client.post(f"/users/{user['id']}/training-schedule/", json={
+        "name": "A",
+        "scheduled_date": "2025-03-03",
+        "exercises": [
+            {"exercise_id": exercises["squats"], "sets": 5, "reps": 5, "weight": 100},
+            {"exercise_id": exercises["bench_press"], "sets": 5, "reps": 5, "weight": 80},
+        ],
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def batch(client, user, plan, operations):
+    return client.post(f"/users/{user['id']}/training-schedule/{plan['id']}/exercises/batch", json=operations)
+
+
+def stored(client, user, plan) -> dict:
+    body = client.get(f"/users/{user['id']}/training-schedule/{plan['id']}").json()
+    return {exercise["id"]: exercise for exercise in body["exercises"]}
+
+
+def test_mixed_operations_apply_in_one_request(client, user, plan, exercises):
+    squats_row, bench_row = (exercise["id"] for exercise in plan["exercises"])
+    response = batch(client, user, plan, [
+        {"op": "update", "id": squats_row, "sets": 3, "notes": "ciężko"},
+        {"op": "delete", "id": bench_row},
+        {"op": "create", "exercise_id": exercises["dead_lift"], "sets": 1, "reps": 5, "weight": 140},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [(r["index"], r["op"], r["status"]) for r in results] == [(0, "update", 200), (1, "delete", 200), (2, "create", 201)]
+    new_id = results[2]["id"]
+    assert new_id is not None
+
+    rows = stored(client, user, plan)
+    assert set(rows) == {squats_row, new_id}
+    assert (rows[squats_row]["sets"], rows[squats_row]["reps"], rows[squats_row]["notes"]) == (3, 5, "ciężko")
+    assert rows[new_id]["weight"] == 140
+
+
+def test_invalid_items_do_not_block_the_rest(client, make_user, user, plan, exercises):
+    other = make_user()
+    foreign_exercise = client.get(f"/users/{other['id']}/exercises").json()[0]["id"]
+    squats_row = plan["exercises"][0]["id"]
+    response = batch(client, user, plan, [
+        {"op": "update", "id": 999999, "sets": 1},
+        {"op": "create", "exercise_id": foreign_exercise, "sets": 1, "reps": 1, "weight": 1},
+        {"op": "update", "id": squats_row, "reps": 3},
+    ])
+    assert [r["status"] for r in response.json()] == [404, 404, 200]
+    assert stored(client, user, plan)[squats_row]["reps"] == 3
+    assert len(stored(client, user, plan)) == 2
+
+
+def test_explicit_null_in_required_field_rejects_only_that_item(client, user, plan):
+    squats_row, bench_row = (exercise["id"] for exercise in plan["exercises"])
+    response = batch(client, user, plan, [
+        {"op": "update", "id": squats_row, "sets": None},
+        {"op": "update", "id": bench_row, "reps": 3, "weight": None},
+        {"op": "update", "id": bench_row, "sets": 4, "notes": None},
+    ])
+    assert response.status_code == 200
+    results = response.json()
+    assert [r["status"] for r in results] == [422, 422, 200]
+    assert "weight" in results[1]["detail"]
+
+    rows = stored(client, user, plan)
+    assert rows[squats_row]["sets"] == 5
+    assert (rows[bench_row]["sets"], rows[bench_row]["reps"], rows[bench_row]["weight"]) == (4, 5, 80)
+
+
+def test_too_many_operations_are_rejected(client, user, plan):
+    row = plan["exercises"][0]["id"]
+    operations = [{"op": "update", "id": row, "sets": 3}] * (config.TRAINING_BATCH_MAX_OPERATIONS + 1)
+    assert batch(client, user, plan, operations).status_code == 422
+    assert stored(client, user, plan)[row]["sets"] == 5
+
+
+def test_rows_of_another_plan_are_not_touched(client, user, plan, exercises):
+    other_plan = client.post(f"/users/{user['id']}/training-schedule/", json={
+        "name": "B", "scheduled_date": "2025-03-05",
+        "exercises": [{"exercise_id": exercises["squats"], "sets": 5, "reps": 5, "weight": 100}],
+    }).json()
+    other_row = other_plan["exercises"][0]["id"]
+    response = batch(client, user, plan, [{"op": "delete", "id": other_row}])
+    assert response.json()[0]["status"] == 404
+    assert other_row in stored(client, user, other_plan)
+
+
+def test_operation_after_delete_of_same_row_is_not_found(client, user, plan):
+    row = plan["exercises"][0]["id"]
+    response = batch(client, user, plan, [
+        {"op": "delete", "id": row},
+        {"op": "update", "id": row, "sets": 2},
+        {"op": "delete", "id": row},
+    ])
+    assert [r["status"] for r in response.json()] == [200, 404, 404]
+    assert row not in stored(client, user, plan)
+
+
+def test_deletions_leave_sync_tombstones(client, user, plan):
+    row = plan["exercises"][0]["id"]
+    batch(client, user, plan, [{"op": "delete", "id": row}])
+    from app.db import SessionLocal
+    from app.models.sync_tombstone import SyncTombstone
+    with SessionLocal() as session:
+        tombstones = session.query(SyncTombstone.table_name, SyncTombstone.row_id).filter(SyncTombstone.user_id == user["id"]).all()
+    assert ("exercise_schedules", row) in tombstones
+
+
+def test_unknown_plan_and_bad_operation(client, user, plan):
+    assert client.post(f"/users/{user['id']}/training-schedule/999999/exercises/batch", json=[]).status_code == 404
+    assert batch(client, user, plan, [{"op": "rename", "id": 1}]).status_code == 422
+    assert batch(client, user, plan, [{"op": "delete"}]).status_code == 422
@@ -0,0 +1,143 @@
+# backend/tests/test_jobs.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import jobs
+from app.db import SessionLocal
+from app.jobs import _claim_next, _execute, _requeue_stale, enqueue_job, retry_delay
+from app.models.job import Job
+from app.models.sync_tombstone import SyncTombstone
+from core import config
+
+WORKER = "test-worker"
+
+
+@pytest.fixture
+def handlers(monkeypatch):
+    registered = {}
+    monkeypatch.setattr(jobs, "_handlers", registered)
+    return registered
+
+
+def enqueue(kind: str, payload: dict = None, **overrides) -> int:
+    with SessionLocal() as db:
+        job = enqueue_job(db, kind, payload or {})
+        for key, value in overrides.items():
+            setattr(job, key, value)
+        db.commit()
+        return job.id
+
+
+def load(job_id: int) -> Job:
+    with SessionLocal() as db:
+        return db.get(Job, job_id)
+
+
+def run_next() -> int:
+    job_id = _claim_next(WORKER)
+    assert job_id is not None
+    _execute(job_id, WORKER)
+    return job_id
+
+
+def test_successful_job_stores_result(client, handlers):
+    handlers["echo"] = lambda db, payload: {"echo": payload["value"]}
+    job_id = enqueue("echo", {"value": 7})
+    assert run_next() == job_id
+
+    job = load(job_id)
+    assert (job.status, job.attempts, job.last_error) == ("succeeded", 1, None)
+    assert client.get(f"/jobs/{job_id}").json()["result"] == {"echo": 7}
+
+
+def test_claim_skips_jobs_scheduled_later(handlers):
+    enqueue("echo", run_after=datetime.utcnow() + timedelta(minutes=5))
+    assert _claim_next(WORKER) is None
+
+
+def test_failed_attempt_is_retried_with_backoff(handlers):
+    def broken(db, payload):
+        raise RuntimeError("boom")
+    handlers["broken"] = broken
+    job_id = enqueue("broken")
+    before = datetime.utcnow()
+    run_next()
+
+    job = load(job_id)
+    assert (job.status, job.attempts, job.locked_by) == ("queued", 1, None)
+    assert job.last_error == "RuntimeError: boom"
+    assert job.run_after >= before + timedelta(seconds=retry_delay(1)) - timedelta(seconds=1)
+
+
+def test_last_attempt_marks_job_failed(handlers):
+    handlers["broken"] = lambda db, payload: 1 / 0
+    job_id = enqueue("broken", max_attempts=1)
+    run_next()
+    job = load(job_id)
+    assert job.status == "failed"
+    assert job.finished_at is not None
+    assert job.last_error.startswith("ZeroDivisionError")
+
+
+def test_unknown_kind_fails_like_handler_error(handlers):
+    job_id = enqueue("missing", max_attempts=1)
+    run_next()
+    assert load(job_id).last_error == "LookupError: No handler for job kind missing"
+
+
+def test_stale_jobs_are_requeued_or_failed(handlers):
+    stale_at = datetime.utcnow() - timedelta(seconds=config.JOBS_LOCK_TIMEOUT + 60)
+    retry = enqueue("echo", status="running", attempts=1, max_attempts=3, locked_by="gone", locked_at=stale_at)
+    exhausted = enqueue("echo", status="running", attempts=3, max_attempts=3, locked_by="gone", locked_at=stale_at)
+    fresh = enqueue("echo", status="running", attempts=1, locked_by="alive", locked_at=datetime.utcnow())
+
+    assert _requeue_stale() == 1
+    assert (load(retry).status, load(retry).locked_by) == ("queued", None)
+    assert load(exhausted).status == "failed"
+    assert load(exhausted).finished_at is not None
+    assert load(fresh).status == "running"
+
+
+def test_worker_that_lost_the_job_discards_its_result(make_user, handlers):
+    user = make_user()
+
+    def slow(db, payload):
+        # W trakcie wykonania zadanie wraca do kolejki i przejmuje je inny worker
+        with SessionLocal() as other:
+            other.query(Job).filter(Job.id == payload["job_id"]).update({"locked_by": "other-worker"})
+            other.commit()
+        db.add(SyncTombstone(user_id=user["id"], table_name="exercises", row_id=1))
+        return {"done": True}
+
+    handlers["slow"] = slow
+    job_id = enqueue("slow")
+    with SessionLocal() as db:
+        job = db.get(Job, job_id)
+        job.payload = f'{{"job_id": {job_id}}}'
+        db.commit()
+    run_next()
+
+    job = load(job_id)
+    assert (job.status, job.locked_by, job.result) == ("running", "other-worker", None)
+    with SessionLocal() as db:
+        assert db.query(SyncTombstone).count() == 0
+
+
+def test_unknown_job_is_not_found(client):
+    assert client.get("/jobs/999999").status_code == 404
+
+
+def test_background_account_deletion(client, make_user, monkeypatch):
+    user = make_user()
+    monkeypatch.setattr(config, "BACKGROUND_JOBS", True)
+    response = client.delete(f"/users/{user['id']}")
+    assert response.status_code == 202
+    status_url = response.headers["Location"]
+    assert response.json()["status_url"] == status_url
+    assert client.get(status_url).json()["status"] == "queued"
+    assert client.get(f"/users/{user['id']}").status_code == 200
+
+    run_next()
+    assert client.get(status_url).json()["status"] == "succeeded"
+    assert client.get(f"/users/{user['id']}").status_code == 404
@@ -0,0 +1,163 @@
+# backend/tests/test_query_plans.py
+"""
+Regresja planów zapytań na gorących ścieżkach: EXPLAIN na schemacie z migracji (head) dla
+zapytań budowanych przez routery, skompilowanych dialektem MySQL z wartościami w treści SQL.
+Żaden wiersz planu nie może być pełnym skanem tabeli (type = ALL). Tylko MySQL - SQLite
+ma inny optymalizator.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, select, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.models.one_rep_max import Exercise, Set, WeekPlan
+from app.models.sync_tombstone import SyncTombstone
+from app.models.training_schedule import ExerciseSchedule, TrainingPlanSchedule
+from app.models.user import User
+from app.models.weight_history import WeightHistory
+from app.routers.one_rep_max import _week_plan_select
+from app.routers.training_schedule import _calendar_select, _training_plans_select
+from app.sync import change_queries, tombstones_query
+
+pytestmark = pytest.mark.mysql
+
+USERS = 200
+WEEKS = 6
+SETS_PER_WEEK = 4
+WEIGHINGS = 30
+TRAININGS = 20
+EXERCISES_PER_TRAINING = 3
+SEEDED_TABLES = (
+    "users", "exercises", "week_plans", "sets", "weight_history",
+    "training_plan_schedules", "exercise_schedules", "sync_tombstones",
+)
+
+
+@pytest.fixture(scope="module")
+def seeded(engine):
+    # Tyle wierszy, żeby pełny skan był dla optymalizatora wyraźnie droższy od indeksu
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+        conn.execute(User.__table__.insert(), [
+            {"nickname": f"plan{i}", "password_hash": "x", "age": 30, "height": 180, "weight": 80, "gender": "M", "plan_version": "A"}
+            for i in range(USERS)
+        ])
+        user_ids = conn.scalars(select(User.id).order_by(User.id)).all()
+
+        conn.execute(Exercise.__table__.insert(), [
+            {"name": name, "one_rep_max": 100.0, "progress_weight": 0.0, "user_id": user_id}
+            for user_id in user_ids for name in ("squats", "dead_lift", "bench_press")
+        ])
+        exercises = conn.execute(select(Exercise.id, Exercise.user_id)).all()
+        conn.execute(WeekPlan.__table__.insert(), [
+            {"week_number": week, "exercise_id": exercise_id}
+            for exercise_id, _ in exercises for week in range(1, WEEKS + 1)
+        ])
+        week_plan_ids = conn.scalars(select(WeekPlan.id)).all()
+        conn.execute(Set.__table__.insert(), [
+            {"week_plan_id": week_plan_id, "reps": 5, "percentage": 0.75, "is_amrap": number == SETS_PER_WEEK - 1, "weight": 75.0}
+            for week_plan_id in week_plan_ids for number in range(SETS_PER_WEEK)
+        ])
+
+        start = datetime(2025, 1, 1)
+        conn.execute(WeightHistory.__table__.insert(), [
+            {"user_id": user_id, "weight": 80.0, "recorded_at": start + timedelta(days=day)}
+            for user_id in user_ids for day in range(WEIGHINGS)
+        ])
+        conn.execute(TrainingPlanSchedule.__table__.insert(), [
+            {"user_id": user_id, "name": "trening", "scheduled_date": date(2025, 1, 1) + timedelta(days=2 * day)}
+            for user_id in user_ids for day in range(TRAININGS)
+        ])
+        user_exercises = {}
+        for exercise_id, user_id in exercises:
+            user_exercises.setdefault(user_id, []).append(exercise_id)
+        plans = conn.execute(select(TrainingPlanSchedule.id, TrainingPlanSchedule.user_id)).all()
+        conn.execute(ExerciseSchedule.__table__.insert(), [
+            {"training_plan_id": plan_id, "exercise_id": exercise_id, "sets": 5, "reps": 5, "weight": 100.0}
+            for plan_id, user_id in plans for exercise_id in user_exercises[user_id][:EXERCISES_PER_TRAINING]
+        ])
+        conn.execute(SyncTombstone.__table__.insert(), [
+            {"user_id": user_id, "table_name": "exercise_schedules", "row_id": row_id, "deleted_at": start + timedelta(days=row_id)}
+            for user_id in user_ids for row_id in range(10)
+        ])
+
+        for table in SEEDED_TABLES:
+            conn.execute(text(f"ANALYZE TABLE {table}"))
+
+    yield user_ids[USERS // 2]
+
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+def compile_mysql(statement) -> str:
+    return str(statement.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def explain(engine, sql: str, parameters=None) -> list:
+    with engine.connect() as conn:
+        result = conn.exec_driver_sql("EXPLAIN " + sql, parameters) if parameters else conn.exec_driver_sql("EXPLAIN " + sql)
+        return [dict(row) for row in result.mappings()]
+
+
+def assert_no_full_scan(engine, sql: str, parameters=None) -> None:
+    full_scans = [row["table"] for row in explain(engine, sql, parameters) if row["type"] == "ALL"]
+    assert full_scans == [], f"pełny skan {full_scans} w:\n{sql}"
+
+
+def loader_queries(engine, statement) -> list:
+    """Zapytania doładowujące relacje (selectinload), wysłane po wykonaniu `statement` przez ORM."""
+    captured = []
+
+    def capture(conn, cursor, sql, parameters, context, executemany):
+        captured.append((sql, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        with Session(engine) as session:
+            session.scalars(statement).all()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return captured[1:]
+
+
+@pytest.mark.parametrize("week_number", [1, WEEKS])
+def test_week_plan_with_sets(engine, seeded, week_number):
+    assert_no_full_scan(engine, compile_mysql(_week_plan_select(seeded, week_number)))
+
+
+def test_training_plans_page(engine, seeded):
+    statement = (
+        _training_plans_select(seeded)
+        .where(TrainingPlanSchedule.scheduled_date >= date(2025, 1, 5))
+        .order_by(TrainingPlanSchedule.scheduled_date, TrainingPlanSchedule.id)
+        .limit(11)
+    )
+    assert_no_full_scan(engine, compile_mysql(statement))
+
+    exercise_loads = loader_queries(engine, statement)
+    assert exercise_loads, "selectinload ćwiczeń nie wysłał zapytania"
+    for sql, parameters in exercise_loads:
+        assert_no_full_scan(engine, sql, parameters)
+
+
+def test_training_calendar(engine, seeded):
+    assert_no_full_scan(engine, compile_mysql(_calendar_select(seeded, "2025-01")))
+
+
+@pytest.mark.parametrize("since", [None, datetime(2025, 1, 10)], ids=["full", "incremental"])
+@pytest.mark.parametrize("table", [
+    "exercises", "week_plans", "sets", "weight_history", "training_plan_schedules", "exercise_schedules",
+])
+def test_sync_changes(engine, seeded, table, since):
+    assert_no_full_scan(engine, compile_mysql(change_queries(seeded, since)[table]))
+
+
+def test_sync_tombstones(engine, seeded):
+    assert_no_full_scan(engine, compile_mysql(tombstones_query(seeded, datetime(2025, 1, 5))))
@@ -0,0 +1,157 @@
+# backend/tests/test_rankings.py
+import threading
+
+import pytest
+from sqlalchemy import select
+
+from app.db import SessionLocal
+from app.models.ranking import StrengthHistogram, StrengthScore
+from app.rankings import (
+    ALL_CLASSES, dots_coefficient, percentile, refresh_strength_scores, score_bucket, score_entry, weight_class
+)
+
+
+def test_dots_coefficient_is_clamped_to_defined_range():
+    assert dots_coefficient(80, "M") == pytest.approx(0.6895, rel=1e-3)
+    assert dots_coefficient(30, "M") == dots_coefficient(40, "M")
+    assert dots_coefficient(300, "F") == dots_coefficient(150, "F")
+
+
+def test_weight_class_boundaries():
+    assert weight_class(83, "M") == "83"
+    assert weight_class(83.1, "M") == "93"
+    assert weight_class(121, "M") == "120+"
+    assert weight_class(47, "F") == "47"
+
+
+def test_score_bucket_and_entry():
+    assert score_bucket(103.9) == 103
+    class_name, score, bucket = score_entry(150, 80, "M")
+    assert class_name == "83"
+    assert score == pytest.approx(150 * dots_coefficient(80, "M"))
+    assert bucket == score_bucket(score)
+    assert score_entry(150, 80, "X") is None
+
+
+def test_percentile_counts_half_of_own_bucket():
+    assert percentile([], 10) == (None, 0)
+    assert percentile([(5, 2), (10, 2), (20, 4)], 10) == (37.5, 8)
+    assert percentile([(10, 1)], 10) == (50.0, 1)
+
+
+def histogram(db, lift: str = "squats") -> dict:
+    rows = db.execute(
+        select(StrengthHistogram.weight_class, StrengthHistogram.bucket, StrengthHistogram.count)
+        .where(StrengthHistogram.lift == lift, StrengthHistogram.count != 0)
+    ).all()
+    return {(row.weight_class, row.bucket): row.count for row in rows}
+
+
+def squats_id(client, user_id: int) -> int:
+    exercises = client.get(f"/users/{user_id}/exercises").json()
+    return next(exercise["id"] for exercise in exercises if exercise["name"] == "squats")
+
+
+def set_squats(client, user_id: int, one_rep_max: float):
+    response = client.patch(
+        f"/users/{user_id}/exercises/{squats_id(client, user_id)}",
+        json={"name": "squats", "one_rep_max": one_rep_max}
+    )
+    assert response.status_code == 200, response.text
+
+
+def test_new_account_is_not_ranked(make_user, db):
+    make_user()
+    assert db.query(StrengthScore).count() == 0
+    assert histogram(db) == {}
+
+
+def test_changes_move_user_between_buckets(client, make_user):
+    user = make_user()
+    set_squats(client, user["id"], 150)
+    _, _, first = score_entry(150, 80, "M")
+    with SessionLocal() as db:
+        assert histogram(db) == {("83", first): 1, (ALL_CLASSES, first): 1}
+
+    set_squats(client, user["id"], 200)
+    _, _, second = score_entry(200, 80, "M")
+    with SessionLocal() as db:
+        assert histogram(db) == {("83", second): 1, (ALL_CLASSES, second): 1}
+
+    # Zmiana masy ciała przenosi wynik do innej kategorii wagowej; boje z domyślnym 1RM zostają poza rankingiem
+    assert client.patch(f"/users/{user['id']}", json={"weight": 90}).status_code == 200
+    class_name, _, third = score_entry(200, 90, "M")
+    with SessionLocal() as db:
+        assert histogram(db) == {(class_name, third): 1, (ALL_CLASSES, third): 1}
+        assert db.scalars(select(StrengthScore.lift).where(StrengthScore.user_id == user["id"])).all() == ["squats"]
+
+
+def test_bodyweight_change_does_not_rank_default_lifts(client, make_user, db):
+    user = make_user()
+    assert client.patch(f"/users/{user['id']}", json={"weight": 95, "gender": "F"}).status_code == 200
+    assert db.query(StrengthScore).count() == 0
+    assert histogram(db, "bench_press") == {}
+
+    # Bój, który jest już w rankingu, zostaje w nim także po powrocie do domyślnego 1RM
+    set_squats(client, user["id"], 150)
+    set_squats(client, user["id"], 100)
+    assert client.patch(f"/users/{user['id']}", json={"weight": 60}).status_code == 200
+    class_name, _, bucket = score_entry(100, 60, "F")
+    db.rollback()  # nowa transakcja - bez migawki sprzed zmian
+    assert histogram(db) == {(class_name, bucket): 1, (ALL_CLASSES, bucket): 1}
+
+
+def test_ranking_endpoint_uses_histogram(client, make_user):
+    weaker, stronger = make_user(), make_user()
+    set_squats(client, weaker["id"], 120)
+    set_squats(client, stronger["id"], 220)
+    body = client.get(f"/users/{stronger['id']}/stats/ranking").json()
+    squats = next(lift for lift in body["lifts"] if lift["lift"] == "squats")
+    assert squats["class_count"] == 2
+    assert squats["class_percentile"] == 75.0
+
+
+# Blokady FOR UPDATE - tylko MySQL (SQLite ich nie ma)
+@pytest.mark.mysql
+def test_concurrent_refreshes_keep_histogram_consistent(client, make_user):
+    user = make_user()
+    set_squats(client, user["id"], 150)
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def refresh():
+        try:
+            with SessionLocal() as db:
+                barrier.wait()
+                refresh_strength_scores(db, user["id"])
+                db.commit()
+        except Exception as exc:
+            errors.append(exc)
+
+    # Zapisany wynik i histogram o przedział obok - każde odświeżenie chce go przesunąć.
+    # Bez blokady każdy wątek odejmował ten sam poprzedni przedział i liczniki schodziły poniżej zera.
+    with SessionLocal() as db:
+        db.execute(
+            StrengthScore.__table__.update()
+            .where(StrengthScore.user_id == user["id"], StrengthScore.lift == "squats")
+            .values(bucket=StrengthScore.bucket + 1)
+        )
+        db.execute(
+            StrengthHistogram.__table__.update()
+            .where(StrengthHistogram.lift == "squats")
+            .values(bucket=StrengthHistogram.bucket + 1)
+        )
+        db.commit()
+
+    threads = [threading.Thread(target=refresh) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    _, _, bucket = score_entry(150, 80, "M")
+    with SessionLocal() as db:
+        counts = histogram(db)
+        assert counts == {("83", bucket): 1, (ALL_CLASSES, bucket): 1}
+        assert all(count >= 0 for count in counts.values())
@@ -0,0 +1,44 @@
+# backend/tests/test_security.py
+import time
+
+import pytest
+
+from app.security import PasswordHasher, PasswordHasherBusy
+
+
+@pytest.fixture
+def slow_hasher():
+    # Jeden proces, bez kolejki i z czasem oczekiwania krótszym niż jedno haszowanie
+    hasher = PasswordHasher(workers=1, queue_limit=0, timeout=0.01, rounds=13)
+    hasher.start()
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify():
+    hasher = PasswordHasher(workers=1, queue_limit=1, timeout=30, rounds=4)
+    try:
+        password_hash = hasher.hash("secret123")
+        assert hasher.verify_and_update("secret123", password_hash) == (True, None)
+        assert hasher.verify_and_update("wrong", password_hash)[0] is False
+        assert hasher.stats()["calls"] == 3
+    finally:
+        hasher.shutdown()
+
+
+def test_timed_out_task_keeps_its_slot(slow_hasher):
+    with pytest.raises(PasswordHasherBusy):
+        slow_hasher.hash("secret123")
+    # bcrypt z pierwszego wywołania wciąż się liczy - kolejne żądanie jest odrzucane od razu
+    with pytest.raises(PasswordHasherBusy):
+        slow_hasher.hash("secret123")
+    stats = slow_hasher.stats()
+    assert stats["timeouts"] == 1
+    assert stats["rejected"] == 1
+
+    # Po zakończeniu zadania w puli slot wraca
+    deadline = time.monotonic() + 30
+    while not slow_hasher._slots.acquire(blocking=False):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    slow_hasher._slots.release()
@@ -0,0 +1,117 @@
+# backend/tests/test_strength.py
+import threading
+
+import pytest
+
+from app.db import SessionLocal
+from app.models.one_rep_max import Exercise
+from app.models.strength import AmrapEntry, ExerciseStrength
+from app.strength import brzycki, epley, estimated_one_rep_max, record_amrap_entry
+from core import config
+
+
+def test_single_rep_is_the_weight():
+    assert epley(100, 1) == brzycki(100, 1) == estimated_one_rep_max(100, 1) == 100
+
+
+def test_formulas():
+    assert epley(100, 5) == pytest.approx(116.667, rel=1e-4)
+    assert brzycki(100, 5) == pytest.approx(112.5)
+    assert brzycki(100, 37) is None
+
+
+def test_estimate_switches_formula_above_ten_reps():
+    assert estimated_one_rep_max(100, 10) == brzycki(100, 10)
+    assert estimated_one_rep_max(100, 11) == epley(100, 11)
+    assert estimated_one_rep_max(100, 0) == 0.0
+
+
+def amrap_set(client, user_id: int, exercise_name: str = "squats") -> dict:
+    exercises = {e["name"]: e["id"] for e in client.get(f"/users/{user_id}/exercises").json()}
+    for week in range(1, 7):
+        for plan in client.get(f"/users/{user_id}/plan/week/{week}").json():
+            if plan["exercise_id"] != exercises[exercise_name]:
+                continue
+            for db_set in plan["sets"]:
+                if db_set["is_amrap"]:
+                    return db_set
+    pytest.fail("No AMRAP set in plan")
+
+
+def summary(client, user_id: int, exercise_name: str = "squats") -> dict:
+    rows = client.get(f"/users/{user_id}/stats/strength").json()
+    return next(row for row in rows if row["name"] == exercise_name)
+
+
+def test_first_result_creates_summary(client, user):
+    db_set = amrap_set(client, user["id"])
+    response = client.post(
+        f"/users/{user['id']}/plan/week/1/amrap",
+        json={"set_id": db_set["id"], "reps_performed": db_set["reps"]}
+    )
+    assert response.status_code == 200
+    assert response.json()["personal_record"] is True
+
+    stats = summary(client, user["id"])
+    assert (stats["entries"], stats["pr_count"]) == (1, 1)
+    assert stats["best_e1rm"] == pytest.approx(estimated_one_rep_max(db_set["weight"], db_set["reps"]))
+    assert stats["trend_e1rm"] == stats["best_e1rm"]
+
+
+def test_weaker_result_is_not_a_record_and_moves_trend(client, user):
+    db_set = amrap_set(client, user["id"])
+    url = f"/users/{user['id']}/plan/week/1/amrap"
+    client.post(url, json={"set_id": db_set["id"], "reps_performed": db_set["reps"] + 1})
+    response = client.post(url, json={"set_id": db_set["id"], "reps_performed": 1})
+    assert response.json()["personal_record"] is False
+
+    stats = summary(client, user["id"])
+    best = estimated_one_rep_max(db_set["weight"], db_set["reps"] + 1)
+    expected_trend = config.STRENGTH_TREND_ALPHA * db_set["weight"] + (1 - config.STRENGTH_TREND_ALPHA) * best
+    assert (stats["entries"], stats["pr_count"]) == (2, 1)
+    assert stats["best_e1rm"] == pytest.approx(best)
+    assert stats["trend_e1rm"] == pytest.approx(expected_trend)
+
+    history = client.get(f"/users/{user['id']}/stats/strength/{stats['exercise_id']}/history").json()
+    assert [entry["is_pr"] for entry in history] == [False, True]
+
+
+def test_zero_reps_counts_entry_only(client, user):
+    db_set = amrap_set(client, user["id"])
+    client.post(f"/users/{user['id']}/plan/week/1/amrap", json={"set_id": db_set["id"], "reps_performed": 0})
+    stats = summary(client, user["id"])
+    assert (stats["entries"], stats["pr_count"], stats["best_e1rm"]) == (1, 0, None)
+
+
+# Blokady FOR UPDATE - tylko MySQL (SQLite ich nie ma)
+@pytest.mark.mysql
+def test_concurrent_first_results_do_not_conflict(user):
+    # Oba zapisy startują bez wiersza podsumowania - wcześniej drugi kończył się konfliktem klucza
+    with SessionLocal() as db:
+        exercise_id = db.query(Exercise.id).filter(Exercise.user_id == user["id"], Exercise.name == "squats").scalar()
+
+    barrier = threading.Barrier(2)
+    errors = []
+
+    def submit(reps: int):
+        try:
+            with SessionLocal() as db:
+                exercise = db.get(Exercise, exercise_id)
+                barrier.wait()
+                record_amrap_entry(db, exercise, 1, 100.0, 5, reps)
+                db.commit()
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=submit, args=(reps,)) for reps in (5, 6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with SessionLocal() as db:
+        stats = db.get(ExerciseStrength, exercise_id)
+        assert stats.entries == 2
+        assert stats.best_e1rm == pytest.approx(estimated_one_rep_max(100.0, 6))
+        assert db.query(AmrapEntry).filter(AmrapEntry.exercise_id == exercise_id).count() == 2
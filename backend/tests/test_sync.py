@@ -0,0 +1,81 @@
+# backend/tests/test_sync.py
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from core import config
+
+
+@pytest.fixture
+def no_lag(monkeypatch):
+    monkeypatch.setattr(config, "SYNC_CURSOR_LAG", 0)
+
+
+def sync(client, user_id: int, since=None):
+    params = {"since": since} if since is not None else {}
+    response = client.get(f"/users/{user_id}/sync", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def next_second():
+    # updated_at i kursor mają rozdzielczość sekundy
+    time.sleep(1.1)
+
+
+def test_full_sync_without_cursor(client, user, make_schedule):
+    plan = make_schedule(user["id"], name="nogi")
+    body = sync(client, user["id"])
+    assert body["full"] is True
+    assert body["deleted"] == {}
+    assert body["user"]["id"] == user["id"]
+    assert {exercise["name"] for exercise in body["exercises"]} == {"squats", "dead_lift", "bench_press"}
+    assert len(body["week_plans"]) == 18
+    assert [row["id"] for row in body["training_plan_schedules"]] == [plan["id"]]
+    datetime.fromisoformat(body["cursor"])
+
+
+def test_cursor_is_lagged(client, user, monkeypatch):
+    monkeypatch.setattr(config, "SYNC_CURSOR_LAG", 60)
+    lagged = datetime.fromisoformat(sync(client, user["id"])["cursor"])
+    monkeypatch.setattr(config, "SYNC_CURSOR_LAG", 0)
+    current = datetime.fromisoformat(sync(client, user["id"])["cursor"])
+    assert timedelta(seconds=59) <= current - lagged <= timedelta(seconds=61)
+
+
+def test_delta_contains_only_changes_and_deletions(client, user, no_lag, make_schedule):
+    kept = make_schedule(user["id"], name="nogi")
+    renamed = make_schedule(user["id"], name="plecy")
+    removed = make_schedule(user["id"], name="klatka")
+    next_second()
+    cursor = sync(client, user["id"])["cursor"]
+    next_second()
+
+    assert client.patch(f"/users/{user['id']}/training-schedule/{renamed['id']}", json={"name": "plecy v2"}).status_code == 200
+    assert client.delete(f"/users/{user['id']}/training-schedule/{removed['id']}").status_code == 200
+
+    body = sync(client, user["id"], cursor)
+    assert body["full"] is False
+    assert [(row["id"], row["name"]) for row in body["training_plan_schedules"]] == [(renamed["id"], "plecy v2")]
+    assert body["exercises"] == [] and body["week_plans"] == [] and body["sets"] == []
+    assert body["deleted"] == {"training_plan_schedules": [removed["id"]]}
+    assert kept["id"] not in {row["id"] for row in body["training_plan_schedules"]}
+
+    # Kolejny kursor nie zwraca już tych samych zmian
+    next_second()
+    again = sync(client, user["id"], body["cursor"])
+    assert again["training_plan_schedules"] == [] and again["deleted"] == {}
+
+
+def test_expired_cursor_falls_back_to_full_sync(client, user, make_schedule):
+    make_schedule(user["id"], name="nogi")
+    stale = (datetime.now() - timedelta(days=config.SYNC_TOMBSTONE_TTL_DAYS + 2)).isoformat()
+    body = sync(client, user["id"], stale)
+    assert body["full"] is True
+    assert len(body["training_plan_schedules"]) == 1
+
+
+def test_invalid_cursor_and_unknown_user(client, user):
+    assert client.get(f"/users/{user['id']}/sync", params={"since": "yesterday"}).status_code == 400
+    assert client.get("/users/999999/sync").status_code == 404
@@ -0,0 +1,101 @@
+# backend/tests/test_training_schedule.py
+from datetime import date, timedelta
+
+import pytest
+
+from app.routers.training_schedule import CALENDAR_NAME_SEPARATOR
+
+
+def test_keyset_pages_cover_all_plans_in_order(client, user, make_schedule):
+    start = date(2025, 3, 1)
+    # Po dwa plany dziennie - strona może kończyć się w środku dnia
+    created = [make_schedule(user["id"], start + timedelta(days=i // 2), f"t{i}") for i in range(7)]
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(f"/users/{user['id']}/training-schedule/", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 3
+        seen.extend(plan["id"] for plan in page)
+        pages += 1
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert seen == [plan["id"] for plan in sorted(created, key=lambda plan: (plan["scheduled_date"], plan["id"]))]
+
+
+def test_exact_page_has_no_next_cursor(client, user, make_schedule):
+    for i in range(3):
+        make_schedule(user["id"], date(2025, 3, 1) + timedelta(days=i))
+    response = client.get(f"/users/{user['id']}/training-schedule/", params={"limit": 3})
+    assert len(response.json()) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+
+def test_cursor_respects_date_filter(client, user, make_schedule):
+    for i in range(6):
+        make_schedule(user["id"], date(2025, 3, 1) + timedelta(days=i))
+    first = client.get(
+        f"/users/{user['id']}/training-schedule/",
+        params={"limit": 2, "to_date": "2025-03-04"}
+    )
+    second = client.get(
+        f"/users/{user['id']}/training-schedule/",
+        params={"limit": 2, "to_date": "2025-03-04", "cursor": first.headers["X-Next-Cursor"]}
+    )
+    assert [plan["scheduled_date"] for plan in second.json()] == ["2025-03-03", "2025-03-04"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_without_limit_returns_everything(client, user, make_schedule):
+    for i in range(4):
+        make_schedule(user["id"], date(2025, 3, 1) + timedelta(days=i))
+    response = client.get(f"/users/{user['id']}/training-schedule/")
+    assert len(response.json()) == 4
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "2025-13-01_1", "2025-03-01_x", "2025-03-01"])
+def test_invalid_cursor_is_rejected(client, user, cursor):
+    response = client.get(f"/users/{user['id']}/training-schedule/", params={"limit": 2, "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_calendar_groups_by_day_within_month(client, user, make_schedule):
+    make_schedule(user["id"], date(2025, 2, 28), "luty")
+    make_schedule(user["id"], date(2025, 3, 3), "nogi")
+    make_schedule(user["id"], date(2025, 3, 3), "plecy")
+    make_schedule(user["id"], date(2025, 3, 31), "klatka")
+    make_schedule(user["id"], date(2025, 4, 1), "kwiecień")
+
+    response = client.get(f"/users/{user['id']}/training-schedule/calendar", params={"month": "2025-03"})
+    assert response.status_code == 200
+    days = response.json()["days"]
+    assert [(day["date"], day["count"]) for day in days] == [("2025-03-03", 2), ("2025-03-31", 1)]
+    assert sorted(days[0]["names"]) == ["nogi", "plecy"]
+
+
+def test_calendar_keeps_names_with_commas(client, user, make_schedule):
+    make_schedule(user["id"], date(2025, 3, 3), "nogi, pośladki")
+    days = client.get(f"/users/{user['id']}/training-schedule/calendar", params={"month": "2025-03"}).json()["days"]
+    assert days[0]["names"] == ["nogi, pośladki"]
+    assert CALENDAR_NAME_SEPARATOR not in days[0]["names"][0]
+
+
+def test_calendar_december_ends_at_year_boundary(client, user, make_schedule):
+    make_schedule(user["id"], date(2025, 12, 31))
+    make_schedule(user["id"], date(2026, 1, 1))
+    days = client.get(f"/users/{user['id']}/training-schedule/calendar", params={"month": "2025-12"}).json()["days"]
+    assert [day["date"] for day in days] == ["2025-12-31"]
+
+
+@pytest.mark.parametrize("month", ["2025-3", "2025-13", "march"])
+def test_calendar_rejects_bad_month(client, user, month):
+    response = client.get(f"/users/{user['id']}/training-schedule/calendar", params={"month": month})
+    assert response.status_code in (400, 422)
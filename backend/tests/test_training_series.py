@@ -0,0 +1,151 @@
+# backend/tests/test_training_series.py
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from app.routers.training_schedule import _expand_recurrence
+from app.schemas.training_schedule import TrainingSeriesCreate
+from core import config
+
+
+def rule(**overrides) -> TrainingSeriesCreate:
+    data = {"name": "FBW", "start_date": date(2025, 3, 5), "weekdays": [0, 2, 4], "count": 4, "exercises": []}
+    data.update(overrides)
+    return TrainingSeriesCreate(**data)
+
+
+def test_expansion_skips_days_before_start():
+    # 2025-03-05 to środa - poniedziałek tego tygodnia jest przed startem
+    assert _expand_recurrence(rule()) == [date(2025, 3, 5), date(2025, 3, 7), date(2025, 3, 10), date(2025, 3, 12)]
+
+
+def test_expansion_with_interval_and_until_inclusive():
+    # Wtorek tygodnia startu (03-04) wypada przed startem; kolejne co dwa tygodnie od tego tygodnia
+    dates = _expand_recurrence(rule(weekdays=[1], interval=2, count=None, until=date(2025, 4, 15)))
+    assert dates == [date(2025, 3, 18), date(2025, 4, 1), date(2025, 4, 15)]
+    dates = _expand_recurrence(rule(weekdays=[1], interval=2, count=None, until=date(2025, 4, 14)))
+    assert dates[-1] == date(2025, 4, 1)
+
+
+def test_expansion_ignores_duplicate_and_unsorted_weekdays():
+    assert _expand_recurrence(rule(weekdays=[4, 2, 2], count=2)) == [date(2025, 3, 5), date(2025, 3, 7)]
+
+
+@pytest.mark.parametrize("overrides", [
+    {"weekdays": []},
+    {"weekdays": [7]},
+    {"weekdays": [-1]},
+    {"interval": 0},
+    {"count": None},
+    {"until": date(2025, 4, 1)},
+    {"count": 0},
+])
+def test_expansion_rejects_invalid_rules(overrides):
+    with pytest.raises(HTTPException) as error:
+        _expand_recurrence(rule(**overrides))
+    assert error.value.status_code == 400
+
+
+def test_expansion_is_capped(monkeypatch):
+    monkeypatch.setattr(config, "TRAINING_SERIES_MAX_OCCURRENCES", 5)
+    assert len(_expand_recurrence(rule(count=5))) == 5
+    with pytest.raises(HTTPException):
+        _expand_recurrence(rule(count=None, until=date(2030, 1, 1)))
+
+
+def create_series(client, user_id: int, exercise_id: int, **overrides) -> dict:
+    payload = {
+        "name": "FBW",
+        "start_date": "2025-03-03",
+        "weekdays": [0, 3],
+        "count": 6,
+        "exercises": [{"exercise_id": exercise_id, "sets": 5, "reps": 5, "weight": 100}],
+    }
+    payload.update(overrides)
+    response = client.post(f"/users/{user_id}/training-schedule/series", json=payload)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def plans(client, user_id: int) -> list:
+    return client.get(f"/users/{user_id}/training-schedule/").json()
+
+
+def test_create_series_materializes_occurrences(client, user, squats):
+    series = create_series(client, user["id"], squats)
+    assert series["occurrences"] == 6
+    assert (series["first_date"], series["last_date"]) == ("2025-03-03", "2025-03-20")
+
+    created = plans(client, user["id"])
+    assert len(created) == 6
+    assert {plan["series_id"] for plan in created} == {series["series_id"]}
+    assert all(len(plan["exercises"]) == 1 and plan["exercises"][0]["exercise_id"] == squats for plan in created)
+
+
+def test_create_series_rejects_foreign_exercise(client, make_user, user):
+    other = make_user()
+    foreign = client.get(f"/users/{other['id']}/exercises").json()[0]["id"]
+    response = client.post(f"/users/{user['id']}/training-schedule/series", json={
+        "name": "FBW", "start_date": "2025-03-03", "weekdays": [0], "count": 2,
+        "exercises": [{"exercise_id": foreign, "sets": 5, "reps": 5, "weight": 100}],
+    })
+    assert response.status_code == 400
+    assert plans(client, user["id"]) == []
+
+
+def test_update_this_and_following(client, user, squats):
+    series = create_series(client, user["id"], squats)
+    response = client.patch(
+        f"/users/{user['id']}/training-schedule/series/{series['series_id']}",
+        params={"from_date": "2025-03-10"},
+        json={"name": "FBW v2", "exercises": [{"exercise_id": squats, "sets": 3, "reps": 8, "weight": 90}]}
+    )
+    assert response.status_code == 200
+    assert response.json()["occurrences"] == 4
+
+    by_date = {plan["scheduled_date"]: plan for plan in plans(client, user["id"])}
+    assert by_date["2025-03-06"]["name"] == "FBW"
+    assert by_date["2025-03-06"]["exercises"][0]["sets"] == 5
+    assert by_date["2025-03-10"]["name"] == "FBW v2"
+    assert [(e["sets"], e["reps"]) for e in by_date["2025-03-17"]["exercises"]] == [(3, 8)]
+
+
+def test_update_rejects_null_name(client, user, squats):
+    series = create_series(client, user["id"], squats)
+    url = f"/users/{user['id']}/training-schedule/series/{series['series_id']}"
+    assert client.patch(url, json={"name": None}).status_code == 400
+    assert {plan["name"] for plan in plans(client, user["id"])} == {"FBW"}
+
+    # Null w polu dopuszczającym null czyści je
+    assert client.patch(url, json={"notes": "lekko"}).status_code == 200
+    assert client.patch(url, json={"notes": None}).status_code == 200
+    assert {plan["notes"] for plan in plans(client, user["id"])} == {None}
+
+
+def test_delete_this_and_following(client, user, squats):
+    series = create_series(client, user["id"], squats)
+    response = client.delete(
+        f"/users/{user['id']}/training-schedule/series/{series['series_id']}",
+        params={"from_date": "2025-03-10"}
+    )
+    assert response.status_code == 200
+    assert [plan["scheduled_date"] for plan in plans(client, user["id"])] == ["2025-03-03", "2025-03-06"]
+
+
+def test_series_of_another_user_is_not_found(client, make_user, user, squats):
+    series = create_series(client, user["id"], squats)
+    other = make_user()
+    url = f"/users/{other['id']}/training-schedule/series/{series['series_id']}"
+    assert client.delete(url).status_code == 404
+    assert client.patch(url, json={"name": "x"}).status_code == 404
+    assert len(plans(client, user["id"])) == 6
+
+
+def test_from_date_after_last_occurrence_is_not_found(client, user, squats):
+    series = create_series(client, user["id"], squats)
+    response = client.delete(
+        f"/users/{user['id']}/training-schedule/series/{series['series_id']}",
+        params={"from_date": "2025-04-01"}
+    )
+    assert response.status_code == 404
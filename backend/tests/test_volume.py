@@ -0,0 +1,74 @@
+# backend/tests/test_volume.py
+from datetime import date
+
+from app.db import SessionLocal
+from app.models.volume import VolumeBucket
+from app.models.weight_history import WeightHistory
+from app.volume import bucket_after, bucket_floor, bucket_starts, completed_volume
+
+
+def test_bucket_floor():
+    assert bucket_floor(date(2025, 3, 6), "week") == date(2025, 3, 3)
+    assert bucket_floor(date(2025, 3, 3), "week") == date(2025, 3, 3)
+    assert bucket_floor(date(2025, 3, 31), "month") == date(2025, 3, 1)
+
+
+def test_bucket_after_crosses_month_and_year():
+    assert bucket_after(date(2025, 3, 3), "week") == date(2025, 3, 10)
+    assert bucket_after(date(2025, 2, 1), "month") == date(2025, 3, 1)
+    assert bucket_after(date(2025, 12, 29), "week") == date(2026, 1, 5)
+    assert bucket_after(date(2025, 12, 1), "month") == date(2026, 1, 1)
+
+
+def test_bucket_starts_is_half_open():
+    assert bucket_starts(date(2025, 3, 3), date(2025, 3, 24), "week") == [date(2025, 3, 3), date(2025, 3, 10), date(2025, 3, 17)]
+    assert bucket_starts(date(2025, 1, 1), date(2025, 1, 1), "month") == []
+
+
+def volume(client, user_id: int) -> dict:
+    response = client.get(f"/users/{user_id}/stats/volume", params={"bucket": "week", "from": "2025-03-03", "to": "2025-03-23"})
+    assert response.status_code == 200, response.text
+    return {bucket["start"]: bucket for bucket in response.json()["buckets"]}
+
+
+def test_completed_weeks_are_stored_on_first_read(client, db, user, squats, make_schedule):
+    make_schedule(user["id"], "2025-03-04", exercise_ids=[squats])
+    make_schedule(user["id"], "2025-03-06", exercise_ids=[squats], weight=80)
+
+    buckets = volume(client, user["id"])
+    assert buckets["2025-03-03"]["sessions"] == 2
+    assert buckets["2025-03-03"]["tonnage"] == 25 * 100 + 25 * 80
+    assert buckets["2025-03-10"]["tonnage"] == 0
+    stored = db.query(VolumeBucket.bucket_start).filter(VolumeBucket.user_id == user["id"]).all()
+    assert {row.bucket_start for row in stored} == {date(2025, 3, 3), date(2025, 3, 10), date(2025, 3, 17)}
+
+    # Drugi odczyt z zapisanych wierszy daje to samo
+    assert volume(client, user["id"]) == buckets
+
+
+def test_schedule_change_invalidates_stored_week(client, user, squats, make_schedule):
+    plan = make_schedule(user["id"], "2025-03-11", exercise_ids=[squats])
+    assert volume(client, user["id"])["2025-03-10"]["tonnage"] == 2500
+
+    row = plan["exercises"][0]["id"]
+    response = client.patch(f"/users/{user['id']}/training-schedule/{plan['id']}/exercises/{row}", json={"weight": 120})
+    assert response.status_code == 200
+    assert volume(client, user["id"])["2025-03-10"]["tonnage"] == 3000
+
+    assert client.delete(f"/users/{user['id']}/training-schedule/{plan['id']}").status_code == 200
+    assert volume(client, user["id"])["2025-03-10"]["sessions"] == 0
+
+
+def test_fill_leaves_callers_transaction_alone(user, squats, client, make_schedule):
+    make_schedule(user["id"], "2025-03-04", exercise_ids=[squats])
+    with SessionLocal() as session:
+        # Niezapisana zmiana wywołującego - zapis przedziałów nie może jej zatwierdzić
+        session.add(WeightHistory(user_id=user["id"], weight=81.0))
+        sessions, rows = completed_volume(session, user["id"], "week", date(2025, 3, 3), date(2025, 3, 17))
+        assert sessions[date(2025, 3, 3)] == 1
+        assert [row["tonnage"] for row in rows] == [2500]
+        session.rollback()
+
+    with SessionLocal() as session:
+        assert session.query(WeightHistory).filter(WeightHistory.weight == 81.0).count() == 0
+        assert session.query(VolumeBucket).filter(VolumeBucket.user_id == user["id"]).count() == 2
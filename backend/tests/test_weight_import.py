@@ -0,0 +1,141 @@
+# backend/tests/test_weight_import.py
+import json
+from datetime import datetime
+
+import pytest
+
+from app.weight_import import CsvSampleParser, JsonArraySampleParser, WeightImportError, WeightSample
+from core import config
+
+JSON_BODY = json.dumps([
+    {"recorded_at": "2025-01-01T07:30:00+02:00", "weight": 81.2},
+    {"recorded_at": "2025-01-02T07:30:15.900Z", "weight": 80},
+    {"weight": "79.5", "recorded_at": "2025-01-03T07:30:00"},
+], indent=1)
+CSV_BODY = "weight,recorded_at\r\n81.2,2025-01-01T07:30:00+02:00\r\n\r\n80,2025-01-02T07:30:15Z\r\n79.5,2025-01-03T07:30:00"
+EXPECTED = [
+    WeightSample(datetime(2025, 1, 1, 5, 30), 81.2),
+    WeightSample(datetime(2025, 1, 2, 7, 30, 15), 80.0),
+    WeightSample(datetime(2025, 1, 3, 7, 30), 79.5),
+]
+
+
+def parse_in_two_chunks(parser, text: str, split: int) -> list:
+    return parser.feed(text[:split]) + parser.feed(text[split:]) + parser.close()
+
+
+@pytest.mark.parametrize("parser_class, body", [(JsonArraySampleParser, JSON_BODY), (CsvSampleParser, CSV_BODY)])
+def test_parsers_do_not_depend_on_chunk_boundaries(parser_class, body):
+    for split in range(len(body) + 1):
+        assert parse_in_two_chunks(parser_class(), body, split) == EXPECTED, f"split at {split}"
+
+
+def test_parsers_return_samples_as_soon_as_they_are_complete():
+    parser = JsonArraySampleParser()
+    first_item_end = JSON_BODY.index("}") + 1
+    assert parser.feed(JSON_BODY[:first_item_end]) == EXPECTED[:1]
+
+    parser = CsvSampleParser()
+    assert parser.feed("2025-01-01T05:30:00,81.2\n2025-01-02") == EXPECTED[:1]
+
+
+@pytest.mark.parametrize("parser_class, body, message", [
+    (JsonArraySampleParser, '{"weight": 80}', "Expected a JSON array"),
+    (JsonArraySampleParser, '[{"weight": 80}]', "missing field recorded_at"),
+    (JsonArraySampleParser, '[{"recorded_at": "2025-01-01", "weight": true}]', "weight must be a number"),
+    (JsonArraySampleParser, '[{"recorded_at": "2025-01-01", "weight": 80}', "Unexpected end"),
+    (JsonArraySampleParser, '[] []', "Unexpected data"),
+    (CsvSampleParser, "recorded_at,mass\n2025-01-01,80", "header must contain"),
+    (CsvSampleParser, "2025-01-01,80\n2025-01-02", "Line 2"),
+    (CsvSampleParser, "2025-01-01,-1", "between 0 and 1000"),
+])
+def test_parser_errors(parser_class, body, message):
+    parser = parser_class()
+    with pytest.raises(WeightImportError, match=message):
+        parser.feed(body)
+        parser.close()
+
+
+def import_weights(client, user, body: str, content_type: str = "application/json", **headers):
+    return client.post(
+        f"/users/{user['id']}/weight_history/batch",
+        content=body.encode(),
+        headers={"Content-Type": content_type, **headers}
+    )
+
+
+def stored_weights(client, user) -> dict:
+    return {row["recorded_at"][:19]: row["weight"] for row in client.get(f"/users/{user['id']}/weight_history").json()}
+
+
+@pytest.mark.parametrize("body, content_type", [(JSON_BODY, "application/json"), (CSV_BODY, "text/csv; charset=utf-8")])
+def test_import_stores_measurements(client, user, body, content_type):
+    response = import_weights(client, user, body, content_type)
+    assert response.status_code == 200, response.text
+    assert response.json() == {"received": 3, "inserted": 3, "duplicates": 0}
+    assert stored_weights(client, user) == {
+        "2025-01-01T05:30:00": 81.2, "2025-01-02T07:30:15": 80.0, "2025-01-03T07:30:00": 79.5,
+    }
+
+
+def test_duplicates_in_request_and_database_are_skipped(client, user):
+    import_weights(client, user, '[{"recorded_at": "2025-01-01T07:30:00", "weight": 81}]')
+    body = json.dumps([
+        {"recorded_at": "2025-01-01T07:30:00", "weight": 90},
+        {"recorded_at": "2025-01-02T07:30:00", "weight": 80},
+        {"recorded_at": "2025-01-02T07:30:00", "weight": 80.5},
+    ])
+    assert import_weights(client, user, body).json() == {"received": 3, "inserted": 1, "duplicates": 2}
+    # Istniejący pomiar nie jest nadpisywany, z powtórzeń w imporcie zostaje ostatni
+    assert stored_weights(client, user) == {"2025-01-01T07:30:00": 81.0, "2025-01-02T07:30:00": 80.5}
+
+
+def test_too_many_measurements(client, user, monkeypatch):
+    monkeypatch.setattr(config, "WEIGHT_IMPORT_MAX_ROWS", 2)
+    response = import_weights(client, user, JSON_BODY)
+    assert response.status_code == 413
+    assert stored_weights(client, user) == {}
+
+
+def test_unsupported_content_type(client, user):
+    assert import_weights(client, user, CSV_BODY, "text/plain").status_code == 415
+
+
+@pytest.mark.parametrize("body", [
+    '[{"recorded_at": "2025-01-01", "weight": 2000}]',
+    '[{"recorded_at": "yesterday", "weight": 80}]',
+    '[{"recorded_at": "2025-01-01", "weight": 80}',
+])
+def test_invalid_body(client, user, body):
+    response = import_weights(client, user, body)
+    assert response.status_code == 422
+    assert stored_weights(client, user) == {}
+
+
+def test_body_must_be_utf8(client, user):
+    response = client.post(
+        f"/users/{user['id']}/weight_history/batch",
+        content="recorded_at,weight\n2025-01-01,80 kg ±".encode("latin-1"),
+        headers={"Content-Type": "text/csv"}
+    )
+    assert response.status_code == 422
+
+
+def test_same_idempotency_key_replays_first_response(client, user):
+    first = import_weights(client, user, JSON_BODY, **{"Idempotency-Key": "import-1"})
+    assert first.status_code == 200
+    assert "Idempotent-Replayed" not in first.headers
+
+    replay = import_weights(client, user, JSON_BODY, **{"Idempotency-Key": "import-1"})
+    assert replay.status_code == 200
+    assert replay.headers["Idempotent-Replayed"] == "true"
+    assert replay.json() == first.json() == {"received": 3, "inserted": 3, "duplicates": 0}
+    assert len(stored_weights(client, user)) == 3
+
+
+def test_idempotency_key_reused_with_different_body(client, user):
+    import_weights(client, user, JSON_BODY, **{"Idempotency-Key": "import-1"})
+    other_body = '[{"recorded_at": "2025-02-01T07:30:00", "weight": 78}]'
+    response = import_weights(client, user, other_body, **{"Idempotency-Key": "import-1"})
+    assert response.status_code == 422
+    assert "2025-02-01T07:30:00" not in stored_weights(client, user)
@@ -0,0 +1,142 @@
+# backend/tests/test_weight_trend.py
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.weight_trend import fit_trend, forecast, moving_average
+
+WEEKS = 6
+FIRST_MONDAY = date(2025, 1, 6)
+
+
+def test_moving_average_warms_up_with_shorter_windows():
+    values = np.array([1.0, 2.0, 3.0, 4.0])
+    assert moving_average(values, 2).tolist() == [1.0, 1.5, 2.5, 3.5]
+    assert moving_average(values, 10).tolist() == [1.0, 1.5, 2.0, 2.5]
+    # Wartości rozgrzewające liczą się do średniej, ale nie są zwracane
+    assert moving_average(values, 3, warmup=2).tolist() == [2.0, 3.0]
+    assert moving_average(np.array([]), 3).tolist() == []
+
+
+def test_linear_fit():
+    slope, intercept = fit_trend(np.array([-14.0, -7.0, 0.0]), np.array([82.0, 81.0, 80.0]), "linear")
+    assert slope == pytest.approx(-1 / 7)
+    assert intercept == pytest.approx(80.0)
+
+
+def test_theil_sen_skips_pairs_with_equal_dates_and_ignores_outlier():
+    days = np.array([0.0, 0.0, 7.0, 14.0])
+    weights = np.array([80.0, 90.0, 81.0, 82.0])
+    slope, intercept = fit_trend(days, weights, "robust")
+    assert slope == pytest.approx(1 / 7)
+    assert intercept == pytest.approx(np.median(weights - slope * days))
+    assert fit_trend(days, weights, "linear")[0] != pytest.approx(slope)
+
+
+def test_forecast_needs_two_buckets():
+    assert forecast([FIRST_MONDAY], [80.0], 75.0, "linear", 28) is None
+
+
+def test_forecast_reaches_goal_along_trend():
+    starts = [FIRST_MONDAY + timedelta(weeks=week) for week in range(3)]
+    result = forecast(starts, [82.0, 81.0, 80.0], 78.0, "linear", 28)
+    assert result["buckets"] == 3
+    assert result["slope_per_week"] == pytest.approx(-1.0)
+    assert result["current"] == pytest.approx(80.0)
+    assert result["projected_date"] == starts[-1] + timedelta(days=28)
+    assert result["projected"] == pytest.approx(76.0)
+    assert result["goal_date"] == starts[-1] + timedelta(days=14)
+
+    # Cel po przeciwnej stronie trendu - bez daty
+    assert forecast(starts, [82.0, 81.0, 80.0], 85.0, "linear", 28)["goal_date"] is None
+
+
+def test_forecast_goal_already_reached():
+    starts = [FIRST_MONDAY, FIRST_MONDAY + timedelta(weeks=1)]
+    result = forecast(starts, [80.5, 80.02], 80.0, "robust", 28)
+    assert result["goal_date"] == starts[-1]
+
+
+def test_forecast_flat_trend_has_no_goal_date():
+    starts = [FIRST_MONDAY + timedelta(weeks=week) for week in range(4)]
+    result = forecast(starts, [80.0] * 4, 75.0, "linear", 28)
+    assert result["slope_per_week"] == 0
+    assert result["projected"] == 80.0
+    assert result["goal_date"] is None
+    assert forecast(starts, [80.0] * 4, None, "linear", 28)["goal_date"] is None
+
+
+@pytest.fixture
+def user(client, make_user):
+    # Dwa pomiary tygodniowo: poniedziałek (waga bazowa) i czwartek (+1 kg); co tydzień o 1 kg mniej
+    user = make_user(weight_goal=85.0)
+    measurements = []
+    for week in range(WEEKS):
+        monday = FIRST_MONDAY + timedelta(weeks=week)
+        measurements.append({"recorded_at": f"{monday}T07:00:00", "weight": 90.0 - week})
+        measurements.append({"recorded_at": f"{monday + timedelta(days=3)}T21:30:00", "weight": 91.0 - week})
+    response = client.post(f"/users/{user['id']}/weight_history/batch", content=json.dumps(measurements),
+                           headers={"Content-Type": "application/json"})
+    assert response.json()["inserted"] == 2 * WEEKS
+    return user
+
+
+def series(client, user, **params):
+    response = client.get(f"/users/{user['id']}/weight_history/series", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_weekly_buckets_and_trend(client, user):
+    body = series(client, user, bucket="week", window=1).json()
+    assert [point["bucket_start"] for point in body["points"]] == [
+        (FIRST_MONDAY + timedelta(weeks=week)).isoformat() for week in range(WEEKS)
+    ]
+    first = body["points"][0]
+    assert (first["mean"], first["min"], first["max"], first["count"]) == (90.5, 90.0, 91.0, 2)
+    assert [point["moving_average"] for point in body["points"]] == [point["mean"] for point in body["points"]]
+
+    trend = body["trend"]
+    assert trend["buckets"] == WEEKS
+    assert trend["slope_per_week"] == pytest.approx(-1.0)
+    assert trend["current"] == pytest.approx(85.5)
+    assert trend["goal_date"] == (FIRST_MONDAY + timedelta(weeks=WEEKS - 1, days=4)).isoformat()
+
+
+def test_daily_and_monthly_buckets(client, user):
+    days = series(client, user, bucket="day").json()["points"]
+    assert len(days) == 2 * WEEKS
+    assert days[1]["bucket_start"] == (FIRST_MONDAY + timedelta(days=3)).isoformat()
+
+    months = series(client, user, bucket="month").json()["points"]
+    assert [(point["bucket_start"], point["count"]) for point in months] == [("2025-01-01", 8), ("2025-02-01", 4)]
+
+
+def test_pages_continue_moving_average(client, user):
+    full = series(client, user, bucket="week", window=3).json()["points"]
+    assert "X-Next-Cursor" not in series(client, user, bucket="week", window=3).headers
+
+    pages, after = [], None
+    while True:
+        params = {"bucket": "week", "window": 3, "limit": 2}
+        if after:
+            params["after"] = after
+        response = series(client, user, **params)
+        body = response.json()
+        assert (body["trend"] is None) == (after is not None)
+        pages.append(body["points"])
+        after = response.headers.get("X-Next-Cursor")
+        if after is None:
+            break
+        assert after == body["points"][-1]["bucket_start"]
+
+    assert [len(page) for page in pages] == [2, 2, 2]
+    assert [point for page in pages for point in page] == full
+    assert full[2]["moving_average"] == pytest.approx(np.mean([90.5, 89.5, 88.5]))
+
+
+def test_unknown_user_and_invalid_parameters(client, user):
+    assert client.get("/users/999999/weight_history/series").status_code == 404
+    assert client.get(f"/users/{user['id']}/weight_history/series", params={"bucket": "year"}).status_code == 422
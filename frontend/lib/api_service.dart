@@ -43,7 +43,7 @@ Future<LoginResponse> login({
   Future<bool> checkUserExists(String nickname) async {
     try {
       final response = await http.get(
-        Uri.parse('$baseUrl/$usersEndpoint'),
+        Uri.parse('$baseUrl/$usersEndpoint/by-nickname/${Uri.encodeComponent(nickname)}'),
         headers: {
           'Content-Type': 'application/json; charset=utf-8',
           'Accept': 'application/json; charset=utf-8',
@@ -51,9 +51,9 @@ Future<LoginResponse> login({
       );
       
       if (response.statusCode == 200) {
-        final List<dynamic> data = jsonDecode(utf8.decode(response.bodyBytes));
-        final users = data.map((json) => User.fromJson(json)).toList();
-        return users.any((user) => user.nickname == nickname);
+        return true;
+      } else if (response.statusCode == 404) {
+        return false;
       } else {
         throw Exception('Błąd podczas sprawdzania użytkownika: ${response.statusCode}');
       }
@@ -104,20 +104,34 @@ Future<LoginResponse> login({
     }
   }
 
+  /// Ostatnie odpowiedzi planów tygodniowych z ETagiem (url -> [etag, treść])
+  static final Map<String, List<String>> _weekPlanCache = {};
+
   /// **Pobranie planu treningowego na dany tydzień z wersją planu**
   Future<List<TrainingPlan>> fetchTrainingPlan(
       int userId, int weekNumber, String planVersion) async {
+    final url =
+        '$baseUrl/users/$userId/plan/week/$weekNumber?plan_version=$planVersion';
+    final cached = _weekPlanCache[url];
     final response = await http.get(
-      Uri.parse(
-          '$baseUrl/users/$userId/plan/week/$weekNumber?plan_version=$planVersion'),
+      Uri.parse(url),
       headers: {
         'Content-Type': 'application/json; charset=utf-8',
         'Accept': 'application/json; charset=utf-8',
+        if (cached != null) 'If-None-Match': cached[0],
       },
     );
 
-    if (response.statusCode == 200) {
-      final List<dynamic> data = jsonDecode(utf8.decode(response.bodyBytes));
+    if (response.statusCode == 304 && cached != null) {
+      final List<dynamic> data = jsonDecode(cached[1]);
+      return data.map((json) => TrainingPlan.fromJson(json)).toList();
+    } else if (response.statusCode == 200) {
+      final body = utf8.decode(response.bodyBytes);
+      final etag = response.headers['etag'];
+      if (etag != null) {
+        _weekPlanCache[url] = [etag, body];
+      }
+      final List<dynamic> data = jsonDecode(body);
       return data.map((json) => TrainingPlan.fromJson(json)).toList();
     } else {
       throw Exception(
@@ -689,12 +703,12 @@ Future<User> createUser({
 
 Future<Map<String, dynamic>> comparePlans({required int userId}) async {
   final response = await http.get(
-    Uri.parse('$baseUrl/$usersEndpoint$userId/$comparePlansEndpoint'),
+    Uri.parse('$baseUrl/$plansEndpoint/compare'),
     headers: {"Content-Type": "application/json"},
   );
 
   if (response.statusCode == 200) {
-    return jsonDecode(response.body);
+    return jsonDecode(utf8.decode(response.bodyBytes));
   } else {
     throw Exception(
         'Nie udało się pobrać porównania planów: ${response.statusCode} - ${response.body}');
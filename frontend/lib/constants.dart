@@ -8,3 +8,4 @@ const String usersEndpoint = "users";
 const String trainingScheduleEndpoint = "training-schedule";
 const String changePlanEndpoint = "change-plan";
 const String comparePlansEndpoint = "compare-plans";
+const String plansEndpoint = "plans";